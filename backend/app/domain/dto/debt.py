@@ -1,6 +1,6 @@
-from pydantic import BaseModel, validator, field_validator
+from pydantic import BaseModel, validator, field_validator, model_validator
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 import uuid
 from .people import PeopleDTO
@@ -20,8 +20,10 @@ class DebtDTO(BaseModel):
     created_at: datetime
     updated_at: datetime
     payment_method_id: Optional[str] = None
+    installment_group_id: Optional[str] = None
+    version: int = 1
 
-    @validator('id', 'person_id', 'payment_method_id', pre=True)
+    @validator('id', 'person_id', 'payment_method_id', 'installment_group_id', pre=True)
     def convert_uuid_to_str(cls, v):
         if isinstance(v, uuid.UUID):
             return str(v)
@@ -86,6 +88,9 @@ class DebtUpdateDTO(BaseModel):
     payment_method_id: Optional[str] = None
     status: Optional[str] = None
     paid_amount: Optional[float] = None
+    # Versão lida pelo cliente; se informada, a atualização falha com 409 caso a dívida tenha mudado.
+    # Obrigatória com paid_amount, que sobrescreve o saldo (como em DebtPaymentDTO)
+    version: Optional[int] = None
 
     @validator('amount')
     def validate_amount(cls, v):
@@ -108,7 +113,152 @@ class DebtUpdateDTO(BaseModel):
                 raise ValueError('A parcela atual não pode ser maior que o total de parcelas')
         return v
 
+    @model_validator(mode='after')
+    def validate_paid_amount_version(self):
+        if self.paid_amount is not None and self.version is None:
+            raise ValueError('Informe a versão da dívida (version) ao alterar o valor pago')
+        return self
+
     model_config = {"extra": "allow"}
 
 class DebtPaymentDTO(BaseModel):
-    paid_amount: float 
\ No newline at end of file
+    """Novo valor pago total. Como sobrescreve o saldo, exige a versão lida pelo
+    cliente (409 se a dívida mudou); para somar um valor use POST /payments."""
+    paid_amount: float
+    version: int
+
+class DebtPersonSummaryDTO(BaseModel):
+    """Totais das dívidas de uma pessoa em um período, agregados no banco"""
+    person_id: str
+    person_name: str
+    total: Decimal
+    paid: Decimal
+    pending: Decimal
+    debts_count: int
+    installments_count: int
+
+    @validator('person_id', pre=True)
+    def convert_uuid_to_str(cls, v):
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        return v
+
+    class Config:
+        from_attributes = True
+        json_encoders = {
+            Decimal: lambda v: float(v),
+        }
+
+class DebtPaymentCreateDTO(BaseModel):
+    """Pagamento (ou estorno, com valor negativo) lançado no histórico de uma dívida"""
+    amount: float
+    paid_at: Optional[date] = None
+    note: Optional[str] = None
+
+    @validator('amount')
+    def validate_amount(cls, v):
+        if v == 0:
+            raise ValueError('O valor do pagamento não pode ser zero')
+        return v
+
+    @validator('note')
+    def validate_note(cls, v):
+        if v is not None and len(v) > 200:
+            raise ValueError('A observação deve ter no máximo 200 caracteres')
+        return v
+
+class DebtPaymentEntryDTO(BaseModel):
+    id: str
+    debt_id: str
+    amount: Decimal
+    paid_at: date
+    note: Optional[str] = None
+    created_at: datetime
+
+    @validator('id', 'debt_id', pre=True)
+    def convert_uuid_to_str(cls, v):
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        return v
+
+    class Config:
+        from_attributes = True
+        json_encoders = {
+            Decimal: lambda v: float(v),
+        }
+
+class DebtSettlementDTO(BaseModel):
+    """Resultado da quitação de todas as dívidas em aberto de uma pessoa"""
+    person_id: str
+    settled_count: int
+    total_paid: Decimal
+
+    class Config:
+        json_encoders = {
+            Decimal: lambda v: float(v),
+        }
+
+# Limite de ids por operação em lote
+MAX_BULK_IDS = 1000
+
+def _uuid(value: str, message: str) -> str:
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError(message)
+
+class DebtSelectionDTO(BaseModel):
+    """Seleção de dívidas para operações em lote; os critérios informados são combinados com E"""
+    ids: Optional[List[str]] = None
+    installment_group_id: Optional[str] = None
+    period: Optional[str] = None
+    person_id: Optional[str] = None
+    status: Optional[str] = None
+
+    @validator('ids')
+    def validate_ids(cls, v):
+        if v is None:
+            return v
+        if not 1 <= len(v) <= MAX_BULK_IDS:
+            raise ValueError(f'Informe de 1 a {MAX_BULK_IDS} ids')
+        return [_uuid(value, 'ID da dívida inválido') for value in v]
+
+    @validator('installment_group_id')
+    def validate_installment_group_id(cls, v):
+        return _uuid(v, 'ID do parcelamento inválido') if v is not None else v
+
+    @validator('person_id')
+    def validate_person_id(cls, v):
+        return _uuid(v, 'ID da pessoa inválido') if v is not None else v
+
+    @model_validator(mode='after')
+    def validate_criteria(self):
+        if not any((self.ids, self.installment_group_id, self.period, self.person_id, self.status)):
+            raise ValueError('Informe ao menos um critério de seleção')
+        return self
+
+class DebtBulkChangesDTO(BaseModel):
+    """Campos alterados em todas as dívidas selecionadas"""
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    person_id: Optional[str] = None
+    payment_method_id: Optional[str] = None
+
+    @validator('amount')
+    def validate_amount(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('O valor da dívida deve ser positivo')
+        return v
+
+    @validator('person_id')
+    def validate_person_id(cls, v):
+        return _uuid(v, 'ID da pessoa inválido') if v is not None else v
+
+    @model_validator(mode='after')
+    def validate_changes(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError('Informe ao menos um campo para alterar')
+        return self
+
+class DebtBulkUpdateDTO(DebtSelectionDTO):
+    changes: DebtBulkChangesDTO
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 from uuid import UUID
@@ -19,8 +19,15 @@ class TransactionDTO(BaseModel):
     created_at: datetime
     updated_at: datetime
     payment_method_id: Optional[str] = None
+    installment_group_id: Optional[str] = None
+    recurring_rule_id: Optional[str] = None
+    occurrence_date: Optional[date] = None
+    # Ocorrência projetada de uma regra de recorrência, ainda sem linha no banco;
+    # o id é "<id da regra>:<data>" e alterá-la a materializa
+    is_projected: bool = False
+    version: int = 1
 
-    @field_validator('id', 'user_id', 'payment_method_id', mode='before')
+    @field_validator('id', 'user_id', 'payment_method_id', 'installment_group_id', 'recurring_rule_id', mode='before')
     @classmethod
     def convert_uuid_to_str(cls, v):
         if isinstance(v, UUID):
@@ -44,6 +51,24 @@ class TransactionDTO(BaseModel):
         }
     )
 
+class TransactionPaginationDTO(BaseModel):
+    limit: int
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+    # Só preenchido com include_total=true
+    total: Optional[int] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class TransactionPageDTO(BaseModel):
+    transactions: List[TransactionDTO]
+    pagination: TransactionPaginationDTO
+
+class TransactionPageResponseDTO(BaseModel):
+    """Envelope de success_response da listagem paginada de transações"""
+    success: bool
+    message: str
+    data: TransactionPageDTO
+
 class TransactionCreateDTO(BaseModel):
     description: str
     amount: float
@@ -74,4 +99,191 @@ class TransactionUpdateDTO(BaseModel):
     installments: Optional[int] = None
     total_installments: Optional[int] = None
     due_date: Optional[date] = None
-    payment_method_id: Optional[str] = None 
\ No newline at end of file
+    payment_method_id: Optional[str] = None
+    # Versão lida pelo cliente; se informada, a atualização falha com 409 caso a transação tenha mudado
+    version: Optional[int] = None
+
+RECURRENCE_FREQUENCIES = ("weekly", "monthly", "yearly")
+
+class RecurringRuleDTO(BaseModel):
+    id: str
+    description: str
+    amount: Decimal
+    type: str
+    category: str
+    payment_method_id: Optional[str] = None
+    frequency: str
+    interval: int
+    start_date: date
+    end_date: Optional[date] = None
+    count: Optional[int] = None
+    excluded_dates: List[date] = []
+    created_at: datetime
+    updated_at: datetime
+
+    @field_validator('id', 'payment_method_id', mode='before')
+    @classmethod
+    def convert_uuid_to_str(cls, v):
+        if isinstance(v, UUID):
+            return str(v)
+        return v
+
+    @field_validator('amount', mode='before')
+    @classmethod
+    def convert_decimal_to_float(cls, v):
+        if isinstance(v, Decimal):
+            return float(v)
+        return v
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={
+            datetime: lambda v: v.isoformat(),
+            date: lambda v: v.isoformat(),
+            Decimal: lambda v: float(v),
+            UUID: lambda v: str(v)
+        }
+    )
+
+class RecurringRuleUpdateDTO(BaseModel):
+    """Campos da regra; valem para todas as ocorrências ainda não materializadas"""
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+    payment_method_id: Optional[str] = None
+    frequency: Optional[str] = None
+    interval: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    count: Optional[int] = None
+
+    @field_validator('amount')
+    @classmethod
+    def validate_amount(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('O valor da transação deve ser positivo')
+        return v
+
+    @field_validator('type')
+    @classmethod
+    def validate_type(cls, v):
+        if v is not None and v not in ("income", "expense"):
+            raise ValueError('Tipo de transação inválido')
+        return v
+
+    @field_validator('frequency')
+    @classmethod
+    def validate_frequency(cls, v):
+        if v is not None and v not in RECURRENCE_FREQUENCIES:
+            raise ValueError('Frequência inválida. Use weekly, monthly ou yearly')
+        return v
+
+    @field_validator('interval', 'count')
+    @classmethod
+    def validate_positive(cls, v):
+        if v is not None and v < 1:
+            raise ValueError('Deve ser maior ou igual a 1')
+        return v
+
+class RecurringRuleCreateDTO(RecurringRuleUpdateDTO):
+    description: str
+    amount: float
+    type: str
+    category: str
+    frequency: str = "monthly"
+    interval: int = 1
+    start_date: date
+
+    @model_validator(mode='after')
+    def validate_rule(self):
+        if self.type == 'expense' and not self.payment_method_id:
+            raise ValueError('Forma de pagamento é obrigatória para transações do tipo despesa')
+        if self.end_date and self.end_date < self.start_date:
+            raise ValueError('A data final não pode ser anterior à data inicial')
+        return self
+
+class OccurrenceMaterializeDTO(BaseModel):
+    """Valores próprios de uma ocorrência; os omitidos vêm da regra"""
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    category: Optional[str] = None
+    date: Optional[date] = None
+    payment_method_id: Optional[str] = None
+
+    @field_validator('amount')
+    @classmethod
+    def validate_amount(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('O valor da transação deve ser positivo')
+        return v
+
+# Limite de ids por operação em lote
+MAX_BULK_IDS = 1000
+
+class TransactionSelectionDTO(BaseModel):
+    """Seleção de transações para operações em lote; os critérios informados são combinados com E"""
+    ids: Optional[List[str]] = None
+    installment_group_id: Optional[str] = None
+    period: Optional[str] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+
+    @field_validator('ids')
+    @classmethod
+    def validate_ids(cls, v):
+        if v is None:
+            return v
+        if not 1 <= len(v) <= MAX_BULK_IDS:
+            raise ValueError(f'Informe de 1 a {MAX_BULK_IDS} ids')
+        try:
+            return [str(UUID(value)) for value in v]
+        except ValueError:
+            raise ValueError('ID de transação inválido')
+
+    @field_validator('installment_group_id')
+    @classmethod
+    def validate_installment_group_id(cls, v):
+        if v is None:
+            return v
+        try:
+            return str(UUID(v))
+        except ValueError:
+            raise ValueError('ID do parcelamento inválido')
+
+    @model_validator(mode='after')
+    def validate_criteria(self):
+        if not any((self.ids, self.installment_group_id, self.period, self.type, self.category)):
+            raise ValueError('Informe ao menos um critério de seleção')
+        return self
+
+class TransactionBulkChangesDTO(BaseModel):
+    """Campos alterados em todas as transações selecionadas"""
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+    payment_method_id: Optional[str] = None
+
+    @field_validator('amount')
+    @classmethod
+    def validate_amount(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('O valor da transação deve ser positivo')
+        return v
+
+    @field_validator('type')
+    @classmethod
+    def validate_type(cls, v):
+        if v is not None and v not in ("income", "expense"):
+            raise ValueError('Tipo de transação inválido')
+        return v
+
+    @model_validator(mode='after')
+    def validate_changes(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError('Informe ao menos um campo para alterar')
+        return self
+
+class TransactionBulkUpdateDTO(TransactionSelectionDTO):
+    changes: TransactionBulkChangesDTO
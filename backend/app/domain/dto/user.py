@@ -25,6 +25,10 @@ class UserDTO(BaseModel):
         }
     )
 
+class PrincipalDTO(BaseModel):
+    """Usuário autenticado montado apenas a partir das claims verificadas do JWT"""
+    id: str
+
 class UserCreateDTO(BaseModel):
     name: str
     email: str
@@ -0,0 +1,153 @@
+import asyncio
+import ipaddress
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from pydantic_core import to_jsonable_python
+from sqlalchemy import inspect
+from .config import AUDIT_LOG_ENABLED, AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL
+from .db import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# (ip, user agent) da requisição corrente, definido pelo AuditContextMiddleware
+request_context: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar("audit_request_context", default=(None, None))
+
+def set_request_context(ip: Optional[str], user_agent: Optional[str]) -> None:
+    try:
+        ip = str(ipaddress.ip_address(ip)) if ip else None
+    except ValueError:
+        ip = None
+    request_context.set((ip, user_agent))
+
+def snapshot(instance) -> Dict[str, Any]:
+    """Valores das colunas já carregadas de um modelo, convertidos para JSON (Decimal vira string exata).
+
+    Lê só o estado em memória, nunca dispara um SELECT.
+    """
+    state = inspect(instance)
+    values = {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+    return to_jsonable_python(values)
+
+def _values(value) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    return to_jsonable_python(value) if isinstance(value, dict) else snapshot(value)
+
+def audit_entry(action: str, user_id: Any, old=None, new=None, table_name: Optional[str] = None,
+                record_id: Any = None) -> Dict[str, Any]:
+    """Registro de auditoria de uma escrita.
+
+    old/new são instâncias do modelo, dicts já prontos (ex.: snapshot() tirado
+    antes de alterar a instância) ou None. Monte o registro enquanto os
+    atributos estão carregados (antes do commit ou depois do refresh): depois
+    do commit eles expiram e ficariam de fora. Com dicts, informe table_name
+    e record_id.
+    """
+    instance = next((value for value in (new, old) if value is not None and not isinstance(value, dict)), None)
+    record_id = record_id or getattr(instance, "id", None)
+    ip, user_agent = request_context.get()
+    return {
+        "user_id": str(user_id) if user_id else None,
+        "action": action,
+        "table_name": table_name or instance.__tablename__,
+        "record_id": str(record_id) if record_id else None,
+        "old_values": _values(old),
+        "new_values": _values(new),
+        "ip_address": ip,
+        "user_agent": user_agent,
+        # Momento da escrita, não da gravação do lote
+        "created_at": datetime.now(timezone.utc),
+    }
+
+class AuditLog:
+    """Fila em memória de registros de auditoria, gravada em lotes por uma tarefa de fundo.
+
+    record() só enfileira (sem I/O), então a auditoria não soma latência às
+    escritas. A fila é limitada a maxsize registros: acima disso os novos são
+    descartados e contados em dropped. run() grava a cada flush_interval em
+    INSERTs de até batch_size linhas; flush() esvazia a fila no desligamento.
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float, enabled: bool = True):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, entries: Iterable[Dict[str, Any]]) -> None:
+        if not self.enabled:
+            return
+        dropped = 0
+        with self._lock:
+            for entry in entries:
+                if len(self._queue) >= self.maxsize:
+                    dropped += 1
+                    continue
+                self._queue.append(entry)
+                self.recorded += 1
+            self.dropped += dropped
+        if dropped:
+            logger.warning("Fila de auditoria cheia: %s registros descartados", dropped)
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    async def flush(self) -> int:
+        """Grava tudo o que está na fila; um lote com erro é descartado (e contado em failed)"""
+        # Import tardio: os repositórios importam este módulo
+        from .repositories.async_repository import AsyncRepository
+        from .repositories.audit_log_repository import AuditLogRepository
+
+        written = 0
+        while batch := self._take():
+            try:
+                async with AsyncSessionLocal() as db:
+                    await AsyncRepository(db, AuditLogRepository).insert_many(batch)
+            except asyncio.CancelledError:
+                # Cancelado no meio do lote: devolve para o flush do desligamento
+                with self._lock:
+                    self._queue.extendleft(reversed(batch))
+                raise
+            except Exception:
+                self.failed += len(batch)
+                logger.exception("Falha ao gravar %s registros de auditoria", len(batch))
+                continue
+            self.written += len(batch)
+            written += len(batch)
+        return written
+
+    async def run(self) -> None:
+        """Loop de fundo que esvazia a fila periodicamente"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha no gravador de auditoria")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "queued": len(self._queue),
+            "maxsize": self.maxsize,
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+audit_log = AuditLog(AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL, AUDIT_LOG_ENABLED)
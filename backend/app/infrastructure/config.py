@@ -14,4 +14,59 @@ DB_NAME = os.getenv("POSTGRES_DB", "finance_control")
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7")) 
\ No newline at end of file
+JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7")) 
+# Cache em memória dos claims de tokens já verificados (segundos; 0 desativa)
+JWT_CLAIMS_CACHE_TTL = int(os.getenv("JWT_CLAIMS_CACHE_TTL", "300"))
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "10000"))
+# Revogação: intervalo de recarga do conjunto de jti revogados em memória e da limpeza das tabelas
+TOKEN_REVOCATION_REFRESH_SECONDS = int(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "15"))
+TOKEN_SWEEP_INTERVAL_SECONDS = int(os.getenv("TOKEN_SWEEP_INTERVAL_SECONDS", "3600"))
+
+# Debug (habilita o log de SQL)
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+# Pool de conexões (por processo/worker: pool_size + max_overflow conexões no máximo)
+# DB_POOL_*: engine assíncrono, usado pelos handlers da API
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+# DB_SYNC_*: engine síncrono, só para importação/exportação e scripts; limite próprio e pequeno
+DB_SYNC_POOL_SIZE = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+DB_SYNC_MAX_OVERFLOW = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "1"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+# Modo compatível com pgbouncer (transaction pooling): sem pool local e sem parâmetros de startup
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+# Autenticação sem estado: por quanto tempo (segundos) a existência do usuário do token
+# fica em cache. 0 desativa a checagem e confia apenas na assinatura/expiração do JWT.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+
+# Hashing de senhas (bcrypt) em pool de processos
+# BCRYPT_ROUNDS: custo do bcrypt; hashes com outro custo são refeitos no próximo login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 0 = sem pool de processos (uma thread dedicada)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Chamadas em andamento por processo da API antes de responder 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 16)))
+
+# Cache das tabelas de referência (categorias, relacionamentos, formas de pagamento)
+REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", "300"))
+# Propaga invalidações entre workers via LISTEN/NOTIFY (não funciona atrás de pgbouncer em transaction pooling)
+REFERENCE_CACHE_NOTIFY = os.getenv("REFERENCE_CACHE_NOTIFY", "false").lower() in ("1", "true", "yes")
+
+# Cache dos resumos mensais (finanças e dívidas) por usuário/período
+# SUMMARY_CACHE_BACKEND: memory (por processo), redis (compartilhado, usa SUMMARY_CACHE_URL) ou off
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "memory").lower()
+SUMMARY_CACHE_URL = os.getenv("SUMMARY_CACHE_URL", "redis://localhost:6379/0")
+SUMMARY_CACHE_TTL = int(os.getenv("SUMMARY_CACHE_TTL", "300"))
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "10000"))
+
+# Auditoria (audit_logs): registros vão para uma fila em memória gravada em lotes por uma tarefa de fundo
+AUDIT_LOG_ENABLED = os.getenv("AUDIT_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+# Registros pendentes por processo; acima disso novos registros são descartados (e contados)
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
@@ -1,17 +1,50 @@
+from typing import AsyncIterator
+from starlette.requests import Request
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from .config import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+from .db_pool import engine_options, async_engine_options, install_checkout_counter
 
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=True, future=True)
+# Engine síncrono: scripts, importação e exportação em stream (rodam no threadpool)
+engine = create_engine(DATABASE_URL, **engine_options())
+install_checkout_counter(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine assíncrono (asyncpg): handlers async def da API
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options())
+install_checkout_counter(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db() -> Session:
-    """Dependency para obter a sessão do banco de dados"""
+    """Dependency para obter a sessão do banco de dados.
+
+    É a única forma de abrir a sessão de uma requisição: o FastAPI resolve a
+    dependência uma vez por requisição, então autenticação e handler
+    compartilham a mesma sessão. O header X-DB-Checkouts mostra quantas vezes
+    ela pegou uma conexão do pool.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency para obter a AsyncSession da requisição (uma por requisição, como get_db).
+
+    Se um middleware já abriu a sessão da requisição (request.state.db, caso do
+    ETagMiddleware), ela é reutilizada e fechada pelo próprio middleware; assim
+    a requisição continua pegando uma única conexão do pool.
+    """
+    db = getattr(request.state, "db", None)
+    if db is not None:
+        yield db
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
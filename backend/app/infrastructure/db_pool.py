@@ -0,0 +1,108 @@
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from .config import (
+    DEBUG, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS, DB_PGBOUNCER,
+)
+
+logger = logging.getLogger(__name__)
+
+def engine_options() -> Dict[str, Any]:
+    """Argumentos de create_engine derivados das variáveis de ambiente.
+
+    O engine síncrono só atende importação/exportação e scripts, então tem o
+    seu próprio limite (DB_SYNC_POOL_SIZE + DB_SYNC_MAX_OVERFLOW), menor que o
+    do engine assíncrono das requisições.
+    """
+    options: Dict[str, Any] = {"echo": DEBUG, "future": True}
+    if DB_PGBOUNCER:
+        # O pgbouncer já faz o pool; manter conexões locais só multiplicaria o uso.
+        # Parâmetros de startup (options=-c ...) são rejeitados pelo pgbouncer.
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        poolclass=QueuePool,
+        pool_size=DB_SYNC_POOL_SIZE,
+        max_overflow=DB_SYNC_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+def async_engine_options() -> Dict[str, Any]:
+    """Argumentos de create_async_engine (asyncpg), com o limite DB_POOL_SIZE + DB_MAX_OVERFLOW"""
+    options: Dict[str, Any] = {"echo": DEBUG}
+    if DB_PGBOUNCER:
+        # Prepared statements nomeados do asyncpg não sobrevivem ao transaction pooling
+        options["poolclass"] = NullPool
+        options["connect_args"] = {"statement_cache_size": 0}
+        return options
+    options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return options
+
+class CheckoutCounter:
+    """Conta os checkouts de conexão feitos durante uma requisição"""
+
+    def __init__(self):
+        self.count = 0
+
+_checkouts_total = 0
+_request_counter: ContextVar[Optional[CheckoutCounter]] = ContextVar("db_checkout_counter", default=None)
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    global _checkouts_total
+    _checkouts_total += 1
+    counter = _request_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+def install_checkout_counter(engine) -> None:
+    """Registra a contagem de checkouts (total do processo e por requisição) no engine"""
+    event.listen(engine, "checkout", _on_checkout)
+
+def start_request_counter() -> CheckoutCounter:
+    """Inicia a contagem de checkouts do contexto atual (uma requisição)"""
+    counter = CheckoutCounter()
+    _request_counter.set(counter)
+    return counter
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Estatísticas do pool do processo atual"""
+    pool = engine.pool
+    if isinstance(pool, (QueuePool, AsyncAdaptedQueuePool)):
+        return {
+            "mode": "queue",
+            "size": pool.size(),
+            "checkedIn": pool.checkedin(),
+            "checkedOut": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "maxOverflow": pool._max_overflow,
+            "checkoutsTotal": _checkouts_total,
+        }
+    return {"mode": "pgbouncer" if DB_PGBOUNCER else type(pool).__name__, "checkoutsTotal": _checkouts_total}
+
+def log_pool_config() -> None:
+    if DB_PGBOUNCER:
+        logger.info("Pool de conexões: modo pgbouncer (NullPool)")
+    else:
+        logger.info(
+            "Pool de conexões: pool_size=%s max_overflow=%s (síncrono %s+%s) timeout=%ss recycle=%ss pre_ping=%s "
+            "statement_timeout=%sms",
+            DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+            DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS,
+        )
@@ -1,7 +1,24 @@
+import hashlib
+import time
+import uuid
 import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
-from .config import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES, JWT_REFRESH_TOKEN_EXPIRE_DAYS
+from .config import (
+    JWT_SECRET_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES, JWT_REFRESH_TOKEN_EXPIRE_DAYS,
+    JWT_CLAIMS_CACHE_TTL, JWT_CLAIMS_CACHE_SIZE,
+)
+from .ttl_cache import TTLCache
+
+# sha256(token) -> claims já verificados; cada entrada expira no máximo no exp do próprio token
+claims_cache = TTLCache(maxsize=JWT_CLAIMS_CACHE_SIZE, ttl=JWT_CLAIMS_CACHE_TTL)
+
+def new_jti() -> str:
+    """Identificador único do token (claim jti), usado na revogação"""
+    return uuid.uuid4().hex
+
+def expiration_of(payload: Dict[str, Any]) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -10,6 +27,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(minutes=JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     
+    to_encode.setdefault("jti", new_jti())
     to_encode.update({"exp": expire, "type": "access"})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
@@ -17,6 +35,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.setdefault("jti", new_jti())
     to_encode.update({"exp": expire, "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
@@ -28,6 +47,35 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     except:
         return None
 
+def token_key(token: str) -> str:
+    # O token em si não fica em memória, só o hash
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """verify_token com cache dos claims; o dict retornado é compartilhado e não deve ser alterado.
+
+    Tokens inválidos não entram no cache. O exp é conferido também no acerto,
+    e forget_token remove um token revogado antes do vencimento.
+    """
+    if JWT_CLAIMS_CACHE_TTL <= 0:
+        return verify_token(token)
+    key = token_key(token)
+    payload = claims_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        claims_cache.invalidate(key)
+        return None
+    payload = verify_token(token)
+    if payload and "exp" in payload:
+        ttl = min(JWT_CLAIMS_CACHE_TTL, payload["exp"] - time.time())
+        if ttl > 0:
+            claims_cache.set(key, payload, ttl)
+    return payload
+
+def forget_token(token: str) -> None:
+    claims_cache.invalidate(token_key(token))
+
 def get_user_id_from_token(token: str) -> Optional[str]:
     payload = verify_token(token)
     if payload and payload.get("type") == "access":
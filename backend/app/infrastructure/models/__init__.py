@@ -2,19 +2,32 @@
 from .user import UserModel
 from .category import CategoryModel
 from .transaction import TransactionModel
+from .recurring_rule import RecurringRuleModel
 from .relationship import RelationshipModel
 from .people import PeopleModel
 from .debt import DebtsModel
+from .debt_payment import DebtPaymentModel
 from .goal import GoalModel
 from .payment_method import PaymentMethodModel
+from .monthly_total import MonthlyTotalModel
+from .data_version import DataVersionModel
+from .token import RefreshTokenModel, TokenBlacklistModel
+from .audit_log import AuditLogModel
 
 __all__ = [
     'UserModel',
     'CategoryModel',
     'TransactionModel',
+    'RecurringRuleModel',
     'RelationshipModel',
     'PeopleModel',
     'DebtsModel',
+    'DebtPaymentModel',
     'GoalModel',
-    'PaymentMethodModel'
+    'PaymentMethodModel',
+    'MonthlyTotalModel',
+    'DataVersionModel',
+    'RefreshTokenModel',
+    'TokenBlacklistModel',
+    'AuditLogModel'
 ] 
\ No newline at end of file
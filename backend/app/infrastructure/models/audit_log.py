@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
+import uuid
+from ..db import Base
+
+class AuditLogModel(Base):
+    """Trilha de auditoria: estado antes (old_values) e depois (new_values) de cada escrita"""
+    __tablename__ = "audit_logs"
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="SET NULL"))
+    action = Column(String(100), nullable=False)
+    table_name = Column(String(50), nullable=False)
+    record_id = Column(UUID(as_uuid=False))
+    old_values = Column(JSONB(none_as_null=True))
+    new_values = Column(JSONB(none_as_null=True))
+    ip_address = Column(INET)
+    user_agent = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
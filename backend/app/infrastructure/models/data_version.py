@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from ..db import Base
+
+class DataVersionModel(Base):
+    """Versão dos dados do usuário por tabela, incrementada pelos triggers bump_data_version"""
+    __tablename__ = "data_versions"
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
@@ -19,6 +19,10 @@ class DebtsModel(Base):
     installments = Column(Integer)
     total_installments = Column(Integer)
     payment_method_id = Column(UUID(as_uuid=True), ForeignKey("payment_methods.id"), nullable=True)
+    # Compartilhado pelas parcelas geradas por um mesmo cadastro
+    installment_group_id = Column(UUID(as_uuid=True), nullable=True)
+    # Incrementada a cada atualização (concorrência otimista)
+    version = Column(Integer, nullable=False, server_default="1")
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
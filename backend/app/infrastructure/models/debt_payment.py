@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Date, DateTime, func, ForeignKey, DECIMAL
+from sqlalchemy.dialects.postgresql import UUID
+from ..db import Base
+
+class DebtPaymentModel(Base):
+    """Lançamento do histórico de pagamentos de uma dívida (somente inserções)"""
+    __tablename__ = "debt_payments"
+
+    # Gerado no banco: os lançamentos da quitação são inseridos por INSERT ... SELECT
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
+    debt_id = Column(UUID(as_uuid=True), ForeignKey("debts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    amount = Column(DECIMAL(10, 2), nullable=False)
+    paid_at = Column(Date, nullable=False, server_default=func.current_date())
+    note = Column(String(200))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Boolean, Integer, Numeric, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from ..db import Base
+
+class MonthlyTotalModel(Base):
+    __tablename__ = "monthly_totals"
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year_month = Column(String(7), primary_key=True)
+    type = Column(String(10), primary_key=True)
+    category = Column(String(50), primary_key=True)
+    is_recurring = Column(Boolean, primary_key=True, default=False)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    transactions_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy import Column, String, TIMESTAMP, text, Integer, Numeric, ForeignKey, Date
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from ..db import Base
+
+class RecurringRuleModel(Base):
+    """Regra de recorrência (estilo RRULE: FREQ, INTERVAL, DTSTART, UNTIL, COUNT, EXDATE).
+
+    As ocorrências não são gravadas: são projetadas a partir da regra e só viram
+    linhas em transactions (recurring_rule_id, occurrence_date) quando alteradas.
+    """
+    __tablename__ = "recurring_rules"
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    description = Column(String(200), nullable=False)
+    amount = Column(Numeric(10,2), nullable=False)
+    type = Column(String(10), nullable=False)
+    category = Column(String(50), ForeignKey("categories.id"), nullable=False)
+    payment_method_id = Column(UUID(as_uuid=False), ForeignKey("payment_methods.id"), nullable=True)
+    frequency = Column(String(10), nullable=False, server_default=text("'monthly'"))
+    interval = Column("interval", Integer, nullable=False, server_default=text("1"), quote=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    count = Column(Integer, nullable=True)
+    excluded_dates = Column(ARRAY(Date), nullable=False, server_default=text("'{}'"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
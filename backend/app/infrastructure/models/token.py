@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from ..db import Base
+
+class RefreshTokenModel(Base):
+    """Refresh tokens emitidos; token guarda o jti. Apagar a linha revoga o refresh token."""
+    __tablename__ = "refresh_tokens"
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token = Column(String(500), nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+
+class TokenBlacklistModel(Base):
+    """Access tokens revogados antes do exp; token guarda o jti"""
+    __tablename__ = "token_blacklist"
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    token = Column(String(500), nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
@@ -1,12 +1,13 @@
 from sqlalchemy import Column, String, TIMESTAMP, text, Integer, Numeric, Boolean, ForeignKey, Date
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 from ..db import Base
 
 class TransactionModel(Base):
     __tablename__ = "transactions"
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
     description = Column(String(200), nullable=False)
     amount = Column(Numeric(10,2), nullable=False)
     type = Column(String(10), nullable=False)
@@ -16,7 +17,14 @@ class TransactionModel(Base):
     installments = Column(Integer, nullable=True)
     total_installments = Column(Integer, nullable=True)
     due_date = Column(Date, nullable=True)
-    payment_method_id = Column(String, ForeignKey("payment_methods.id"), nullable=True)
+    payment_method_id = Column(UUID(as_uuid=False), ForeignKey("payment_methods.id"), nullable=True)
+    # Compartilhado pelas parcelas geradas por um mesmo cadastro
+    installment_group_id = Column(UUID(as_uuid=False), nullable=True)
+    # Ocorrência materializada de uma regra de recorrência e a data dela na regra
+    recurring_rule_id = Column(UUID(as_uuid=False), ForeignKey("recurring_rules.id", ondelete="SET NULL"), nullable=True)
+    occurrence_date = Column(Date, nullable=True)
+    # Incrementada a cada atualização (concorrência otimista)
+    version = Column(Integer, nullable=False, server_default=text("1"))
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
     updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
 
@@ -1,10 +1,11 @@
 from sqlalchemy import Column, String, TIMESTAMP, text
+from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from ..db import Base
 
 class UserModel(Base):
     __tablename__ = "users"
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
@@ -0,0 +1,21 @@
+import base64
+import uuid
+from datetime import date
+from typing import Tuple
+
+CURSOR_SEPARATOR = "|"
+
+def encode_cursor(last_date: date, last_id: str) -> str:
+    """Gera um cursor opaco a partir da chave (date, id) do último item da página"""
+    raw = f"{last_date.isoformat()}{CURSOR_SEPARATOR}{last_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """Decodifica um cursor gerado por encode_cursor; lança ValueError se for inválido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        date_part, id_part = raw.split(CURSOR_SEPARATOR, 1)
+        return date.fromisoformat(date_part), str(uuid.UUID(id_part))
+    except Exception:
+        raise ValueError("Cursor inválido")
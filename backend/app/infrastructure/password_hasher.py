@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from passlib.context import CryptContext
+from .config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+logger = logging.getLogger(__name__)
+
+# Criado também em cada processo do pool (o módulo é importado pelo worker).
+# Hashes com custo diferente de BCRYPT_ROUNDS são considerados desatualizados.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+class PasswordHasherBusy(Exception):
+    """A fila do pool de hashing está cheia; o cliente deve tentar novamente"""
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    # Retorna (senha confere, novo hash se o custo mudou)
+    return pwd_context.verify_and_update(password, password_hash)
+
+class PasswordHasher:
+    """Executa o bcrypt em um pool de processos limitado, fora do event loop.
+
+    No máximo max_pending chamadas ficam em andamento (executando ou na fila do
+    pool); acima disso a chamada falha na hora com PasswordHasherBusy em vez de
+    acumular latência para todas as outras requisições.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: não herda threads nem conexões abertas do processo da API
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-hasher")
+            return self._executor
+
+    async def _submit(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # Um worker morreu (OOM, kill): descarta o pool; o próximo uso cria outro
+            logger.exception("Pool de hashing de senhas quebrado; recriando")
+            self.shutdown()
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        return await self._submit(_verify_and_update, password, password_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "workers": self.workers,
+                "inFlight": in_flight,
+                "queueDepth": max(in_flight - max(self.workers, 1), 0),
+                "maxPending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rounds": BCRYPT_ROUNDS,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,104 @@
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_, true
+
+PERIOD_FORMAT_ERROR = "Período inválido. Use YYYY-MM, YYYY-Qn ou YYYY"
+
+_MONTH = re.compile(r"^(\d{4})-(\d{1,2})$")
+_QUARTER = re.compile(r"^(\d{4})-[Qq]([1-4])$")
+_YEAR = re.compile(r"^(\d{4})$")
+
+@dataclass(frozen=True)
+class Period:
+    """Intervalo de datas semiaberto [start, end); qualquer um dos limites pode ser aberto (None).
+
+    filter() gera comparações diretas na coluna (date >= start AND date < end),
+    que usam os índices em (user_id, date), ao contrário de extract() ou LIKE.
+    """
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @classmethod
+    def month(cls, year: int, month: int) -> "Period":
+        start = date(year, month, 1)
+        return cls(start, start + relativedelta(months=1))
+
+    @classmethod
+    def quarter(cls, year: int, quarter: int) -> "Period":
+        start = date(year, 3 * (quarter - 1) + 1, 1)
+        return cls(start, start + relativedelta(months=3))
+
+    @classmethod
+    def year(cls, year: int) -> "Period":
+        return cls(date(year, 1, 1), date(year + 1, 1, 1))
+
+    @classmethod
+    def between(cls, first: Optional[date] = None, last: Optional[date] = None) -> "Period":
+        """Período de first até last, ambos inclusivos (como vêm de from/to na query string)"""
+        if first and last and first > last:
+            raise ValueError("A data inicial não pode ser posterior à data final")
+        return cls(first, last + timedelta(days=1) if last else None)
+
+    @classmethod
+    def parse(cls, value: str) -> "Period":
+        """Converte YYYY-MM, YYYY-Qn ou YYYY em um período; lança ValueError se o formato for inválido"""
+        value = value.strip()
+        try:
+            if match := _MONTH.match(value):
+                return cls.month(int(match.group(1)), int(match.group(2)))
+            if match := _QUARTER.match(value):
+                return cls.quarter(int(match.group(1)), int(match.group(2)))
+            if match := _YEAR.match(value):
+                return cls.year(int(match.group(1)))
+        except ValueError:
+            pass
+        raise ValueError(PERIOD_FORMAT_ERROR)
+
+    def filter(self, column):
+        """Condição SQL equivalente a start <= column < end"""
+        conditions = []
+        if self.start:
+            conditions.append(column >= self.start)
+        if self.end:
+            conditions.append(column < self.end)
+        return and_(*conditions) if conditions else true()
+
+    def __contains__(self, value: date) -> bool:
+        return (self.start is None or value >= self.start) and (self.end is None or value < self.end)
+
+    def month_keys(self) -> Tuple[str, str]:
+        """Chaves YYYY-MM [primeiro mês, mês seguinte ao último) para o rollup monthly_totals.
+
+        Só vale para períodos fechados e alinhados ao mês (os gerados por parse).
+        """
+        if not (self.start and self.end and self.start.day == 1 and self.end.day == 1):
+            raise ValueError("O período precisa começar e terminar em meses completos")
+        return self.start.strftime("%Y-%m"), self.end.strftime("%Y-%m")
+
+    def months(self) -> List[str]:
+        """Meses (YYYY-MM) de um período alinhado ao mês, em ordem"""
+        self.month_keys()
+        months, current = [], self.start
+        while current < self.end:
+            months.append(current.strftime("%Y-%m"))
+            current += relativedelta(months=1)
+        return months
+
+def resolve_period(month: Optional[str] = None, period: Optional[str] = None,
+                   date_from: Optional[date] = None, date_to: Optional[date] = None) -> Optional[Period]:
+    """Combina os parâmetros de período aceitos pelas listagens em um único Period (ou None).
+
+    month/period aceitam os formatos de Period.parse; from/to são datas inclusivas.
+    Informar mais de uma forma ao mesmo tempo é erro.
+    """
+    given = [value for value in (month, period) if value]
+    if len(given) > 1 or (given and (date_from or date_to)):
+        raise ValueError("Informe apenas um entre month, period ou from/to")
+    if given:
+        return Period.parse(given[0])
+    if date_from or date_to:
+        return Period.between(date_from, date_to)
+    return None
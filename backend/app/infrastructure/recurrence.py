@@ -0,0 +1,138 @@
+from datetime import date, timedelta
+from uuid import UUID
+from typing import Collection, Iterator, Optional, Tuple
+from dateutil.relativedelta import relativedelta
+from .period import Period
+
+# Ocorrência ainda não materializada: "<id da regra>:<YYYY-MM-DD>"
+OCCURRENCE_SEPARATOR = ":"
+
+def _step(frequency: str, interval: int, index: int) -> relativedelta:
+    """Deslocamento da ocorrência de número index em relação ao início.
+
+    Calculado sempre a partir do início (e não somando à anterior), então uma
+    regra mensal do dia 31 cai em 28/02 e volta a 31/03.
+    """
+    if frequency == "weekly":
+        return relativedelta(weeks=interval * index)
+    if frequency == "monthly":
+        return relativedelta(months=interval * index)
+    if frequency == "yearly":
+        return relativedelta(years=interval * index)
+    raise ValueError(f"Frequência inválida: {frequency}")
+
+def _first_index(frequency: str, interval: int, start: date, since: date) -> int:
+    """Menor índice cuja ocorrência pode cair em since ou depois (estimativa por baixo)"""
+    if since <= start:
+        return 0
+    if frequency == "weekly":
+        return (since - start).days // (7 * interval)
+    months = (since.year - start.year) * 12 + since.month - start.month
+    if frequency == "yearly":
+        months //= 12
+    return max(months // interval - 1, 0)
+
+def _last_index(frequency: str, interval: int, start: date, until: date) -> int:
+    """Maior índice cuja ocorrência pode cair em until ou antes (estimativa por cima); -1 se until < start"""
+    if until < start:
+        return -1
+    if frequency == "weekly":
+        return (until - start).days // (7 * interval)
+    months = (until.year - start.year) * 12 + until.month - start.month
+    if frequency == "yearly":
+        months //= 12
+    return months // interval
+
+def _last_date(period: Period, end_date: Optional[date]) -> Optional[date]:
+    """Última data (inclusiva) em que uma ocorrência pode cair"""
+    limits = [d for d in (end_date, period.end and period.end - timedelta(days=1)) if d]
+    return min(limits) if limits else None
+
+def occurrences(frequency: str, interval: int, start: date, period: Period,
+                end_date: Optional[date] = None, count: Optional[int] = None,
+                excluded: Collection[date] = ()) -> Iterator[date]:
+    """Datas das ocorrências de uma regra (estilo RRULE: FREQ, INTERVAL, UNTIL, COUNT, EXDATE) dentro do período.
+
+    Gerador preguiçoso: salta direto para o início do período e para no fim
+    dele, em end_date (inclusivo) ou após count ocorrências. O período precisa
+    ter fim, ou a regra precisa ter end_date/count.
+    """
+    if period.end is None and end_date is None and count is None:
+        raise ValueError("Projeção sem fim: informe um período com data final")
+    index = _first_index(frequency, interval, start, period.start) if period.start else 0
+    while count is None or index < count:
+        current = start + _step(frequency, interval, index)
+        if (end_date and current > end_date) or (period.end and current >= period.end):
+            return
+        if current in period and current not in excluded:
+            yield current
+        index += 1
+
+def occurrences_desc(frequency: str, interval: int, start: date, period: Period,
+                     end_date: Optional[date] = None, count: Optional[int] = None,
+                     excluded: Collection[date] = ()) -> Iterator[date]:
+    """As mesmas datas de occurrences, da mais recente para a mais antiga.
+
+    Começa pela última ocorrência antes do fim do período (ou de end_date/count)
+    e para no início dele; quem consome só as primeiras (uma página) não paga
+    pelo resto do histórico.
+    """
+    last = _last_date(period, end_date)
+    if last is None and count is None:
+        raise ValueError("Projeção sem fim: informe um período com data final")
+    index = _last_index(frequency, interval, start, last) if last else count - 1
+    if count is not None:
+        index = min(index, count - 1)
+    while index >= 0:
+        current = start + _step(frequency, interval, index)
+        if period.start and current < period.start:
+            return
+        if (last is None or current <= last) and current in period and current not in excluded:
+            yield current
+        index -= 1
+
+def count_occurrences(frequency: str, interval: int, start: date, period: Period,
+                      end_date: Optional[date] = None, count: Optional[int] = None,
+                      excluded: Collection[date] = ()) -> int:
+    """Quantidade de datas que occurrences geraria, calculada pelos índices sem gerar as datas"""
+    last = _last_date(period, end_date)
+    if last is None and count is None:
+        raise ValueError("Projeção sem fim: informe um período com data final")
+    first = _first_index(frequency, interval, start, period.start) if period.start else 0
+    while period.start and start + _step(frequency, interval, first) < period.start:
+        first += 1
+    final = _last_index(frequency, interval, start, last) if last else count - 1
+    while last and final >= first and start + _step(frequency, interval, final) > last:
+        final -= 1
+    if count is not None:
+        final = min(final, count - 1)
+    if final < first:
+        return 0
+    skipped = sum(
+        1 for d in set(excluded)
+        if d in period and (last is None or d <= last)
+        and is_occurrence(frequency, interval, start, d, end_date, count)
+    )
+    return final - first + 1 - skipped
+
+def occurrence_id(rule_id: str, occurrence_date: date) -> str:
+    return f"{rule_id}{OCCURRENCE_SEPARATOR}{occurrence_date.isoformat()}"
+
+def parse_occurrence_id(value: str) -> Optional[Tuple[str, date]]:
+    """(id da regra, data) de um id de ocorrência; None se for o id de uma transação.
+
+    Lança ValueError se o id tiver o separador mas não for uma ocorrência válida.
+    """
+    if OCCURRENCE_SEPARATOR not in value:
+        return None
+    rule_id, _, raw_date = value.partition(OCCURRENCE_SEPARATOR)
+    try:
+        return str(UUID(rule_id)), date.fromisoformat(raw_date)
+    except ValueError:
+        raise ValueError("ID de ocorrência inválido")
+
+def is_occurrence(frequency: str, interval: int, start: date, value: date, end_date: Optional[date] = None,
+                  count: Optional[int] = None, excluded: Collection[date] = ()) -> bool:
+    """Se value é uma ocorrência (não excluída) da regra"""
+    period = Period(value, value + timedelta(days=1))
+    return next(occurrences(frequency, interval, start, period, end_date, count, excluded), None) is not None
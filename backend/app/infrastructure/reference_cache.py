@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple, TypeVar
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from .config import (
+    DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME,
+    REFERENCE_CACHE_TTL, REFERENCE_CACHE_NOTIFY,
+)
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = "categories"
+RELATIONSHIPS = "relationships"
+PAYMENT_METHODS = "payment_methods"
+
+NOTIFY_CHANNEL = "reference_data"
+# Tabelas a invalidar quando a transação fizer commit, em Session.info
+_PENDING = "reference_cache_pending"
+
+T = TypeVar("T")
+
+class ReferenceCache:
+    """Cache por processo das tabelas de referência (categorias, relacionamentos, formas de pagamento).
+
+    Cada tabela tem um contador de versão: uma escrita incrementa a versão e a
+    próxima leitura recarrega. Um carregamento que começou antes da
+    invalidação não é guardado, então dados antigos não voltam ao cache.
+    Com REFERENCE_CACHE_NOTIFY as invalidações são propagadas aos outros
+    workers via LISTEN/NOTIFY; sem ele, REFERENCE_CACHE_TTL limita o atraso.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: Dict[str, int] = {}
+        self._entries: Dict[str, Tuple[int, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, loader: Callable[[], T]) -> T:
+        now = time.monotonic()
+        with self._lock:
+            version = self._versions.get(name, 0)
+            entry = self._entries.get(name)
+            if entry and entry[0] == version and now - entry[1] < self.ttl:
+                return entry[2]
+        value = loader()
+        with self._lock:
+            if self._versions.get(name, 0) == version:
+                self._entries[name] = (version, now, value)
+        return value
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            self._entries.pop(name, None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            for name in list(self._entries):
+                self._versions[name] = self._versions.get(name, 0) + 1
+            self._entries.clear()
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    @staticmethod
+    def publish(db: Session, name: str) -> None:
+        """Agenda o NOTIFY na transação corrente; o Postgres só o entrega no commit"""
+        if REFERENCE_CACHE_NOTIFY:
+            db.execute(text("SELECT pg_notify(:channel, :name)"), {"channel": NOTIFY_CHANNEL, "name": name})
+
+    def invalidate_on_commit(self, db: Session, name: str) -> None:
+        """Marca a tabela para invalidar, aqui e nos outros workers, quando a transação da sessão fizer commit.
+
+        O commit continua com o repositório; em rollback a marcação é descartada.
+        """
+        self.publish(db, name)
+        if not db.in_transaction():
+            db.begin()
+        db.info.setdefault(_PENDING, set()).add(name)
+
+reference_cache = ReferenceCache(REFERENCE_CACHE_TTL)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for name in session.info.pop(_PENDING, ()):
+        reference_cache.invalidate(name)
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+async def listen_for_invalidations() -> None:
+    """Mantém uma conexão dedicada (fora do pool) em LISTEN e invalida os caches a cada NOTIFY.
+
+    O mesmo canal leva as invalidações do cache de resumos (payload summary:...).
+    """
+    import asyncpg
+    from .summary_cache import summary_cache, NOTIFY_PREFIX
+
+    def on_notify(connection, pid, channel, payload):
+        if payload.startswith(NOTIFY_PREFIX):
+            summary_cache.receive(payload)
+        else:
+            reference_cache.invalidate(payload)
+
+    delay = 1
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(
+                user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=int(DB_PORT), database=DB_NAME
+            )
+            await connection.add_listener(NOTIFY_CHANNEL, on_notify)
+            # Notificações perdidas enquanto a conexão estava fora
+            reference_cache.invalidate_all()
+            summary_cache.clear()
+            delay = 1
+            while not connection.is_closed():
+                await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("LISTEN %s falhou; nova tentativa em %ss", NOTIFY_CHANNEL, delay)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from .models import UserModel, TransactionModel, CategoryModel
+from .period import Period
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import and_, or_
 from typing import List, Optional
@@ -29,10 +30,10 @@ class TransactionRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self, user_id: str, month: Optional[str] = None, type_: Optional[str] = None, category: Optional[str] = None, page: int = 1, limit: int = 20):
+    def list(self, user_id: str, period: Optional[Period] = None, type_: Optional[str] = None, category: Optional[str] = None, page: int = 1, limit: int = 20):
         query = self.db.query(TransactionModel).filter(TransactionModel.user_id == user_id)
-        if month:
-            query = query.filter(TransactionModel.date.like(f"{month}%"))
+        if period:
+            query = query.filter(period.filter(TransactionModel.date))
         if type_:
             query = query.filter(TransactionModel.type == type_)
         if category:
@@ -3,15 +3,25 @@
 from .user_repository import UserRepository
 from .category_repository import CategoryRepository
 from .transaction_repository import TransactionRepository
+from .recurring_rule_repository import RecurringRuleRepository
 from .relationship_repository import RelationshipRepository
 from .people_repository import PeopleRepository
 from .debt_repository import DebtRepository
+from .token_repository import TokenRepository
+from .data_version_repository import DataVersionRepository
+from .audit_log_repository import AuditLogRepository
+from .async_repository import AsyncRepository
 
 __all__ = [
     'UserRepository',
     'CategoryRepository', 
     'TransactionRepository',
+    'RecurringRuleRepository',
     'RelationshipRepository',
     'PeopleRepository',
-    'DebtRepository'
+    'DebtRepository',
+    'TokenRepository',
+    'DataVersionRepository',
+    'AuditLogRepository',
+    'AsyncRepository'
 ] 
\ No newline at end of file
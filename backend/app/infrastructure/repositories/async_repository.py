@@ -0,0 +1,56 @@
+from typing import Any, Awaitable, Callable, Concatenate, Generic, ParamSpec, TypeVar
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+R = TypeVar("R")
+P = ParamSpec("P")
+
+class AsyncRepository(Generic[T]):
+    """Expõe os métodos de um repositório (ou caso de uso) síncrono como corrotinas.
+
+    Cada chamada roda via AsyncSession.run_sync: o código do repositório é o
+    mesmo da versão síncrona, mas o I/O passa pelo asyncpg no event loop, sem
+    ocupar uma thread. factory recebe a Session síncrona e devolve a instância,
+    ex.: AsyncRepository(db, TransactionRepository).
+
+    Por que run_sync e não consultas nativas da AsyncSession: os repositórios
+    usam lazy loading, Query e flush/refresh implícitos, que na AsyncSession
+    exigiriam reescrever cada método (await em todo acesso que faz I/O) e manter
+    duas versões, já que scripts, importação e exportação continuam síncronos.
+    Com run_sync há uma única implementação, e a sessão e a conexão são as
+    mesmas da requisição.
+
+    call() é a forma tipada: await repo.call(TransactionRepository.get, user_id, id)
+    tem os argumentos e o retorno do método verificados. O atalho
+    await repo.get(user_id, id) continua valendo, mas só para métodos públicos.
+    """
+
+    def __init__(self, db: AsyncSession, factory: Callable[[Session], T]):
+        self.db = db
+        self.factory = factory
+
+    async def run(self, fn: Callable[[T], R]) -> R:
+        return await self.db.run_sync(lambda session: fn(self.factory(session)))
+
+    async def call(self, method: Callable[Concatenate[T, P], R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Chama um método do repositório (passado pela classe) dentro da run_sync"""
+        return await self.run(lambda repo: method(repo, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        # Só métodos públicos: atributos privados, dunders e campos não viram corrotinas
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if isinstance(self.factory, type) and not callable(getattr(self.factory, name, None)):
+            raise AttributeError(f"{self.factory.__name__} não tem o método {name}")
+
+        def method(repo: T) -> Callable[..., Any]:
+            attribute = getattr(repo, name)
+            if not callable(attribute):
+                raise TypeError(f"{type(repo).__name__}.{name} não é um método")
+            return attribute
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(lambda repo: method(repo)(*args, **kwargs))
+        call.__name__ = name
+        return call
@@ -0,0 +1,16 @@
+from typing import Any, Dict, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..models.audit_log import AuditLogModel
+
+class AuditLogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert_many(self, entries: List[Dict[str, Any]]) -> int:
+        """Grava um lote de registros de auditoria em um único INSERT ... VALUES (...), (...) e faz commit"""
+        if not entries:
+            return 0
+        self.db.execute(insert(AuditLogModel).values(entries))
+        self.db.commit()
+        return len(entries)
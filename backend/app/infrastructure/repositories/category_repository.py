@@ -1,33 +1,36 @@
+from typing import Dict
 from sqlalchemy.orm import Session
 from ..models.category import CategoryModel
+from ..reference_cache import reference_cache, CATEGORIES
 from ...domain.dto.category import CategoryDTO
 
 class CategoryRepository:
     def __init__(self, db: Session):
         self.db = db
+
+    def _by_id(self) -> Dict[str, CategoryDTO]:
+        """Categorias por ID, lidas do cache de referência (carregadas do banco só após invalidação)"""
+        return reference_cache.get(CATEGORIES, lambda: {
+            category.id: CategoryDTO.model_validate(category)
+            for category in self.db.query(CategoryModel).all()
+        })
     
     def get_all(self) -> list[CategoryDTO]:
         """Busca todas as categorias"""
-        categories = self.db.query(CategoryModel).all()
-        return [CategoryDTO.model_validate(category) for category in categories]
+        return list(self._by_id().values())
     
     def get_by_id(self, category_id: str) -> CategoryDTO | None:
         """Busca uma categoria por ID"""
-        category = self.db.query(CategoryModel).filter(
-            CategoryModel.id == category_id
-        ).first()
-        
-        if not category:
-            return None
-            
-        return CategoryDTO.model_validate(category) 
+        return self._by_id().get(category_id)
 
     def create(self, category_data):
         """Cria uma nova categoria"""
         category = CategoryModel(**category_data)
         self.db.add(category)
-        self.db.commit()
+        reference_cache.invalidate_on_commit(self.db, CATEGORIES)
+        self.db.flush()
         self.db.refresh(category)
+        self.db.commit()
         return CategoryDTO.model_validate(category)
 
     def update(self, category_id: str, update_data: dict):
@@ -37,8 +40,10 @@ class CategoryRepository:
             return None
         for key, value in update_data.items():
             setattr(category, key, value)
-        self.db.commit()
+        reference_cache.invalidate_on_commit(self.db, CATEGORIES)
+        self.db.flush()
         self.db.refresh(category)
+        self.db.commit()
         return CategoryDTO.model_validate(category)
 
     def delete(self, category_id: str):
@@ -47,5 +52,6 @@ class CategoryRepository:
         if not category:
             return False
         self.db.delete(category)
+        reference_cache.invalidate_on_commit(self.db, CATEGORIES)
         self.db.commit()
-        return True 
\ No newline at end of file
+        return True 
@@ -0,0 +1,28 @@
+import uuid
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Iterable, Tuple
+from ..models.data_version import DataVersionModel
+
+# Tabelas por usuário com triggers bump_data_version (db/migrations/006_data_versions.sql)
+VERSIONED_TABLES = ("transactions", "recurring_rules", "debts", "people", "goals")
+
+class DataVersionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: uuid.UUID | str, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Versão dos dados do usuário em cada tabela, numa busca pela chave primária de data_versions.
+
+        Toda inserção, atualização ou exclusão incrementa a versão na mesma
+        transação; tabela ainda sem escritas do usuário tem versão 0.
+        """
+        tables = tuple(tables)
+        unknown = set(tables) - set(VERSIONED_TABLES)
+        if unknown:
+            raise ValueError(f"Tabela sem versão: {', '.join(sorted(unknown))}")
+        versions = dict(self.db.execute(
+            select(DataVersionModel.table_name, DataVersionModel.version)
+            .where(DataVersionModel.user_id == user_id, DataVersionModel.table_name.in_(tables))
+        ).all())
+        return tuple(versions.get(name, 0) for name in tables)
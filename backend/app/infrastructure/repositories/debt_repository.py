@@ -2,27 +2,52 @@ import uuid
 from datetime import date
 from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import extract
+from sqlalchemy import insert, select, update, delete, func, case, literal
+from typing import Iterator, Dict, Any, Optional
 from dateutil.relativedelta import relativedelta
 from ..models.debt import DebtsModel
-from ...domain.dto.debt import DebtDTO, DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO
+from ..models.debt_payment import DebtPaymentModel
+from ..models.people import PeopleModel
+from ..period import Period
+from ..summary_cache import summary_cache, month_scopes, DEBTS
+from ..audit_log import audit_log, audit_entry
+from ..versioning import versioned_update, split_row, StaleWriteError, OLD_PREFIX
+from ...domain.dto.debt import (
+    DebtDTO, DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO, DebtPersonSummaryDTO,
+    DebtPaymentCreateDTO, DebtPaymentEntryDTO, DebtSettlementDTO, DebtSelectionDTO, DebtBulkChangesDTO,
+)
+
+EXPORT_COLUMNS = (
+    "id", "date", "due_date", "description", "person_id", "person_name", "amount", "paid_amount",
+    "status", "installments", "total_installments", "payment_method_id", "created_at",
+)
+
+# Prefixo das colunas da pessoa no SELECT do update (debts já tem person_id)
+PERSON_PREFIX = "person__"
+
+OVERPAYMENT_ERROR = "O valor pago não pode ser negativo nem maior que o valor da dívida"
+
+def _status_for(paid_amount, amount=DebtsModel.amount):
+    """Status correspondente a um valor pago, como expressão SQL (avaliada no próprio UPDATE)"""
+    return case(
+        (paid_amount >= amount, "paid"),
+        (paid_amount > 0, "partial"),
+        else_="pending",
+    )
 
 class DebtRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_all_by_user(self, user_id: uuid.UUID, month: date = None, person_id: uuid.UUID = None, status: str = None) -> list[DebtDTO]:
+    def get_all_by_user(self, user_id: uuid.UUID, period: Period = None, person_id: uuid.UUID = None, status: str = None) -> list[DebtDTO]:
         """Busca todas as dívidas de um usuário com filtros opcionais"""
         query = self.db.query(DebtsModel).options(
             joinedload(DebtsModel.person)
         ).filter(DebtsModel.user_id == user_id)
         
-        # Filtro por mês
-        if month:
-            query = query.filter(
-                extract('year', DebtsModel.date) == month.year,
-                extract('month', DebtsModel.date) == month.month
-            )
+        # Filtro por período
+        if period:
+            query = query.filter(period.filter(DebtsModel.date))
         
         # Filtro por pessoa
         if person_id:
@@ -35,6 +60,50 @@ class DebtRepository:
         debts = query.all()
         return [DebtDTO.model_validate(debt) for debt in debts]
     
+    def stream(self, user_id: uuid.UUID, period: Period = None, person_id: uuid.UUID = None, status: str = None,
+               batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Itera as dívidas do usuário (com o nome da pessoa) por um cursor no servidor (yield_per)"""
+        columns = [getattr(DebtsModel, column) for column in EXPORT_COLUMNS if column != "person_name"]
+        stmt = select(*columns, PeopleModel.name.label("person_name")).join(
+            PeopleModel, PeopleModel.id == DebtsModel.person_id
+        ).where(DebtsModel.user_id == user_id)
+        if period:
+            stmt = stmt.where(period.filter(DebtsModel.date))
+        if person_id:
+            stmt = stmt.where(DebtsModel.person_id == person_id)
+        if status:
+            stmt = stmt.where(DebtsModel.status == status)
+        stmt = stmt.order_by(DebtsModel.date.desc(), DebtsModel.id.desc())
+
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        for row in result.mappings():
+            yield row
+
+    def summary_by_person(self, user_id: uuid.UUID, period: Period = None) -> list[DebtPersonSummaryDTO]:
+        """Totais, valor pago, pendente e quantidade de parcelas por pessoa em uma única consulta.
+
+        A soma é feita no banco sobre NUMERIC, então os valores chegam como Decimal
+        exatos e o custo da resposta depende do número de pessoas, não de dívidas.
+        """
+        paid = func.coalesce(DebtsModel.paid_amount, 0)
+        stmt = select(
+            PeopleModel.id.label("person_id"),
+            PeopleModel.name.label("person_name"),
+            func.sum(DebtsModel.amount).label("total"),
+            func.sum(paid).label("paid"),
+            func.sum(DebtsModel.amount - paid).label("pending"),
+            func.count().label("debts_count"),
+            func.count().filter(DebtsModel.total_installments > 1).label("installments_count"),
+        ).join(
+            PeopleModel, PeopleModel.id == DebtsModel.person_id
+        ).where(DebtsModel.user_id == user_id)
+        if period:
+            stmt = stmt.where(period.filter(DebtsModel.date))
+        stmt = stmt.group_by(PeopleModel.id, PeopleModel.name).order_by(PeopleModel.name, PeopleModel.id)
+
+        rows = self.db.execute(stmt).mappings()
+        return [DebtPersonSummaryDTO.model_validate(row) for row in rows]
+
     def get_by_id(self, debt_id: uuid.UUID, user_id: uuid.UUID) -> DebtDTO | None:
         """Busca uma dívida por ID e usuário"""
         debt = self.db.query(DebtsModel).options(
@@ -51,125 +120,259 @@ class DebtRepository:
     
     def create(self, user_id: uuid.UUID, debt_data: DebtCreateDTO) -> DebtDTO:
         """Cria uma nova dívida"""
+        base = {
+            "user_id": user_id,
+            "person_id": uuid.UUID(debt_data.person_id),
+            "description": debt_data.description,
+            "payment_method_id": debt_data.payment_method_id,
+        }
         # Se for parcelada, criar múltiplas dívidas
         if debt_data.total_installments and debt_data.total_installments > 1:
             parcela_valor = round(debt_data.amount / debt_data.total_installments, 2)
-            debts = []
+            # Identifica o plano para edição/cancelamento em lote
+            base["installment_group_id"] = uuid.uuid4()
+            rows = []
             for i in range(debt_data.total_installments):
                 debt_date = debt_data.date + relativedelta(months=i)
                 due_date = debt_data.due_date + relativedelta(months=i) if debt_data.due_date else debt_date
-                debt = DebtsModel(
-                    user_id=user_id,
-                    person_id=uuid.UUID(debt_data.person_id),
-                    description=debt_data.description,
-                    amount=parcela_valor,
-                    date=debt_date,
-                    due_date=due_date,
-                    installments=i+1,
-                    total_installments=debt_data.total_installments,
-                    payment_method_id=debt_data.payment_method_id
-                )
-                self.db.add(debt)
-                self.db.flush()  # Garante geração de ID
-                debts.append(debt)
-            self.db.commit()
-            self.db.refresh(debts[0])
-            
-            # Recarrega com a pessoa
-            debt = self.db.query(DebtsModel).options(
-                joinedload(DebtsModel.person)
-            ).filter(DebtsModel.id == debts[0].id).first()
-            
-            return DebtDTO.model_validate(debt)
+                rows.append({
+                    **base,
+                    "amount": parcela_valor,
+                    "date": debt_date,
+                    "due_date": due_date,
+                    "installments": i+1,
+                    "total_installments": debt_data.total_installments,
+                })
         else:
             # Dívida única
-            debt = DebtsModel(
-                user_id=user_id,
-                person_id=uuid.UUID(debt_data.person_id),
-                description=debt_data.description,
-                amount=Decimal(str(debt_data.amount)),
-                date=debt_data.date,
-                due_date=debt_data.due_date,
-                installments=debt_data.installments,
-                total_installments=debt_data.total_installments,
-                payment_method_id=debt_data.payment_method_id
-            )
-            
-            self.db.add(debt)
-            self.db.commit()
-            self.db.refresh(debt)
-            
-            # Recarrega com a pessoa
-            debt = self.db.query(DebtsModel).options(
-                joinedload(DebtsModel.person)
-            ).filter(DebtsModel.id == debt.id).first()
-            
-            return DebtDTO.model_validate(debt)
-    
+            rows = [{
+                **base,
+                "amount": Decimal(str(debt_data.amount)),
+                "date": debt_data.date,
+                "due_date": debt_data.due_date,
+                "installments": debt_data.installments,
+                "total_installments": debt_data.total_installments,
+            }]
+
+        # Um único INSERT ... VALUES (...), (...) RETURNING para todas as parcelas
+        stmt = insert(DebtsModel).returning(DebtsModel, sort_by_parameter_order=True)
+        debts = self.db.scalars(stmt, rows).all()
+        result = DebtDTO.model_validate(debts[0])
+        entries = [audit_entry("create", user_id, new=debt) for debt in debts]
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes(row["date"] for row in rows))
+        self.db.commit()
+        audit_log.record(entries)
+        return result
+
     def update(self, debt_id: uuid.UUID, user_id: uuid.UUID, debt_data: DebtUpdateDTO) -> DebtDTO | None:
-        """Atualiza uma dívida"""
-        debt = self.db.query(DebtsModel).filter(
-            DebtsModel.id == debt_id,
-            DebtsModel.user_id == user_id
-        ).first()
-        
-        if not debt:
-            return None
-        
-        # Atualiza apenas os campos fornecidos e existentes no modelo
+        """Atualiza uma dívida em um único comando, sem SELECT prévio nem recarga.
+
+        WITH updated AS (UPDATE ... RETURNING valores novos e anteriores),
+        payments AS (INSERT no histórico da diferença de paid_amount, se houver)
+        SELECT updated JOIN people. Com debt_data.version, só atualiza se a
+        versão ainda for a mesma; caso contrário lança StaleWriteError. Com
+        valor ou valor pago, o status é recalculado no mesmo UPDATE e lança
+        ValueError se o valor pago ficar fora de [0, amount].
+        """
         update_data = debt_data.model_dump(exclude_unset=True)
+        version = update_data.pop("version", None)
+        columns = DebtsModel.__table__.c
+        values = {}
         for field, value in update_data.items():
-            if not hasattr(debt, field):
+            if field not in columns or field in ("id", "user_id"):
                 continue  # Ignora campos extras
-            if field == 'amount' and value is not None:
-                setattr(debt, field, Decimal(str(value)))
-            elif field == 'person_id' and value is not None:
-                setattr(debt, field, uuid.UUID(value))
-            elif field in ['installments', 'total_installments'] and value is not None:
-                setattr(debt, field, value)
-            else:
-                setattr(debt, field, value)
-        
+            if field in ("amount", "paid_amount") and value is not None:
+                value = Decimal(str(value))
+            elif field == "person_id" and value is not None:
+                value = uuid.UUID(value)
+            values[field] = value
+        if values.get("paid_amount", 0) is None:
+            del values["paid_amount"]
+        conditions = (DebtsModel.id == debt_id, DebtsModel.user_id == user_id)
+        checked = conditions
+        if "amount" in values or "paid_amount" in values:
+            amount = literal(values["amount"]) if "amount" in values else DebtsModel.amount
+            paid = literal(values["paid_amount"]) if "paid_amount" in values else func.coalesce(DebtsModel.paid_amount, 0)
+            values["status"] = _status_for(paid, amount)
+            checked = (*conditions, paid >= 0, paid <= amount)
+
+        updated = versioned_update(DebtsModel, checked, values, version).cte("updated")
+        delta = func.coalesce(updated.c.paid_amount, 0) - func.coalesce(updated.c[OLD_PREFIX + "paid_amount"], 0)
+        payments = insert(DebtPaymentModel).from_select(
+            ["debt_id", "user_id", "amount", "paid_at", "note"],
+            select(updated.c.id, updated.c.user_id, delta, func.current_date(), literal("Ajuste do valor pago"))
+            .where(delta != 0)
+        ).cte("payments")
+        person_columns = [column.label(PERSON_PREFIX + column.name) for column in PeopleModel.__table__.c]
+        row = self.db.execute(
+            select(updated, *person_columns)
+            .join(PeopleModel, PeopleModel.id == updated.c.person_id)
+            .add_cte(payments)
+        ).first()
+        if row is None:
+            self._check_failed_update(conditions, version)
+            return None
+
+        new_values, old_values = split_row(row)
+        person = {key[len(PERSON_PREFIX):]: new_values.pop(key) for key in list(new_values) if key.startswith(PERSON_PREFIX)}
+        entry = audit_entry("update", user_id, old=old_values, new=new_values,
+                            table_name=DebtsModel.__tablename__, record_id=debt_id)
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes([old_values["date"], new_values["date"]]))
         self.db.commit()
-        self.db.refresh(debt)
-        
-        # Recarrega com a pessoa
-        debt = self.db.query(DebtsModel).options(
-            joinedload(DebtsModel.person)
-        ).filter(DebtsModel.id == debt.id).first()
-        
-        return DebtDTO.model_validate(debt)
+        audit_log.record([entry])
+        return DebtDTO.model_validate({**new_values, "person": person})
     
-    def update_payment(self, debt_id: uuid.UUID, user_id: uuid.UUID, payment_data: DebtPaymentDTO) -> DebtDTO | None:
-        """Atualiza o pagamento de uma dívida"""
-        debt = self.db.query(DebtsModel).filter(
-            DebtsModel.id == debt_id,
-            DebtsModel.user_id == user_id
+    def add_payment(self, debt_id: uuid.UUID, user_id: uuid.UUID, payment_data: DebtPaymentCreateDTO) -> DebtDTO | None:
+        """Lança um pagamento no histórico e soma ao saldo da dívida na mesma transação.
+
+        O saldo é incrementado no próprio banco (paid_amount = paid_amount + x,
+        com o status recalculado no mesmo UPDATE), então pagamentos simultâneos
+        não se sobrescrevem. Lança ValueError se o pagamento deixar o valor pago
+        fora de [0, amount].
+        """
+        amount = Decimal(str(payment_data.amount))
+        paid_amount = func.coalesce(DebtsModel.paid_amount, 0) + amount
+        row = self.db.execute(
+            update(DebtsModel)
+            .where(DebtsModel.id == debt_id, DebtsModel.user_id == user_id,
+                   paid_amount >= 0, paid_amount <= DebtsModel.amount)
+            .values(paid_amount=paid_amount, status=_status_for(paid_amount), version=DebtsModel.version + 1)
+            .returning(DebtsModel.date, DebtsModel.paid_amount, DebtsModel.status)
         ).first()
-        
-        if not debt:
+        if row is None:
+            exists = self.db.execute(
+                select(DebtsModel.id).where(DebtsModel.id == debt_id, DebtsModel.user_id == user_id)
+            ).first()
+            if exists:
+                raise ValueError(OVERPAYMENT_ERROR)
             return None
-        
-        # Atualiza o valor pago
-        debt.paid_amount = Decimal(str(payment_data.paid_amount))
-        
-        # Atualiza o status baseado no valor pago
-        if debt.paid_amount >= debt.amount:
-            debt.status = "paid"
-        elif debt.paid_amount > 0:
-            debt.status = "partial"
-        else:
-            debt.status = "pending"
-        
+
+        self._append_payment(debt_id, user_id, amount, payment_data.paid_at, payment_data.note)
+        entry = audit_entry(
+            "payment", user_id, table_name="debts", record_id=debt_id,
+            new={"amount": amount, "paid_amount": row.paid_amount, "status": row.status},
+        )
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes([row.date]))
         self.db.commit()
-        self.db.refresh(debt)
-        
-        # Recarrega com a pessoa
-        debt = self.db.query(DebtsModel).options(
-            joinedload(DebtsModel.person)
-        ).filter(DebtsModel.id == debt.id).first()
-        
-        return DebtDTO.model_validate(debt)
+        audit_log.record([entry])
+        return self.get_by_id(debt_id, user_id)
+
+    def update_payment(self, debt_id: uuid.UUID, user_id: uuid.UUID, payment_data: DebtPaymentDTO) -> DebtDTO | None:
+        """Define o valor pago total de uma dívida; a diferença é lançada no histórico.
+
+        Sobrescreve o saldo, então só vale para a versão que o cliente leu:
+        lança StaleWriteError se a dívida mudou (outro pagamento no meio
+        tempo, por exemplo) e ValueError se o valor ficar fora de [0, amount].
+        """
+        target = Decimal(str(payment_data.paid_amount))
+        if target < 0:
+            raise ValueError(OVERPAYMENT_ERROR)
+        conditions = (DebtsModel.id == debt_id, DebtsModel.user_id == user_id)
+        # O UPDATE devolve também o valor anterior (linha travada), para o lançamento da diferença
+        row = self.db.execute(versioned_update(
+            DebtsModel, (*conditions, DebtsModel.amount >= target),
+            {"paid_amount": target, "status": _status_for(literal(target))}, payment_data.version
+        )).first()
+        if row is None:
+            self._check_failed_update(conditions, payment_data.version)
+            return None
+
+        new_values, old_values = split_row(row)
+        delta = target - (old_values["paid_amount"] or 0)
+        if delta:
+            self._append_payment(debt_id, user_id, delta, note="Ajuste do valor pago")
+        entry = audit_entry(
+            "payment", user_id, table_name="debts", record_id=debt_id,
+            old={"paid_amount": old_values["paid_amount"], "status": old_values["status"]},
+            new={"paid_amount": new_values["paid_amount"], "status": new_values["status"]},
+        )
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes([new_values["date"]]))
+        self.db.commit()
+        audit_log.record([entry])
+        return self.get_by_id(debt_id, user_id)
+
+    def _check_failed_update(self, conditions, version: Optional[int]) -> None:
+        """Depois de um UPDATE sem linhas que também exige o valor pago em [0, amount].
+
+        Só roda no caminho de falha: lança StaleWriteError se a versão mudou,
+        ValueError se a dívida existe mas o valor pago ficaria fora dos limites,
+        e retorna se a dívida não existe (quem chama responde 404).
+        """
+        current = self.db.execute(select(DebtsModel.version).where(*conditions)).scalar()
+        if current is None:
+            return
+        if version is not None and current != version:
+            raise StaleWriteError(current)
+        raise ValueError(OVERPAYMENT_ERROR)
+
+    def settle_person(self, person_id: uuid.UUID, user_id: uuid.UUID, paid_at: Optional[date] = None,
+                      note: Optional[str] = None) -> DebtSettlementDTO:
+        """Quita todas as dívidas em aberto de uma pessoa em um único comando.
+
+        Um UPDATE ... RETURNING (em CTE) zera o saldo de cada dívida e devolve o
+        valor que faltava, que um INSERT ... SELECT lança no histórico; as linhas
+        são travadas com FOR UPDATE para que o valor lançado seja exatamente o
+        que faltava no momento da quitação.
+        """
+        old = select(DebtsModel.id, DebtsModel.paid_amount).where(
+            DebtsModel.user_id == user_id,
+            DebtsModel.person_id == person_id,
+            func.coalesce(DebtsModel.paid_amount, 0) < DebtsModel.amount,
+        ).with_for_update().subquery("old")
+        settled = (
+            update(DebtsModel)
+            .where(DebtsModel.id == old.c.id)
+            .values(paid_amount=DebtsModel.amount, status="paid", version=DebtsModel.version + 1)
+            .returning(
+                DebtsModel.id, DebtsModel.user_id, DebtsModel.date,
+                (DebtsModel.amount - func.coalesce(old.c.paid_amount, 0)).label("amount"),
+            )
+            .cte("settled")
+        )
+        payments = (
+            insert(DebtPaymentModel)
+            .from_select(
+                ["debt_id", "user_id", "amount", "paid_at", "note"],
+                select(settled.c.id, settled.c.user_id, settled.c.amount,
+                       literal(paid_at or date.today()), literal(note or "Quitação"))
+            )
+            .returning(DebtPaymentModel.debt_id)
+            .cte("payments")
+        )
+        rows = self.db.execute(
+            select(settled.c.id, settled.c.date, settled.c.amount)
+            .join(payments, payments.c.debt_id == settled.c.id)
+        ).all()
+
+        entries = [
+            audit_entry("payment", user_id, table_name="debts", record_id=row.id,
+                        new={"amount": row.amount, "status": "paid"})
+            for row in rows
+        ]
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes(row.date for row in rows))
+        self.db.commit()
+        audit_log.record(entries)
+        return DebtSettlementDTO(
+            person_id=str(person_id),
+            settled_count=len(rows),
+            total_paid=sum((row.amount for row in rows), Decimal(0)),
+        )
+
+    def list_payments(self, debt_id: uuid.UUID, user_id: uuid.UUID) -> list[DebtPaymentEntryDTO]:
+        """Histórico de pagamentos de uma dívida, do mais antigo ao mais recente"""
+        payments = self.db.scalars(
+            select(DebtPaymentModel)
+            .where(DebtPaymentModel.debt_id == debt_id, DebtPaymentModel.user_id == user_id)
+            .order_by(DebtPaymentModel.created_at, DebtPaymentModel.id)
+        ).all()
+        return [DebtPaymentEntryDTO.model_validate(payment) for payment in payments]
+
+    def _append_payment(self, debt_id: uuid.UUID, user_id: uuid.UUID, amount: Decimal,
+                        paid_at: Optional[date] = None, note: Optional[str] = None) -> None:
+        """Lançamento no histórico, na transação corrente (o commit fica com quem chama)"""
+        self.db.execute(insert(DebtPaymentModel).values(
+            debt_id=debt_id, user_id=user_id, amount=amount, paid_at=paid_at or date.today(), note=note,
+        ))
     
     def delete(self, debt_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         """Deleta uma dívida"""
@@ -181,7 +384,83 @@ class DebtRepository:
         if not debt:
             return False
         
+        scopes = month_scopes([debt.date])
+        entry = audit_entry("delete", user_id, old=debt)
         self.db.delete(debt)
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, scopes)
         self.db.commit()
+        audit_log.record([entry])
         
-        return True 
\ No newline at end of file
+        return True
+
+    def _selection(self, user_id: uuid.UUID, selection: DebtSelectionDTO) -> list:
+        """Condições da seleção de uma operação em lote, sempre restritas ao usuário"""
+        conditions = [DebtsModel.user_id == user_id]
+        if selection.ids:
+            conditions.append(DebtsModel.id.in_([uuid.UUID(value) for value in selection.ids]))
+        if selection.installment_group_id:
+            conditions.append(DebtsModel.installment_group_id == uuid.UUID(selection.installment_group_id))
+        if selection.period:
+            conditions.append(Period.parse(selection.period).filter(DebtsModel.date))
+        if selection.person_id:
+            conditions.append(DebtsModel.person_id == uuid.UUID(selection.person_id))
+        if selection.status:
+            conditions.append(DebtsModel.status == selection.status)
+        return conditions
+
+    def bulk_update(self, user_id: uuid.UUID, selection: DebtSelectionDTO, changes: DebtBulkChangesDTO) -> int:
+        """Altera todas as dívidas selecionadas em um único UPDATE ... RETURNING e faz commit.
+
+        Com um novo valor, o status é recalculado no mesmo UPDATE a partir do
+        valor pago. Retorna o número de dívidas alteradas. Lança ValueError se
+        o período for inválido ou se o novo valor ficar abaixo do já pago em
+        alguma das dívidas selecionadas (nenhuma é alterada).
+        """
+        values = changes.model_dump(exclude_none=True)
+        conditions = self._selection(user_id, selection)
+        if "amount" in values:
+            values["amount"] = Decimal(str(values["amount"]))
+            paid = func.coalesce(DebtsModel.paid_amount, 0)
+            values["status"] = _status_for(paid, literal(values["amount"]))
+            overpaid = self.db.execute(
+                select(DebtsModel.id).where(*conditions, paid > values["amount"]).limit(1)
+            ).first()
+            if overpaid:
+                raise ValueError(OVERPAYMENT_ERROR)
+            # A mesma condição no UPDATE cobre um pagamento entre a verificação e a escrita
+            conditions.append(paid <= values["amount"])
+        if "person_id" in values:
+            values["person_id"] = uuid.UUID(values["person_id"])
+        stmt = versioned_update(DebtsModel, conditions, values)
+        rows = [split_row(row) for row in self.db.execute(stmt)]
+        if not rows:
+            return 0
+
+        entries = [
+            audit_entry("update", user_id, old=old_values, new=new_values,
+                        table_name=DebtsModel.__tablename__, record_id=new_values["id"])
+            for new_values, old_values in rows
+        ]
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes(new_values["date"] for new_values, _ in rows))
+        self.db.commit()
+        audit_log.record(entries)
+        return len(rows)
+
+    def bulk_delete(self, user_id: uuid.UUID, selection: DebtSelectionDTO) -> int:
+        """Remove todas as dívidas selecionadas (e seus históricos de pagamento, em cascata)
+        em um único DELETE ... RETURNING e faz commit. Retorna o número de dívidas removidas."""
+        stmt = delete(DebtsModel).where(*self._selection(user_id, selection)).returning(
+            *DebtsModel.__table__.c
+        ).execution_options(synchronize_session=False)
+        rows = [dict(row._mapping) for row in self.db.execute(stmt)]
+        if not rows:
+            return 0
+
+        entries = [
+            audit_entry("delete", user_id, old=row, table_name=DebtsModel.__tablename__, record_id=row["id"])
+            for row in rows
+        ]
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, month_scopes(row["date"] for row in rows))
+        self.db.commit()
+        audit_log.record(entries)
+        return len(rows)
@@ -1,4 +1,5 @@
 from app.infrastructure.models import GoalModel
+from app.infrastructure.audit_log import audit_log, audit_entry, snapshot
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
@@ -16,24 +17,31 @@ class GoalRepository:
     def create(self, user_id: str, data: dict) -> GoalModel:
         goal = GoalModel(id=str(uuid.uuid4()), user_id=user_id, **data)
         self.db.add(goal)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(goal)
+        self.db.commit()
+        audit_log.record([audit_entry("create", user_id, new=goal)])
         return goal
 
     def update(self, user_id: str, goal_id: str, data: dict) -> Optional[GoalModel]:
         goal = self.get(user_id, goal_id)
         if not goal:
             return None
+        old_values = snapshot(goal)
         for k, v in data.items():
             setattr(goal, k, v)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(goal)
+        self.db.commit()
+        audit_log.record([audit_entry("update", user_id, old=old_values, new=goal)])
         return goal
 
     def delete(self, user_id: str, goal_id: str) -> bool:
         goal = self.get(user_id, goal_id)
         if not goal:
             return False
+        entry = audit_entry("delete", user_id, old=goal)
         self.db.delete(goal)
         self.db.commit()
+        audit_log.record([entry])
         return True 
\ No newline at end of file
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, List, Optional, Dict, Tuple, Any
+from sqlalchemy import func, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from ..models.monthly_total import MonthlyTotalModel
+from ..models.transaction import TransactionModel
+
+RollupKey = Tuple[str, str, str, str, bool]
+
+def rollup_key(transaction) -> RollupKey:
+    """Chave do rollup (user_id, year_month, type, category, is_recurring) de uma transação"""
+    return (
+        str(transaction.user_id),
+        transaction.date.strftime("%Y-%m"),
+        transaction.type,
+        transaction.category,
+        bool(transaction.is_recurring),
+    )
+
+def _amount(transaction) -> Decimal:
+    # Mesmo arredondamento da coluna NUMERIC(10,2)
+    return Decimal(str(transaction.amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+class MonthlyTotalsRepository:
+    """Mantém a tabela monthly_totals, um rollup mensal por tipo/categoria/recorrência.
+
+    As alterações são aplicadas na mesma sessão (e transação) da escrita em
+    transactions; quem chama é responsável pelo commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, added: Iterable = (), removed: Iterable = ()) -> None:
+        """Soma as transações adicionadas e subtrai as removidas do rollup"""
+        deltas: Dict[RollupKey, List] = defaultdict(lambda: [Decimal(0), 0])
+        for transaction in added:
+            delta = deltas[rollup_key(transaction)]
+            delta[0] += _amount(transaction)
+            delta[1] += 1
+        for transaction in removed:
+            delta = deltas[rollup_key(transaction)]
+            delta[0] -= _amount(transaction)
+            delta[1] -= 1
+
+        rows = [
+            {
+                "user_id": key[0],
+                "year_month": key[1],
+                "type": key[2],
+                "category": key[3],
+                "is_recurring": key[4],
+                "total_amount": amount,
+                "transactions_count": count,
+            }
+            for key, (amount, count) in deltas.items()
+            if amount != 0 or count != 0
+        ]
+        if not rows:
+            return
+
+        stmt = insert(MonthlyTotalModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "year_month", "type", "category", "is_recurring"],
+            set_={
+                "total_amount": MonthlyTotalModel.total_amount + stmt.excluded.total_amount,
+                "transactions_count": MonthlyTotalModel.transactions_count + stmt.excluded.transactions_count,
+            },
+        )
+        self.db.execute(stmt)
+
+        if any(row["transactions_count"] < 0 for row in rows):
+            user_ids = {row["user_id"] for row in rows}
+            self.db.query(MonthlyTotalModel).filter(
+                MonthlyTotalModel.user_id.in_(user_ids),
+                MonthlyTotalModel.transactions_count <= 0
+            ).delete(synchronize_session=False)
+
+    def get_months(self, user_id: str, first_month: str, end_month: str) -> List[MonthlyTotalModel]:
+        """Retorna as linhas do rollup de um usuário para os meses em [first_month, end_month) (YYYY-MM)"""
+        return self.db.query(MonthlyTotalModel).filter(
+            MonthlyTotalModel.user_id == user_id,
+            MonthlyTotalModel.year_month >= first_month,
+            MonthlyTotalModel.year_month < end_month
+        ).all()
+
+    def _live_totals(self, user_id: Optional[str] = None):
+        """Agregação equivalente ao rollup calculada diretamente sobre transactions"""
+        year_month = func.to_char(TransactionModel.date, "YYYY-MM")
+        is_recurring = func.coalesce(TransactionModel.is_recurring, False)
+        query = self.db.query(
+            TransactionModel.user_id.label("user_id"),
+            year_month.label("year_month"),
+            TransactionModel.type.label("type"),
+            TransactionModel.category.label("category"),
+            is_recurring.label("is_recurring"),
+            func.sum(TransactionModel.amount).label("total_amount"),
+            func.count().label("transactions_count"),
+        )
+        if user_id:
+            query = query.filter(TransactionModel.user_id == user_id)
+        return query.group_by(
+            TransactionModel.user_id, year_month, TransactionModel.type, TransactionModel.category, is_recurring
+        )
+
+    def rebuild(self, user_id: Optional[str] = None) -> int:
+        """Recalcula o rollup do zero (para um usuário ou para todos). Não faz commit."""
+        delete_query = self.db.query(MonthlyTotalModel)
+        if user_id:
+            delete_query = delete_query.filter(MonthlyTotalModel.user_id == user_id)
+        delete_query.delete(synchronize_session=False)
+
+        live = self._live_totals(user_id).subquery()
+        stmt = insert(MonthlyTotalModel).from_select(
+            ["user_id", "year_month", "type", "category", "is_recurring", "total_amount", "transactions_count"],
+            self.db.query(live).statement,
+        )
+        return self.db.execute(stmt).rowcount
+
+    def check(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Compara o rollup com os dados atuais e retorna as divergências encontradas"""
+        live = self._live_totals(user_id).subquery()
+        rollup_query = self.db.query(MonthlyTotalModel)
+        if user_id:
+            rollup_query = rollup_query.filter(MonthlyTotalModel.user_id == user_id)
+        rollup = rollup_query.subquery()
+
+        on = and_(
+            live.c.user_id == rollup.c.user_id,
+            live.c.year_month == rollup.c.year_month,
+            live.c.type == rollup.c.type,
+            live.c.category == rollup.c.category,
+            live.c.is_recurring == rollup.c.is_recurring,
+        )
+        rows = self.db.query(
+            func.coalesce(live.c.user_id, rollup.c.user_id).label("user_id"),
+            func.coalesce(live.c.year_month, rollup.c.year_month).label("year_month"),
+            func.coalesce(live.c.type, rollup.c.type).label("type"),
+            func.coalesce(live.c.category, rollup.c.category).label("category"),
+            func.coalesce(live.c.is_recurring, rollup.c.is_recurring).label("is_recurring"),
+            func.coalesce(live.c.total_amount, 0).label("expected_amount"),
+            func.coalesce(rollup.c.total_amount, 0).label("actual_amount"),
+            func.coalesce(live.c.transactions_count, 0).label("expected_count"),
+            func.coalesce(rollup.c.transactions_count, 0).label("actual_count"),
+        ).select_from(live).outerjoin(rollup, on, full=True).filter(
+            (func.coalesce(live.c.total_amount, 0) != func.coalesce(rollup.c.total_amount, 0)) |
+            (func.coalesce(live.c.transactions_count, 0) != func.coalesce(rollup.c.transactions_count, 0))
+        ).all()
+        return [dict(row._mapping) for row in rows]
@@ -1,25 +1,37 @@
+from typing import Dict
 from sqlalchemy.orm import Session
 from app.infrastructure.models.payment_method import PaymentMethodModel
+from app.infrastructure.reference_cache import reference_cache, PAYMENT_METHODS
+from app.domain.dto.payment_method import PaymentMethodDTO
 from uuid import UUID
 
 class PaymentMethodRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _by_id(self) -> Dict[str, PaymentMethodDTO]:
+        # Formas de pagamento por ID, lidas do cache de referência
+        return reference_cache.get(PAYMENT_METHODS, lambda: {
+            str(pm.id): PaymentMethodDTO.model_validate(pm, from_attributes=True)
+            for pm in self.db.query(PaymentMethodModel).all()
+        })
+
     def get_all(self):
-        return self.db.query(PaymentMethodModel).all()
+        return list(self._by_id().values())
 
     def get_by_id(self, payment_method_id: UUID):
         return self.db.query(PaymentMethodModel).filter(PaymentMethodModel.id == payment_method_id).first()
 
     def get_by_name(self, name: str):
-        return self.db.query(PaymentMethodModel).filter(PaymentMethodModel.name == name).first()
+        return next((pm for pm in self._by_id().values() if pm.name == name), None)
 
     def create(self, name: str, description: str = None):
         payment_method = PaymentMethodModel(name=name, description=description)
         self.db.add(payment_method)
-        self.db.commit()
+        reference_cache.invalidate_on_commit(self.db, PAYMENT_METHODS)
+        self.db.flush()
         self.db.refresh(payment_method)
+        self.db.commit()
         return payment_method
 
     def update(self, payment_method_id: UUID, name: str = None, description: str = None):
@@ -30,8 +42,10 @@ class PaymentMethodRepository:
             payment_method.name = name
         if description is not None:
             payment_method.description = description
-        self.db.commit()
+        reference_cache.invalidate_on_commit(self.db, PAYMENT_METHODS)
+        self.db.flush()
         self.db.refresh(payment_method)
+        self.db.commit()
         return payment_method
 
     def delete(self, payment_method_id: UUID):
@@ -39,5 +53,6 @@ class PaymentMethodRepository:
         if not payment_method:
             return False
         self.db.delete(payment_method)
+        reference_cache.invalidate_on_commit(self.db, PAYMENT_METHODS)
         self.db.commit()
-        return True 
\ No newline at end of file
+        return True 
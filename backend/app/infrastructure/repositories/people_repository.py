@@ -2,6 +2,8 @@ import uuid
 from sqlalchemy.orm import Session
 from sqlalchemy import extract
 from ..models.people import PeopleModel
+from ..summary_cache import summary_cache, DEBTS, ALL_MONTHS
+from ..audit_log import audit_log, audit_entry, snapshot
 from ...domain.dto.people import PeopleDTO, PeopleCreateDTO, PeopleUpdateDTO
 
 class PeopleRepository:
@@ -40,8 +42,10 @@ class PeopleRepository:
         )
         
         self.db.add(person)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(person)
+        self.db.commit()
+        audit_log.record([audit_entry("create", user_id, new=person)])
         
         return PeopleDTO.model_validate(person)
     
@@ -55,13 +59,19 @@ class PeopleRepository:
         if not person:
             return None
         
+        old_values = snapshot(person)
+        
         # Atualiza apenas os campos fornecidos
         update_data = person_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(person, field, value)
         
-        self.db.commit()
+        # O resumo de dívidas agrupa pelo nome da pessoa, em todos os meses
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, [ALL_MONTHS])
+        self.db.flush()
         self.db.refresh(person)
+        self.db.commit()
+        audit_log.record([audit_entry("update", user_id, old=old_values, new=person)])
         
         return PeopleDTO.model_validate(person)
     
@@ -75,7 +85,10 @@ class PeopleRepository:
         if not person:
             return False
         
+        entry = audit_entry("delete", user_id, old=person)
         self.db.delete(person)
+        summary_cache.invalidate_on_commit(self.db, user_id, DEBTS, [ALL_MONTHS])
         self.db.commit()
+        audit_log.record([entry])
         
         return True 
\ No newline at end of file
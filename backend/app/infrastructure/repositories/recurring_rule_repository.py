@@ -0,0 +1,186 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, or_, cast
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Date
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date
+from heapq import merge
+from ..models.recurring_rule import RecurringRuleModel
+from ..models.transaction import TransactionModel
+from ..period import Period
+from ..recurrence import occurrences_desc, count_occurrences, occurrence_id, is_occurrence
+from ..summary_cache import summary_cache, FINANCE, ALL_MONTHS
+from ..audit_log import audit_log, audit_entry, snapshot
+from ...domain.dto.transaction import TransactionDTO, RecurringRuleDTO
+
+# Campos da regra copiados para cada ocorrência
+OCCURRENCE_FIELDS = ("description", "amount", "type", "category", "payment_method_id")
+
+def rule_occurrences(rule, period: Period, skip: Collection[date] = ()) -> Iterator[Tuple[date, Any]]:
+    """Gerador de (data, regra) no período, da mais recente para a mais antiga, sem as excluídas nem as de skip"""
+    excluded = set(rule.excluded_dates or ()) | set(skip)
+    for occurrence_date in occurrences_desc(rule.frequency, rule.interval, rule.start_date, period,
+                                            rule.end_date, rule.count, excluded):
+        yield occurrence_date, rule
+
+def count_rule_occurrences(rule, period: Period, skip: Collection[date] = ()) -> int:
+    excluded = set(rule.excluded_dates or ()) | set(skip)
+    return count_occurrences(rule.frequency, rule.interval, rule.start_date, period,
+                             rule.end_date, rule.count, excluded)
+
+class RecurringRuleRepository:
+    """Regras de recorrência e a projeção das suas ocorrências.
+
+    Uma regra é gravada uma única vez; as ocorrências são geradas sob demanda
+    para o período consultado. As que já têm linha em transactions (materializadas
+    por uma alteração) ou que foram excluídas não são projetadas. Escritas em
+    regras mudam todos os meses a partir do início, então invalidam ALL_MONTHS
+    no cache de resumos.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list(self, user_id: str) -> List[RecurringRuleDTO]:
+        rules = self.db.query(RecurringRuleModel).filter(
+            RecurringRuleModel.user_id == user_id
+        ).order_by(RecurringRuleModel.start_date.desc()).all()
+        return [RecurringRuleDTO.model_validate(rule) for rule in rules]
+
+    def get(self, user_id: str, rule_id: str) -> Optional[RecurringRuleModel]:
+        return self.db.query(RecurringRuleModel).filter(
+            RecurringRuleModel.user_id == user_id, RecurringRuleModel.id == rule_id
+        ).first()
+
+    def create(self, user_id: str, data: Dict[str, Any]) -> RecurringRuleModel:
+        rule = RecurringRuleModel(user_id=user_id, **data)
+        self.db.add(rule)
+        self.db.flush()
+        self.db.refresh(rule)
+        entry = audit_entry("create", user_id, new=rule)
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, [ALL_MONTHS])
+        self.db.commit()
+        audit_log.record([entry])
+        return rule
+
+    def update(self, user_id: str, rule_id: str, data: Dict[str, Any]) -> Optional[RecurringRuleModel]:
+        """Altera a regra; vale para todas as ocorrências ainda não materializadas.
+
+        Lança ValueError se a data final ficar antes da inicial.
+        """
+        rule = self.get(user_id, rule_id)
+        if not rule:
+            return None
+        old_values = snapshot(rule)
+        for key, value in data.items():
+            setattr(rule, key, value)
+        if rule.end_date and rule.end_date < rule.start_date:
+            self.db.rollback()
+            raise ValueError("A data final não pode ser anterior à data inicial")
+        self.db.flush()
+        self.db.refresh(rule)
+        entry = audit_entry("update", user_id, old=old_values, new=rule)
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, [ALL_MONTHS])
+        self.db.commit()
+        audit_log.record([entry])
+        return rule
+
+    def delete(self, user_id: str, rule_id: str) -> bool:
+        """Remove a regra e as ocorrências projetadas; as materializadas continuam como transações avulsas"""
+        rule = self.get(user_id, rule_id)
+        if not rule:
+            return False
+        entry = audit_entry("delete", user_id, old=rule)
+        self.db.delete(rule)
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, [ALL_MONTHS])
+        self.db.commit()
+        audit_log.record([entry])
+        return True
+
+    def has_occurrence(self, rule: RecurringRuleModel, value: date) -> bool:
+        return is_occurrence(rule.frequency, rule.interval, rule.start_date, value,
+                             rule.end_date, rule.count, rule.excluded_dates or ())
+
+    def exclude(self, user_id: str, excluded: Dict[str, Iterable[date]]) -> int:
+        """Acrescenta datas às exclusões (EXDATE) de cada regra, sem commit.
+
+        Usado ao remover ocorrências, projetadas ou materializadas, para que não
+        voltem a ser projetadas. Retorna o número de regras alteradas.
+        """
+        changed = 0
+        for rule_id, dates in excluded.items():
+            dates = sorted(set(dates))
+            if not dates:
+                continue
+            result = self.db.execute(
+                update(RecurringRuleModel)
+                .where(RecurringRuleModel.user_id == user_id, RecurringRuleModel.id == rule_id)
+                .values(excluded_dates=func.array_cat(RecurringRuleModel.excluded_dates, cast(dates, ARRAY(Date))))
+                .execution_options(synchronize_session=False)
+            )
+            changed += result.rowcount
+        return changed
+
+    def _rules(self, user_id: str, period: Period, type_: Optional[str],
+               category: Optional[str]) -> List[Tuple[RecurringRuleModel, List[date]]]:
+        """Regras que podem ter ocorrências no período, cada uma com as datas já materializadas nele.
+
+        Uma única consulta: as datas vêm de um subselect pelo índice único em
+        (recurring_rule_id, occurrence_date), limitado ao período.
+        """
+        materialized = select(func.array_agg(TransactionModel.occurrence_date)).where(
+            TransactionModel.recurring_rule_id == RecurringRuleModel.id,
+            period.filter(TransactionModel.occurrence_date),
+        ).scalar_subquery()
+        stmt = select(RecurringRuleModel, materialized).where(RecurringRuleModel.user_id == user_id)
+        if period.end:
+            stmt = stmt.where(RecurringRuleModel.start_date < period.end)
+        if period.start:
+            stmt = stmt.where(or_(RecurringRuleModel.end_date == None, RecurringRuleModel.end_date >= period.start))
+        if type_:
+            stmt = stmt.where(RecurringRuleModel.type == type_)
+        if category:
+            stmt = stmt.where(RecurringRuleModel.category == category)
+        return [(rule, materialized_dates or []) for rule, materialized_dates in self.db.execute(stmt)]
+
+    def projected(self, user_id: str, period: Period, type_: Optional[str] = None,
+                  category: Optional[str] = None) -> Iterator[Tuple[date, RecurringRuleModel]]:
+        """(data, regra) das ocorrências projetadas no período, da mais recente para a mais antiga.
+
+        As regras são lidas de uma vez; as datas são geradas sob demanda, em
+        ordem decrescente de (data, id da regra), intercalando um gerador por
+        regra. Quem para após uma página só gera as datas da página. O período
+        precisa ter data final.
+        """
+        return merge(
+            *(rule_occurrences(rule, period, materialized) for rule, materialized in self._rules(user_id, period, type_, category)),
+            key=lambda item: (item[0], item[1].id), reverse=True,
+        )
+
+    def count_projected(self, user_id: str, period: Period, type_: Optional[str] = None,
+                        category: Optional[str] = None) -> int:
+        """Quantidade de ocorrências projetadas no período, sem gerá-las"""
+        return sum(
+            count_rule_occurrences(rule, period, materialized)
+            for rule, materialized in self._rules(user_id, period, type_, category)
+        )
+
+    def project(self, user_id: str, period: Period, type_: Optional[str] = None,
+                category: Optional[str] = None) -> List[TransactionDTO]:
+        """Ocorrências projetadas no período como transações (is_projected), da mais recente para a mais antiga"""
+        return [occurrence(rule, occurrence_date) for occurrence_date, rule in self.projected(user_id, period, type_, category)]
+
+def occurrence(rule: RecurringRuleModel, occurrence_date: date) -> TransactionDTO:
+    """Transação projetada de uma ocorrência da regra"""
+    return TransactionDTO(
+        id=occurrence_id(rule.id, occurrence_date),
+        user_id=rule.user_id,
+        **{field: getattr(rule, field) for field in OCCURRENCE_FIELDS},
+        date=occurrence_date,
+        is_recurring=True,
+        created_at=rule.created_at,
+        updated_at=rule.updated_at,
+        recurring_rule_id=rule.id,
+        occurrence_date=occurrence_date,
+        is_projected=True,
+    )
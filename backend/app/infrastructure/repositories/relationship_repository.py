@@ -1,23 +1,24 @@
+from typing import Dict
 from sqlalchemy.orm import Session
 from ..models.relationship import RelationshipModel
+from ..reference_cache import reference_cache, RELATIONSHIPS
 from ...domain.dto.relationship import RelationshipDTO
 
 class RelationshipRepository:
     def __init__(self, db: Session):
         self.db = db
+
+    def _by_id(self) -> Dict[str, RelationshipDTO]:
+        """Relacionamentos por ID, lidos do cache de referência"""
+        return reference_cache.get(RELATIONSHIPS, lambda: {
+            rel.id: RelationshipDTO.model_validate(rel)
+            for rel in self.db.query(RelationshipModel).all()
+        })
     
     def get_all(self) -> list[RelationshipDTO]:
         """Busca todos os relacionamentos"""
-        relationships = self.db.query(RelationshipModel).all()
-        return [RelationshipDTO.model_validate(rel) for rel in relationships]
+        return list(self._by_id().values())
     
     def get_by_id(self, relationship_id: str) -> RelationshipDTO | None:
         """Busca um relacionamento por ID"""
-        relationship = self.db.query(RelationshipModel).filter(
-            RelationshipModel.id == relationship_id
-        ).first()
-        
-        if not relationship:
-            return None
-            
-        return RelationshipDTO.model_validate(relationship) 
\ No newline at end of file
+        return self._by_id().get(relationship_id)
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy.orm import Session
+from ..models.token import RefreshTokenModel, TokenBlacklistModel
+
+class TokenRepository:
+    """Refresh tokens emitidos e blacklist de access tokens, ambos identificados pelo jti"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_refresh_token(self, user_id: str, jti: str, expires_at: datetime) -> None:
+        self.db.add(RefreshTokenModel(user_id=user_id, token=jti, expires_at=expires_at))
+        self.db.commit()
+
+    def is_refresh_token_active(self, user_id: str, jti: str, now: datetime) -> bool:
+        return self.db.query(RefreshTokenModel.id).filter(
+            RefreshTokenModel.user_id == user_id,
+            RefreshTokenModel.token == jti,
+            RefreshTokenModel.expires_at > now
+        ).first() is not None
+
+    def revoke_refresh_token(self, user_id: str, jti: str) -> int:
+        count = self.db.query(RefreshTokenModel).filter(
+            RefreshTokenModel.user_id == user_id,
+            RefreshTokenModel.token == jti
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return count
+
+    def revoke_all_refresh_tokens(self, user_id: str) -> int:
+        count = self.db.query(RefreshTokenModel).filter(
+            RefreshTokenModel.user_id == user_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return count
+
+    def blacklist(self, jti: str, expires_at: datetime) -> None:
+        self.db.add(TokenBlacklistModel(token=jti, expires_at=expires_at))
+        self.db.commit()
+
+    def blacklisted_since(self, since: datetime, now: datetime) -> List[Tuple[str, datetime, datetime]]:
+        """(jti, expires_at, created_at) das revogações ainda válidas criadas a partir de since"""
+        return [
+            tuple(row) for row in self.db.query(
+                TokenBlacklistModel.token, TokenBlacklistModel.expires_at, TokenBlacklistModel.created_at
+            ).filter(
+                TokenBlacklistModel.created_at >= since,
+                TokenBlacklistModel.expires_at > now
+            )
+        ]
+
+    def purge_expired(self, now: datetime) -> int:
+        """Remove refresh tokens e revogações vencidos"""
+        count = self.db.query(RefreshTokenModel).filter(
+            RefreshTokenModel.expires_at <= now
+        ).delete(synchronize_session=False)
+        count += self.db.query(TokenBlacklistModel).filter(
+            TokenBlacklistModel.expires_at <= now
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return count
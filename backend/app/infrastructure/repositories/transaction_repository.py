@@ -1,36 +1,220 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, extract
-from typing import List, Optional, Tuple
+from sqlalchemy import and_, tuple_, func, insert, select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Iterator
 from datetime import date, timedelta
+from collections import defaultdict
+from heapq import merge
+from itertools import islice
+from uuid import uuid4
+from decimal import Decimal
+from types import SimpleNamespace
 from dateutil.relativedelta import relativedelta
 from ..models.transaction import TransactionModel
-from ...domain.dto.transaction import TransactionDTO, TransactionCreateDTO, TransactionUpdateDTO
+from ..pagination import encode_cursor, decode_cursor
+from ..period import Period
+from ..recurrence import parse_occurrence_id, occurrence_id, OCCURRENCE_SEPARATOR
+from .monthly_totals_repository import MonthlyTotalsRepository
+from .recurring_rule_repository import RecurringRuleRepository, OCCURRENCE_FIELDS, occurrence
+from ..summary_cache import summary_cache, month_scopes, FINANCE, PENDING
+from ..audit_log import audit_log, audit_entry
+from ..versioning import versioned_update, split_row, check_stale
+from ...domain.dto.transaction import (
+    TransactionDTO, TransactionCreateDTO, TransactionUpdateDTO, TransactionSelectionDTO, TransactionBulkChangesDTO,
+)
+
+EXPORT_COLUMNS = (
+    "id", "date", "description", "amount", "type", "category", "is_recurring",
+    "installments", "total_installments", "due_date", "payment_method_id", "created_at",
+)
+
+# Campos que determinam a linha do rollup monthly_totals afetada por uma transação
+ROLLUP_FIELDS = ("user_id", "date", "type", "category", "is_recurring", "amount")
+
+# Campos que uma ocorrência materializada pode ter diferentes dos da regra
+OCCURRENCE_OVERRIDES = ("description", "amount", "type", "category", "date", "due_date", "payment_method_id")
+
+def sort_key(transaction) -> Tuple[date, str]:
+    """Chave (date, id) da ordenação e do cursor das listagens; ocorrências projetadas usam o id da regra"""
+    return transaction.date, transaction.recurring_rule_id if transaction.is_projected else transaction.id
+
+def projection_period(period: Optional[Period], today: date) -> Period:
+    """Período em que as ocorrências são projetadas: o consultado ou, sem data final, até hoje"""
+    if period and period.end:
+        return period
+    return Period(period.start if period else None, today + timedelta(days=1))
+
+def summary_scopes(transactions) -> set:
+    """Escopos do cache de resumos afetados: os meses das transações e, se houver
+    despesa com vencimento, as parcelas pendentes (que não dependem do mês)"""
+    transactions = list(transactions)
+    scopes = month_scopes(t.date for t in transactions)
+    if any(t.type == "expense" and t.due_date for t in transactions):
+        scopes.add(PENDING)
+    return scopes
+
+def excluded_occurrences(transactions) -> Dict[str, List[date]]:
+    """Datas de ocorrência das transações materializadas de regras, por regra"""
+    excluded = defaultdict(list)
+    for t in transactions:
+        if t.recurring_rule_id:
+            excluded[t.recurring_rule_id].append(t.occurrence_date)
+    return excluded
 
 class TransactionRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.monthly_totals = MonthlyTotalsRepository(db)
+        self.recurring_rules = RecurringRuleRepository(db)
 
-    def list(self, user_id: str, month: Optional[str] = None, type_: Optional[str] = None, category: Optional[str] = None) -> Tuple[List[TransactionDTO], int]:
+    def _filtered(self, user_id: str, period: Optional[Period], type_: Optional[str], category: Optional[str]):
         query = self.db.query(TransactionModel).filter(TransactionModel.user_id == user_id)
-        
-        if month:
-            try:
-                year, month_num = month.split("-")
-                query = query.filter(
-                    extract('year', TransactionModel.date) == int(year),
-                    extract('month', TransactionModel.date) == int(month_num)
-                )
-            except ValueError:
-                pass
-                
+        if period:
+            query = query.filter(period.filter(TransactionModel.date))
         if type_:
             query = query.filter(TransactionModel.type == type_)
         if category:
             query = query.filter(TransactionModel.category == category)
-            
-        total = query.count()
-        transactions = query.order_by(TransactionModel.date.desc()).all()
-        return [TransactionDTO.model_validate(t) for t in transactions], total
+        return query
+
+    def list(self, user_id: str, period: Optional[Period] = None, type_: Optional[str] = None, category: Optional[str] = None) -> Tuple[List[TransactionDTO], int]:
+        query = self._filtered(user_id, period, type_, category)
+        transactions = [TransactionDTO.model_validate(t) for t in query.order_by(TransactionModel.date.desc(), TransactionModel.id.desc())]
+        projected = self.recurring_rules.project(user_id, projection_period(period, date.today()), type_, category)
+        transactions = list(merge(transactions, projected, key=sort_key, reverse=True))
+        return transactions, len(transactions)
+
+    def list_page(self, user_id: str, period: Optional[Period] = None, type_: Optional[str] = None, category: Optional[str] = None,
+                  limit: int = 100, cursor: Optional[str] = None, with_total: bool = False) -> Tuple[List[TransactionDTO], Optional[str], Optional[int]]:
+        """Lista transações com paginação por chave (date, id), sem OFFSET.
+
+        As ocorrências projetadas das regras de recorrência (até hoje, se o
+        período não tiver fim) entram na mesma ordem, com a chave (date, id da
+        regra). Só são geradas as da janela da página: da data do cursor até a
+        data da última linha real buscada, parando em limit + 1. Retorna os
+        itens da página, o cursor da próxima página (ou None) e o total, que só
+        é calculado quando with_total=True (as ocorrências são contadas sem gerá-las).
+        """
+        query = self._filtered(user_id, period, type_, category)
+        projection = projection_period(period, date.today())
+
+        total = None
+        if with_total:
+            total = query.order_by(None).count() + self.recurring_rules.count_projected(user_id, projection, type_, category)
+
+        cursor_key = None
+        if cursor:
+            cursor_key = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(TransactionModel.date, TransactionModel.id) < cursor_key
+            )
+
+        # Busca um item a mais para saber se existe próxima página
+        rows = query.order_by(TransactionModel.date.desc(), TransactionModel.id.desc()).limit(limit + 1).all()
+
+        # Com limit + 1 linhas reais, a página termina nelas ou antes: ocorrências
+        # anteriores à última não entram
+        window = Period(
+            rows[-1].date if len(rows) > limit else projection.start,
+            min(projection.end, cursor_key[0] + timedelta(days=1)) if cursor_key else projection.end,
+        )
+        projected = (
+            occurrence(rule, occurrence_date)
+            for occurrence_date, rule in self.recurring_rules.projected(user_id, window, type_, category)
+        )
+        if cursor_key:
+            projected = (t for t in projected if sort_key(t) < cursor_key)
+
+        page = list(islice(merge(map(TransactionDTO.model_validate, rows), projected, key=sort_key, reverse=True), limit + 1))
+        has_next = len(page) > limit
+        page = page[:limit]
+        next_cursor = encode_cursor(*sort_key(page[-1])) if has_next else None
+        return page, next_cursor, total
+
+    def stream(self, user_id: str, period: Optional[Period] = None, type_: Optional[str] = None,
+               category: Optional[str] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Itera as transações do usuário por um cursor no servidor (yield_per), sem montar DTOs.
+
+        As ocorrências projetadas (até hoje, se o período não tiver fim) são
+        intercaladas na mesma ordem.
+        """
+        stmt = select(*[getattr(TransactionModel, column) for column in EXPORT_COLUMNS]).where(
+            TransactionModel.user_id == user_id
+        )
+        if period:
+            stmt = stmt.where(period.filter(TransactionModel.date))
+        if type_:
+            stmt = stmt.where(TransactionModel.type == type_)
+        if category:
+            stmt = stmt.where(TransactionModel.category == category)
+        stmt = stmt.order_by(TransactionModel.date.desc(), TransactionModel.id.desc())
+
+        projected = (
+            {
+                "id": occurrence_id(rule.id, occurrence_date), "date": occurrence_date,
+                **{field: getattr(rule, field) for field in OCCURRENCE_FIELDS},
+                "is_recurring": True, "installments": None, "total_installments": None, "due_date": None,
+                "created_at": rule.created_at,
+            }
+            for occurrence_date, rule in self.recurring_rules.projected(
+                user_id, projection_period(period, date.today()), type_, category
+            )
+        )
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        # Mesma chave de sort_key: o id de uma ocorrência começa pelo id da regra
+        rows = merge(
+            result.mappings(), projected, reverse=True,
+            key=lambda row: (row["date"], row["id"].partition(OCCURRENCE_SEPARATOR)[0]),
+        )
+        for row in rows:
+            yield row
+
+    def monthly_summary(self, user_id: str, period: Period, today: date) -> Dict[str, Any]:
+        """Calcula os totais do resumo de um período alinhado ao mês (mês, trimestre ou ano).
+
+        Receitas, despesas, despesas recorrentes e a quebra por categoria vêm das
+        poucas linhas do rollup monthly_totals dos meses do período, somadas às
+        ocorrências projetadas das regras de recorrência no período. Parcelas
+        pendentes (due_date >= today) não dependem do período e são somadas em uma
+        consulta agregada à parte; a lista de parcelas usa o intervalo semiaberto do período.
+        """
+
+        totals = {
+            "total_income": Decimal(0),
+            "total_expenses": Decimal(0),
+            "recurring_expenses": Decimal(0),
+        }
+        expenses_by_category: Dict[str, Decimal] = {}
+        for row in self.monthly_totals.get_months(user_id, *period.month_keys()):
+            if row.type == "income":
+                totals["total_income"] += row.total_amount
+            elif row.type == "expense":
+                totals["total_expenses"] += row.total_amount
+                if row.is_recurring:
+                    totals["recurring_expenses"] += row.total_amount
+                expenses_by_category[row.category] = expenses_by_category.get(row.category, Decimal(0)) + row.total_amount
+        for _, rule in self.recurring_rules.projected(user_id, period):
+            if rule.type == "income":
+                totals["total_income"] += rule.amount
+            elif rule.type == "expense":
+                totals["total_expenses"] += rule.amount
+                totals["recurring_expenses"] += rule.amount
+                expenses_by_category[rule.category] = expenses_by_category.get(rule.category, Decimal(0)) + rule.amount
+
+        totals["pending_installments"] = self.db.query(func.coalesce(func.sum(TransactionModel.amount), 0)).filter(
+            TransactionModel.user_id == user_id,
+            TransactionModel.type == "expense",
+            TransactionModel.due_date != None,
+            TransactionModel.due_date >= today
+        ).scalar()
+
+        installments = self.db.query(TransactionModel).filter(
+            TransactionModel.user_id == user_id,
+            TransactionModel.total_installments != None,
+            period.filter(TransactionModel.date)
+        ).all()
+
+        return {**totals, "expenses_by_category": expenses_by_category, "installments": installments}
 
     def get(self, user_id: str, transaction_id: str) -> TransactionDTO | None:
         transaction = self.db.query(TransactionModel).filter(
@@ -51,94 +235,144 @@ class TransactionRepository:
                 return obj.get(field)
             return None
 
-        transactions = []
+        base = {
+            "user_id": user_id,
+            "description": get_field(data, 'description'),
+            "type": get_field(data, 'type'),
+            "category": get_field(data, 'category'),
+            "payment_method_id": get_field(data, 'payment_method_id'),
+        }
+        rows = []
         # Parcelada
         if get_field(data, 'total_installments') and get_field(data, 'total_installments') > 1:
             parcela_valor = round(get_field(data, 'amount') / get_field(data, 'total_installments'), 2)
+            # Identifica o plano para edição/cancelamento em lote
+            installment_group_id = str(uuid4())
             for i in range(get_field(data, 'total_installments')):
                 trans_date = get_field(data, 'date') + relativedelta(months=i)
                 due_date = get_field(data, 'due_date') + relativedelta(months=i) if get_field(data, 'due_date') else trans_date
-                transaction = TransactionModel(
-                    user_id=user_id,
-                    description=get_field(data, 'description'),
-                    amount=parcela_valor,
-                    type=get_field(data, 'type'),
-                    category=get_field(data, 'category'),
-                    date=trans_date,
-                    is_recurring=False,
-                    installments=i+1,
-                    total_installments=get_field(data, 'total_installments'),
-                    due_date=due_date,
-                    payment_method_id=get_field(data, 'payment_method_id')
-                )
-                self.db.add(transaction)
-                self.db.flush()
-                transactions.append(transaction)
-            self.db.commit()
-            self.db.refresh(transactions[0])
-            return TransactionDTO.model_validate(transactions[0])
-        # Recorrente
+                rows.append({
+                    **base,
+                    "amount": parcela_valor,
+                    "date": trans_date,
+                    "is_recurring": False,
+                    "installments": i+1,
+                    "total_installments": get_field(data, 'total_installments'),
+                    "due_date": due_date,
+                    "installment_group_id": installment_group_id,
+                })
+        # Recorrente: grava só a regra (mensal, sem fim); as ocorrências são projetadas
         elif get_field(data, 'is_recurring'):
-            for i in range(6):
-                trans_date = get_field(data, 'date') + relativedelta(months=i)
-                transaction = TransactionModel(
-                    user_id=user_id,
-                    description=get_field(data, 'description'),
-                    amount=get_field(data, 'amount'),
-                    type=get_field(data, 'type'),
-                    category=get_field(data, 'category'),
-                    date=trans_date,
-                    is_recurring=True,
-                    installments=None,
-                    total_installments=None,
-                    due_date=None,
-                    payment_method_id=get_field(data, 'payment_method_id')
-                )
-                self.db.add(transaction)
-                self.db.flush()
-                transactions.append(transaction)
-            self.db.commit()
-            self.db.refresh(transactions[0])
-            return TransactionDTO.model_validate(transactions[0])
+            base.pop("user_id")
+            rule = self.recurring_rules.create(user_id, {
+                **base,
+                "amount": get_field(data, 'amount'),
+                "frequency": "monthly",
+                "interval": 1,
+                "start_date": get_field(data, 'date'),
+            })
+            return occurrence(rule, rule.start_date)
         # Normal
         else:
-            transaction = TransactionModel(
-                user_id=user_id,
-                description=get_field(data, 'description'),
-                amount=get_field(data, 'amount'),
-                type=get_field(data, 'type'),
-                category=get_field(data, 'category'),
-                date=get_field(data, 'date'),
-                is_recurring=False,
-                installments=None,
-                total_installments=None,
-                due_date=get_field(data, 'due_date'),
-                payment_method_id=get_field(data, 'payment_method_id')
-            )
-            self.db.add(transaction)
+            rows.append({
+                **base,
+                "amount": get_field(data, 'amount'),
+                "date": get_field(data, 'date'),
+                "is_recurring": False,
+                "installments": None,
+                "total_installments": None,
+                "due_date": get_field(data, 'due_date'),
+            })
+
+        transactions = self._insert_many(rows)
+        self.monthly_totals.apply(added=transactions)
+        result = TransactionDTO.model_validate(transactions[0])
+        entries = [audit_entry("create", user_id, new=t) for t in transactions]
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, summary_scopes(transactions))
+        self.db.commit()
+        audit_log.record(entries)
+        return result
+
+    def create_many(self, user_id: str, batches: Iterable[List[Dict[str, Any]]]) -> int:
+        """Insere lotes de transações simples (sem parcelamento/recorrência) numa única transação.
+
+        Cada lote é um INSERT multi-linha sem RETURNING; o rollup é atualizado a
+        partir dos próprios dados. O commit acontece uma vez, depois do último
+        lote: se a leitura dos lotes falhar no meio, nada é gravado.
+        """
+        imported, scopes, entries = 0, set(), []
+        for rows in batches:
+            if not rows:
+                continue
+            rows = [{**row, "user_id": user_id} for row in rows]
+            self.db.execute(insert(TransactionModel), rows)
+            added = [SimpleNamespace(**{"due_date": None, **row}) for row in rows]
+            self.monthly_totals.apply(added=added)
+            scopes |= summary_scopes(added)
+            # Um registro por lote: as linhas são inseridas sem RETURNING, então não há ids
+            entries.append(audit_entry("import", user_id, table_name=TransactionModel.__tablename__, new={
+                "count": len(rows),
+                "first_date": min(row["date"] for row in rows),
+                "last_date": max(row["date"] for row in rows),
+            }))
+            imported += len(rows)
+        if imported:
+            summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, scopes)
             self.db.commit()
-            self.db.refresh(transaction)
-            return TransactionDTO.model_validate(transaction)
+            audit_log.record(entries)
+        return imported
+
+    def _insert_many(self, rows: List[Dict[str, Any]]) -> List[TransactionModel]:
+        """Insere todas as linhas do cronograma em um único INSERT ... VALUES (...), (...) RETURNING"""
+        stmt = insert(TransactionModel).returning(TransactionModel, sort_by_parameter_order=True)
+        return self.db.scalars(stmt, rows).all()
 
     def update(self, user_id: str, transaction_id: str, data) -> TransactionDTO | None:
-        transaction = self.get(user_id, transaction_id)
-        if not transaction:
-            return None
-        transaction_model = self.db.query(TransactionModel).filter(
-            and_(TransactionModel.user_id == user_id, TransactionModel.id == transaction_id)
-        ).first()
+        """Atualiza a transação em um único UPDATE ... RETURNING (sem SELECT prévio).
+
+        Com data.version, só atualiza se a versão ainda for a mesma; caso
+        contrário lança StaleWriteError. Os valores anteriores, devolvidos pelo
+        próprio UPDATE, alimentam o rollup, o cache de resumos e a auditoria.
+        Com o id de uma ocorrência projetada, materializa a ocorrência com os
+        valores alterados. Lança ValueError se o id de ocorrência for inválido.
+        """
         # Aceitar tanto DTO quanto dict
         if hasattr(data, 'model_dump'):
             update_data = data.model_dump(exclude_unset=True)
         else:
             update_data = {k: v for k, v in data.items() if v is not None}
-        for key, value in update_data.items():
-            setattr(transaction_model, key, value)
+        version = update_data.pop("version", None)
+        if parsed := parse_occurrence_id(transaction_id):
+            overrides = {key: value for key, value in update_data.items() if key in OCCURRENCE_OVERRIDES}
+            return self.materialize(user_id, *parsed, overrides)
+        columns = TransactionModel.__table__.c
+        values = {key: value for key, value in update_data.items() if key in columns and key not in ("id", "user_id")}
+        conditions = (TransactionModel.user_id == user_id, TransactionModel.id == transaction_id)
+
+        row = self.db.execute(versioned_update(TransactionModel, conditions, values, version)).first()
+        if row is None:
+            check_stale(self.db, TransactionModel, conditions, version)
+            return None
+
+        new_values, old_values = split_row(row)
+        current, previous = SimpleNamespace(**new_values), SimpleNamespace(**old_values)
+        self.monthly_totals.apply(added=[current], removed=[previous])
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, summary_scopes([previous, current]))
         self.db.commit()
-        self.db.refresh(transaction_model)
-        return TransactionDTO.model_validate(transaction_model)
+        audit_log.record([audit_entry(
+            "update", user_id, old=old_values, new=new_values,
+            table_name=TransactionModel.__tablename__, record_id=transaction_id,
+        )])
+        return TransactionDTO.model_validate(new_values)
 
     def delete(self, user_id: str, transaction_id: str) -> bool:
+        """Remove a transação; uma ocorrência de regra (projetada ou materializada)
+        vira data excluída da regra, para não voltar a ser projetada.
+
+        Lança ValueError se o id de ocorrência for inválido.
+        """
+        if parsed := parse_occurrence_id(transaction_id):
+            return self._delete_occurrence(user_id, *parsed)
         transaction = self.db.query(TransactionModel).filter(
             and_(TransactionModel.user_id == user_id, TransactionModel.id == transaction_id)
         ).first()
@@ -146,6 +380,151 @@ class TransactionRepository:
         if not transaction:
             return False
             
+        self.monthly_totals.apply(removed=[transaction])
+        self.recurring_rules.exclude(user_id, excluded_occurrences([transaction]))
+        scopes = summary_scopes([transaction])
+        entry = audit_entry("delete", user_id, old=transaction)
         self.db.delete(transaction)
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, scopes)
+        self.db.commit()
+        audit_log.record([entry])
+        return True
+
+    def _delete_occurrence(self, user_id: str, rule_id: str, occurrence_date: date) -> bool:
+        materialized = self.db.scalar(select(TransactionModel.id).where(
+            TransactionModel.user_id == user_id,
+            TransactionModel.recurring_rule_id == rule_id,
+            TransactionModel.occurrence_date == occurrence_date,
+        ))
+        if materialized:
+            return self.delete(user_id, materialized)
+        rule = self.recurring_rules.get(user_id, rule_id)
+        if not rule or not self.recurring_rules.has_occurrence(rule, occurrence_date):
+            return False
+        self.recurring_rules.exclude(user_id, {rule_id: [occurrence_date]})
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, month_scopes([occurrence_date]))
+        self.db.commit()
+        audit_log.record([audit_entry(
+            "delete", user_id, old=occurrence(rule, occurrence_date).model_dump(),
+            table_name=rule.__tablename__, record_id=rule_id,
+        )])
+        return True
+
+    def materialize(self, user_id: str, rule_id: str, occurrence_date: date,
+                    overrides: Optional[Dict[str, Any]] = None) -> TransactionDTO | None:
+        """Grava uma ocorrência da regra como transação, com overrides sobre os valores da regra.
+
+        Um único INSERT ... ON CONFLICT DO NOTHING no índice único (recurring_rule_id,
+        occurrence_date); se a ocorrência já estava materializada, aplica os
+        overrides à transação existente. Retorna None se a regra não existir ou a
+        data não for uma ocorrência dela.
+        """
+        overrides = overrides or {}
+        rule = self.recurring_rules.get(user_id, rule_id)
+        if not rule:
+            return None
+        materialized = select(TransactionModel.id).where(
+            TransactionModel.user_id == user_id,
+            TransactionModel.recurring_rule_id == rule_id,
+            TransactionModel.occurrence_date == occurrence_date,
+        )
+        if self.recurring_rules.has_occurrence(rule, occurrence_date):
+            transaction = self._insert_occurrence(user_id, rule, occurrence_date, overrides)
+            if transaction is not None:
+                return transaction
+        # Já materializada (ou a regra mudou e a data não é mais uma ocorrência dela)
+        existing = self.db.scalar(materialized)
+        if not existing:
+            return None
+        return self.update(user_id, existing, overrides) if overrides else self.get(user_id, existing)
+
+    def _insert_occurrence(self, user_id: str, rule, occurrence_date: date, overrides: Dict[str, Any]) -> TransactionDTO | None:
+        """INSERT da ocorrência e commit; None se ela já estiver materializada"""
+        values = {
+            **{field: getattr(rule, field) for field in OCCURRENCE_FIELDS},
+            "date": occurrence_date,
+            **overrides,
+            "user_id": user_id,
+            "is_recurring": True,
+            "recurring_rule_id": rule.id,
+            "occurrence_date": occurrence_date,
+        }
+        stmt = pg_insert(TransactionModel).values(values).on_conflict_do_nothing(
+            index_elements=[TransactionModel.recurring_rule_id, TransactionModel.occurrence_date],
+            index_where=TransactionModel.recurring_rule_id != None,
+        ).returning(TransactionModel)
+        transaction = self.db.scalars(stmt).first()
+        if transaction is None:
+            return None
+
+        self.monthly_totals.apply(added=[transaction])
+        result = TransactionDTO.model_validate(transaction)
+        entry = audit_entry("create", user_id, new=transaction)
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, summary_scopes([transaction]) | month_scopes([occurrence_date]))
+        self.db.commit()
+        audit_log.record([entry])
+        return result
+
+    def _selection(self, user_id: str, selection: TransactionSelectionDTO) -> list:
+        """Condições da seleção de uma operação em lote, sempre restritas ao usuário"""
+        conditions = [TransactionModel.user_id == user_id]
+        if selection.ids:
+            conditions.append(TransactionModel.id.in_(selection.ids))
+        if selection.installment_group_id:
+            conditions.append(TransactionModel.installment_group_id == selection.installment_group_id)
+        if selection.period:
+            conditions.append(Period.parse(selection.period).filter(TransactionModel.date))
+        if selection.type:
+            conditions.append(TransactionModel.type == selection.type)
+        if selection.category:
+            conditions.append(TransactionModel.category == selection.category)
+        return conditions
+
+    def bulk_update(self, user_id: str, selection: TransactionSelectionDTO, changes: TransactionBulkChangesDTO) -> int:
+        """Altera todas as transações selecionadas em um único UPDATE ... RETURNING e faz commit.
+
+        Os valores anteriores de cada linha, devolvidos pelo próprio UPDATE,
+        ajustam o rollup, o cache de resumos e a auditoria. Retorna o número de
+        transações alteradas. Lança ValueError se o período for inválido.
+        """
+        stmt = versioned_update(TransactionModel, self._selection(user_id, selection), changes.model_dump(exclude_none=True))
+        rows = [split_row(row) for row in self.db.execute(stmt)]
+        if not rows:
+            return 0
+
+        current = [SimpleNamespace(**new_values) for new_values, _ in rows]
+        previous = [SimpleNamespace(**old_values) for _, old_values in rows]
+        self.monthly_totals.apply(added=current, removed=previous)
+        entries = [
+            audit_entry("update", user_id, old=old_values, new=new_values,
+                        table_name=TransactionModel.__tablename__, record_id=new_values["id"])
+            for new_values, old_values in rows
+        ]
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, summary_scopes([*previous, *current]))
+        self.db.commit()
+        audit_log.record(entries)
+        return len(rows)
+
+    def bulk_delete(self, user_id: str, selection: TransactionSelectionDTO) -> int:
+        """Remove todas as transações selecionadas em um único DELETE ... RETURNING e faz commit.
+
+        Retorna o número de transações removidas. Lança ValueError se o período for inválido.
+        """
+        stmt = delete(TransactionModel).where(*self._selection(user_id, selection)).returning(
+            *TransactionModel.__table__.c
+        ).execution_options(synchronize_session=False)
+        rows = [dict(row._mapping) for row in self.db.execute(stmt)]
+        if not rows:
+            return 0
+
+        removed = [SimpleNamespace(**row) for row in rows]
+        self.monthly_totals.apply(removed=removed)
+        self.recurring_rules.exclude(user_id, excluded_occurrences(removed))
+        entries = [
+            audit_entry("delete", user_id, old=row, table_name=TransactionModel.__tablename__, record_id=row["id"])
+            for row in rows
+        ]
+        summary_cache.invalidate_on_commit(self.db, user_id, FINANCE, summary_scopes(removed))
         self.db.commit()
-        return True 
\ No newline at end of file
+        audit_log.record(entries)
+        return len(rows)
@@ -13,6 +13,15 @@ class UserRepository:
     def get_by_id(self, user_id: str) -> UserModel | None:
         return self.db.query(UserModel).filter(UserModel.id == user_id).first()
 
+    def exists(self, user_id: str) -> bool:
+        return self.db.query(UserModel.id).filter(UserModel.id == user_id).first() is not None
+
+    def update_password_hash(self, user_id: str, password_hash: str) -> None:
+        self.db.query(UserModel).filter(UserModel.id == user_id).update(
+            {UserModel.password_hash: password_hash}, synchronize_session=False
+        )
+        self.db.commit()
+
     def create(self, name: str, email: str, password: str, avatar: str = None) -> UserModel | None:
         user = UserModel(
             name=name,
@@ -22,8 +31,9 @@ class UserRepository:
         )
         self.db.add(user)
         try:
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(user)
+            self.db.commit()
             return user
         except IntegrityError:
             self.db.rollback()
@@ -0,0 +1,252 @@
+import json
+import logging
+import threading
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+from pydantic_core import to_json
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from .config import (
+    SUMMARY_CACHE_BACKEND, SUMMARY_CACHE_URL, SUMMARY_CACHE_TTL, SUMMARY_CACHE_SIZE, REFERENCE_CACHE_NOTIFY,
+)
+from .reference_cache import NOTIFY_CHANNEL
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Tipos de resumo
+FINANCE = "finance"
+DEBTS = "debts"
+
+# Escopos de invalidação além dos meses (YYYY-MM)
+ALL_MONTHS = "*"      # todos os meses do usuário (ex.: pessoa renomeada no resumo de dívidas)
+PENDING = "pending"   # parcelas pendentes, somadas fora do período no resumo de finanças
+_VERSION = "#"        # contador de escritas do usuário, não faz parte das chaves
+
+NOTIFY_PREFIX = "summary:"
+# Invalidações aguardando o commit, em Session.info
+_PENDING = "summary_cache_pending"
+# Identifica as notificações deste processo, que já invalidou localmente
+_ORIGIN = uuid.uuid4().hex[:12]
+
+def month_scopes(dates: Iterable[Optional[date]]) -> Set[str]:
+    """Escopos (YYYY-MM) dos meses das datas informadas"""
+    return {value.strftime("%Y-%m") for value in dates if value}
+
+class MemoryBackend:
+    """Valores e gerações no próprio processo"""
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.values = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generations(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._generations.get(key, 0) for key in keys]
+
+    def bump(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def get(self, key: str) -> Any:
+        return self.values.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.values.set(key, value)
+
+    def clear(self) -> None:
+        self.values.clear()
+
+class RedisBackend:
+    """Valores (JSON, com expiração) e gerações (INCR) em um Redis compartilhado pelos workers.
+
+    As gerações não expiram: se uma geração sumisse e voltasse a zero, uma
+    chave antiga ainda não expirada poderia ser lida de novo.
+    """
+    name = "redis"
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis
+        except ImportError:
+            # Falha na inicialização, e não na primeira escrita
+            raise RuntimeError("SUMMARY_CACHE_BACKEND=redis requer o pacote redis (pip install 'redis>=5.0')") from None
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.ttl = ttl
+
+    def generations(self, keys: List[str]) -> List[int]:
+        return [int(value or 0) for value in self.client.mget(keys)]
+
+    def bump(self, keys: List[str]) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(key)
+        pipeline.execute()
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(key, to_json(value), ex=self.ttl)
+
+    def clear(self) -> None:
+        pass
+
+class SummaryCache:
+    """Cache dos resumos por (usuário, período, tipo) com invalidação na escrita.
+
+    Cada (usuário, tipo, mês) tem uma geração, e a chave de um resumo inclui as
+    gerações de todos os meses do período. Nas escritas os repositórios chamam
+    invalidate_on_commit() com os meses afetados (inclusive todas as parcelas
+    geradas) e fazem o próprio commit; só essas gerações são incrementadas, e
+    os resumos de outros meses continuam válidos.
+    Um resumo calculado antes do incremento fica numa chave que não é mais
+    lida, então dados antigos não voltam ao cache.
+
+    Com o backend memory, cada worker tem o seu cache; as invalidações são
+    propagadas aos outros workers via LISTEN/NOTIFY quando
+    REFERENCE_CACHE_NOTIFY está ativo. Com redis o cache é compartilhado.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _generation_key(user_id: Any, kind: str, scope: str) -> str:
+        return f"summary:gen:{user_id}:{kind}:{scope}"
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def key(self, user_id: Any, kind: str, scopes: Iterable[str], *extra: Any) -> Optional[str]:
+        """Chave do resumo com as gerações atuais dos escopos (None se o cache estiver indisponível)"""
+        if not self.enabled:
+            return None
+        scopes = [ALL_MONTHS, *sorted(set(scopes))]
+        try:
+            generations = self.backend.generations([self._generation_key(user_id, kind, scope) for scope in scopes])
+        except Exception:
+            self._count("errors")
+            logger.exception("Falha ao ler as gerações do cache de resumos")
+            return None
+        parts = [str(user_id), kind, *map(str, extra), *(f"{scope}@{generation}" for scope, generation in zip(scopes, generations))]
+        return "summary:val:" + ":".join(parts)
+
+    def get(self, key: Optional[str]) -> Any:
+        if key is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            self._count("errors")
+            logger.exception("Falha ao ler o cache de resumos")
+            value = None
+        self._count("misses" if value is None else "hits")
+        return value
+
+    def set(self, key: Optional[str], value: Any) -> None:
+        if key is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception:
+            self._count("errors")
+            logger.exception("Falha ao gravar no cache de resumos")
+
+    def version(self, user_id: Any, kind: str) -> int:
+        """Contador de escritas do usuário que afetaram resumos desse tipo"""
+        if not self.enabled:
+            return 0
+        try:
+            return self.backend.generations([self._generation_key(user_id, kind, _VERSION)])[0]
+        except Exception:
+            self._count("errors")
+            logger.exception("Falha ao ler a versão do cache de resumos")
+            return 0
+
+    def invalidate(self, user_id: Any, kind: str, scopes: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        keys = [self._generation_key(user_id, kind, scope) for scope in {*scopes, _VERSION}]
+        try:
+            self.backend.bump(keys)
+        except Exception:
+            self._count("errors")
+            logger.exception("Falha ao invalidar o cache de resumos; entradas antigas valem até expirar")
+            return
+        self._count("invalidations")
+
+    def publish(self, db: Session, user_id: Any, kind: str, scopes: Iterable[str]) -> None:
+        """Agenda o NOTIFY para os outros workers (só no backend memory); o Postgres o entrega no commit"""
+        if REFERENCE_CACHE_NOTIFY and isinstance(self.backend, MemoryBackend):
+            payload = f"{NOTIFY_PREFIX}{_ORIGIN}:{user_id}:{kind}:{','.join(sorted(set(scopes)))}"
+            db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+
+    def invalidate_on_commit(self, db: Session, user_id: Any, kind: str, scopes: Iterable[str]) -> None:
+        """Marca os escopos de uma escrita para invalidar quando a transação da sessão fizer commit.
+
+        O commit continua com o repositório. O NOTIFY para os outros workers
+        entra na própria transação, e a invalidação local roda no after_commit
+        da sessão. Em rollback as marcações são descartadas.
+        """
+        scopes = set(scopes)
+        self.publish(db, user_id, kind, scopes)
+        if not db.in_transaction():
+            db.begin()  # sem conexão ainda; garante o after_transaction_end que descarta em rollback
+        db.info.setdefault(_PENDING, []).append((user_id, kind, scopes))
+
+    def receive(self, payload: str) -> None:
+        """Aplica uma invalidação recebida de outro worker via NOTIFY"""
+        origin, user_id, kind, scopes = payload[len(NOTIFY_PREFIX):].split(":", 3)
+        if origin != _ORIGIN:
+            self.invalidate(user_id, kind, scopes.split(","))
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.enabled else "off",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id, kind, scopes in session.info.pop(_PENDING, ()):
+        summary_cache.invalidate(user_id, kind, scopes)
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_rolled_back(session: Session, transaction) -> None:
+    # Depois do after_commit; o que sobrou na transação externa foi desfeito (rollback/close)
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+def _build_backend():
+    if SUMMARY_CACHE_BACKEND == "memory":
+        return MemoryBackend(SUMMARY_CACHE_SIZE, SUMMARY_CACHE_TTL)
+    if SUMMARY_CACHE_BACKEND == "redis":
+        return RedisBackend(SUMMARY_CACHE_URL, SUMMARY_CACHE_TTL)
+    return None
+
+summary_cache = SummaryCache(_build_backend())
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from .config import TOKEN_REVOCATION_REFRESH_SECONDS, TOKEN_SWEEP_INTERVAL_SECONDS
+from .db import AsyncSessionLocal
+from .repositories.async_repository import AsyncRepository
+from .repositories.token_repository import TokenRepository
+
+logger = logging.getLogger(__name__)
+
+# Folga na recarga incremental para não perder linhas gravadas por transações mais lentas
+_RELOAD_OVERLAP = timedelta(seconds=30)
+
+class RevokedTokens:
+    """Conjunto em memória dos jti revogados, espelho da tabela token_blacklist.
+
+    A checagem por requisição é só um lookup no dict. Revogações feitas neste
+    processo entram na hora; as de outros workers chegam na próxima recarga
+    (a cada TOKEN_REVOCATION_REFRESH_SECONDS), que busca apenas as linhas novas.
+    """
+
+    def __init__(self):
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loaded_since: Optional[datetime] = None
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        expires = self._expires.get(jti)
+        return expires is not None and expires > time.time()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expires[jti] = expires_at.timestamp()
+
+    def _prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            for jti in [jti for jti, expires in self._expires.items() if expires <= now]:
+                del self._expires[jti]
+
+    async def reload(self) -> int:
+        now = datetime.now(timezone.utc)
+        since = self._loaded_since - _RELOAD_OVERLAP if self._loaded_since else datetime.min.replace(tzinfo=timezone.utc)
+        async with AsyncSessionLocal() as db:
+            rows = await AsyncRepository(db, TokenRepository).blacklisted_since(since, now)
+        for jti, expires_at, _ in rows:
+            self.add(jti, expires_at)
+        self._loaded_since = now
+        self._prune()
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+revoked_tokens = RevokedTokens()
+
+async def sweep_expired_tokens() -> int:
+    async with AsyncSessionLocal() as db:
+        return await AsyncRepository(db, TokenRepository).purge_expired(datetime.now(timezone.utc))
+
+async def run_revocation_tasks() -> None:
+    """Loop de fundo: recarrega a blacklist e, com menos frequência, apaga tokens vencidos.
+
+    A primeira carga é feita no startup (revoked_tokens.reload), então o loop
+    começa esperando o intervalo.
+    """
+    next_sweep = 0.0
+    while True:
+        await asyncio.sleep(TOKEN_REVOCATION_REFRESH_SECONDS)
+        try:
+            await revoked_tokens.reload()
+            if time.monotonic() >= next_sweep:
+                removed = await sweep_expired_tokens()
+                if removed:
+                    logger.info("Tokens vencidos removidos: %s", removed)
+                next_sweep = time.monotonic() + TOKEN_SWEEP_INTERVAL_SECONDS
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Falha ao atualizar a revogação de tokens")
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+OLD_PREFIX = "old_"
+
+STALE_WRITE_MESSAGE = "O registro foi alterado por outra requisição. Recarregue e tente novamente."
+
+class StaleWriteError(Exception):
+    """A versão enviada pelo cliente não é mais a versão atual da linha"""
+
+    def __init__(self, current_version: int):
+        super().__init__(STALE_WRITE_MESSAGE)
+        self.current_version = current_version
+
+def versioned_update(model, conditions, values: Dict[str, Any], version: Optional[int] = None):
+    """UPDATE com controle de concorrência otimista que devolve a linha nova e a anterior.
+
+    Gera UPDATE ... SET ..., version = version + 1 FROM (SELECT ... FOR UPDATE) old
+    WHERE id = old.id [AND version = :version] RETURNING <colunas>, old.<colunas>:
+    uma única ida ao banco, sem SELECT prévio. Os valores anteriores voltam
+    rotulados com OLD_PREFIX (use split_row). Nenhuma linha retornada significa
+    linha inexistente ou, com version, escrita obsoleta (veja check_stale).
+    """
+    columns = model.__table__.c
+    old = select(*columns).where(*conditions).with_for_update().subquery("old")
+    stmt = update(model).where(model.id == old.c.id).values(**values, version=model.version + 1)
+    if version is not None:
+        stmt = stmt.where(model.version == version)
+    return stmt.returning(*columns, *(old.c[column.name].label(OLD_PREFIX + column.name) for column in columns))
+
+def split_row(row) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Separa uma linha de versioned_update em (valores novos, valores anteriores)"""
+    new, old = {}, {}
+    for key, value in row._mapping.items():
+        if key.startswith(OLD_PREFIX):
+            old[key[len(OLD_PREFIX):]] = value
+        else:
+            new[key] = value
+    return new, old
+
+def check_stale(db: Session, model, conditions, version: Optional[int]) -> None:
+    """Depois de um versioned_update sem linhas: lança StaleWriteError se a linha existe.
+
+    Só roda no caminho de falha; se a linha não existe, quem chama responde 404.
+    """
+    if version is None:
+        return
+    current = db.execute(select(model.version).where(*conditions)).scalar()
+    if current is not None:
+        raise StaleWriteError(current)
@@ -1,24 +1,28 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, status, Depends
 from pydantic import BaseModel, EmailStr, Field, validator
 from .utils import success_response, error_response
-from sqlalchemy.orm import Session
-from app.infrastructure.db import SessionLocal
-from app.infrastructure.repositories import UserRepository
-from app.infrastructure.jwt_utils import create_access_token, create_refresh_token, verify_token
-from app.interface.api.dependencies import get_current_user
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db import get_async_db
+from app.infrastructure.repositories import UserRepository, TokenRepository, AsyncRepository
+from app.infrastructure.jwt_utils import (
+    create_access_token, create_refresh_token, verify_token, expiration_of,
+)
+from app.infrastructure.token_revocation import revoked_tokens
+from app.infrastructure.password_hasher import password_hasher, PasswordHasherBusy
+from app.interface.api.dependencies import get_current_user, get_token_claims
 import traceback
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def hasher_busy_response():
+    response = error_response(
+        message="Muitas requisições de autenticação no momento. Tente novamente em instantes.",
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    response.headers["Retry-After"] = "1"
+    return response
 
 class RegisterRequest(BaseModel):
     name: str = Field(..., min_length=1)
@@ -39,18 +43,30 @@ class LoginRequest(BaseModel):
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+    all_devices: bool = False
+
+async def issue_tokens(db: AsyncSession, user_id: str) -> Dict[str, str]:
+    """Gera o par de tokens e registra o refresh token (jti) em refresh_tokens"""
+    access_token = create_access_token(data={"sub": user_id})
+    refresh_token = create_refresh_token(data={"sub": user_id})
+    claims = verify_token(refresh_token)
+    await AsyncRepository(db, TokenRepository).add_refresh_token(user_id, claims["jti"], expiration_of(claims))
+    return {"access_token": access_token, "refresh_token": refresh_token}
+
 @router.post("/register", status_code=201)
-def register(req: RegisterRequest, db: Session = Depends(get_db)):
+async def register(req: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        repo = UserRepository(db)
-        if repo.get_by_email(req.email):
+        repo = AsyncRepository(db, UserRepository)
+        if await repo.get_by_email(req.email):
             return error_response(
                 message="Dados inválidos",
                 errors={"email": ["Email já está em uso"]},
                 status_code=status.HTTP_400_BAD_REQUEST
             )
-        hashed_password = pwd_context.hash(req.password)
-        user = repo.create(name=req.name, email=req.email, password=hashed_password)
+        hashed_password = await password_hasher.hash(req.password)
+        user = await repo.create(name=req.name, email=req.email, password=hashed_password)
         if not user:
             return error_response(
                 message="Erro ao criar usuário",
@@ -58,8 +74,7 @@ def register(req: RegisterRequest, db: Session = Depends(get_db)):
             )
         
         # Gerar tokens JWT
-        access_token = create_access_token(data={"sub": str(user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+        tokens = await issue_tokens(db, str(user.id))
         
         return success_response(
             message="Conta criada com sucesso",
@@ -71,11 +86,13 @@ def register(req: RegisterRequest, db: Session = Depends(get_db)):
                     "avatar": user.avatar,
                     "createdAt": user.created_at.isoformat()
                 },
-                "access_token": access_token,
-                "refresh_token": refresh_token,
+                "access_token": tokens["access_token"],
+                "refresh_token": tokens["refresh_token"],
                 "token_type": "bearer"
             }
         )
+    except PasswordHasherBusy:
+        return hasher_busy_response()
     except Exception as e:
         return error_response(
             message=f"Erro interno: {str(e)}",
@@ -83,19 +100,27 @@ def register(req: RegisterRequest, db: Session = Depends(get_db)):
         )
 
 @router.post("/login")
-def login(req: LoginRequest, db: Session = Depends(get_db)):
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        repo = UserRepository(db)
-        user = repo.get_by_email(req.email)
-        if not user or not pwd_context.verify(req.password, user.password_hash):
+        repo = AsyncRepository(db, UserRepository)
+        user = await repo.get_by_email(req.email)
+        if not user:
+            return error_response(
+                message="Email ou senha incorretos",
+                status_code=status.HTTP_401_UNAUTHORIZED
+            )
+        valid, new_hash = await password_hasher.verify_and_update(req.password, user.password_hash)
+        if not valid:
             return error_response(
                 message="Email ou senha incorretos",
                 status_code=status.HTTP_401_UNAUTHORIZED
             )
+        if new_hash:
+            # Custo do bcrypt mudou (BCRYPT_ROUNDS): regrava o hash com a senha já validada
+            await repo.update_password_hash(user.id, new_hash)
         
         # Gerar tokens JWT
-        access_token = create_access_token(data={"sub": str(user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+        tokens = await issue_tokens(db, str(user.id))
         
         return success_response(
             message="Login realizado com sucesso",
@@ -107,11 +132,13 @@ def login(req: LoginRequest, db: Session = Depends(get_db)):
                     "avatar": user.avatar,
                     "createdAt": user.created_at.isoformat()
                 },
-                "access_token": access_token,
-                "refresh_token": refresh_token,
+                "access_token": tokens["access_token"],
+                "refresh_token": tokens["refresh_token"],
                 "token_type": "bearer"
             }
         )
+    except PasswordHasherBusy:
+        return hasher_busy_response()
     except Exception as e:
         return error_response(
             message=f"Erro interno: {str(e)}",
@@ -119,7 +146,7 @@ def login(req: LoginRequest, db: Session = Depends(get_db)):
         )
 
 @router.post("/refresh")
-def refresh_token(req: RefreshTokenRequest):
+async def refresh_token(req: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     try:
         payload = verify_token(req.refresh_token)
         if not payload or payload.get("type") != "refresh":
@@ -134,6 +161,16 @@ def refresh_token(req: RefreshTokenRequest):
                 message="Token inválido",
                 status_code=status.HTTP_401_UNAUTHORIZED
             )
+
+        # Tokens emitidos antes da revogação não têm jti nem linha em refresh_tokens
+        jti = payload.get("jti")
+        if jti:
+            tokens = AsyncRepository(db, TokenRepository)
+            if not await tokens.is_refresh_token_active(user_id, jti, datetime.now(timezone.utc)):
+                return error_response(
+                    message="Refresh token revogado",
+                    status_code=status.HTTP_401_UNAUTHORIZED
+                )
         
         # Gerar novo access token
         access_token = create_access_token(data={"sub": user_id})
@@ -152,10 +189,10 @@ def refresh_token(req: RefreshTokenRequest):
         )
 
 @router.get("/me")
-def get_current_user_info(current_user = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_current_user_info(current_user = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     try:
-        repo = UserRepository(db)
-        user = repo.get_by_id(current_user)
+        repo = AsyncRepository(db, UserRepository)
+        user = await repo.get_by_id(current_user)
         if not user:
             return error_response(
                 message="Usuário não encontrado",
@@ -178,4 +215,33 @@ def get_current_user_info(current_user = Depends(get_current_user), db: Session
         return error_response(
             message=f"Erro interno: {str(e)}",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/logout")
+async def logout(
+    req: Optional[LogoutRequest] = None,
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Revoga o access token atual e o refresh token informado (ou todos, com all_devices)"""
+    try:
+        req = req or LogoutRequest()
+        user_id = claims.get("sub")
+        tokens = AsyncRepository(db, TokenRepository)
+        jti = claims.get("jti")
+        if jti:
+            expires_at = expiration_of(claims)
+            await tokens.blacklist(jti, expires_at)
+            revoked_tokens.add(jti, expires_at)
+        if req.all_devices:
+            await tokens.revoke_all_refresh_tokens(user_id)
+        elif req.refresh_token:
+            refresh_claims = verify_token(req.refresh_token)
+            if refresh_claims and refresh_claims.get("sub") == user_id and refresh_claims.get("jti"):
+                await tokens.revoke_refresh_token(user_id, refresh_claims["jti"])
+        return success_response(message="Logout realizado com sucesso")
+    except Exception as e:
+        return error_response(
+            message=f"Erro interno: {str(e)}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
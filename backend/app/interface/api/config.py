@@ -1,19 +1,18 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from ...infrastructure.db import get_db
-from ...infrastructure.models import CategoryModel
-from ...infrastructure.models import RelationshipModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...infrastructure.db import get_async_db
 from ...domain.dto.category import CategoryDTO, CategoryCreateDTO, CategoryUpdateDTO
-from ...domain.dto.relationship import RelationshipDTO
 from ...interface.api.dependencies import get_current_user
 from ...infrastructure.repositories.category_repository import CategoryRepository
+from ...infrastructure.repositories.relationship_repository import RelationshipRepository
+from ...infrastructure.repositories.async_repository import AsyncRepository
 
 router = APIRouter(prefix="/config", tags=["Configurações"])
 
 @router.get("/categories")
-def get_categories(db: Session = Depends(get_db), user_id: str = Depends(get_current_user)):
-    repo = CategoryRepository(db)
-    categories = repo.get_all()
+async def get_categories(db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)):
+    repo = AsyncRepository(db, CategoryRepository)
+    categories = await repo.get_all()
     return {
         "success": True,
         "data": {
@@ -22,9 +21,9 @@ def get_categories(db: Session = Depends(get_db), user_id: str = Depends(get_cur
     }
 
 @router.post("/categories")
-def create_category(category_data: CategoryCreateDTO, db: Session = Depends(get_db), user_id: str = Depends(get_current_user)):
-    repo = CategoryRepository(db)
-    category = repo.create(category_data.dict())
+async def create_category(category_data: CategoryCreateDTO, db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)):
+    repo = AsyncRepository(db, CategoryRepository)
+    category = await repo.create(category_data.dict())
     return {
         "success": True,
         "message": "Categoria criada com sucesso",
@@ -32,9 +31,9 @@ def create_category(category_data: CategoryCreateDTO, db: Session = Depends(get_
     }
 
 @router.put("/categories/{category_id}")
-def update_category(category_id: str, update_data: CategoryUpdateDTO, db: Session = Depends(get_db), user_id: str = Depends(get_current_user)):
-    repo = CategoryRepository(db)
-    category = repo.update(category_id, update_data.dict(exclude_unset=True))
+async def update_category(category_id: str, update_data: CategoryUpdateDTO, db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)):
+    repo = AsyncRepository(db, CategoryRepository)
+    category = await repo.update(category_id, update_data.dict(exclude_unset=True))
     if not category:
         return {"success": False, "message": "Categoria não encontrada"}
     return {
@@ -44,19 +43,19 @@ def update_category(category_id: str, update_data: CategoryUpdateDTO, db: Sessio
     }
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: str, db: Session = Depends(get_db), user_id: str = Depends(get_current_user)):
-    repo = CategoryRepository(db)
-    success = repo.delete(category_id)
+async def delete_category(category_id: str, db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)):
+    repo = AsyncRepository(db, CategoryRepository)
+    success = await repo.delete(category_id)
     if not success:
         return {"success": False, "message": "Categoria não encontrada"}
     return {"success": True, "message": "Categoria removida com sucesso"}
 
 @router.get("/relationships")
-def get_relationships(db: Session = Depends(get_db), user_id: str = Depends(get_current_user)):
-    relationships = db.query(RelationshipModel).all()
+async def get_relationships(db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)):
+    relationships = await AsyncRepository(db, RelationshipRepository).get_all()
     return {
         "success": True,
         "data": {
-            "relationships": [RelationshipDTO.model_validate(rel).model_dump(mode='json') for rel in relationships]
+            "relationships": [rel.model_dump(mode='json') for rel in relationships]
         }
     } 
\ No newline at end of file
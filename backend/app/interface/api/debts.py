@@ -1,134 +1,162 @@
 import uuid
 from datetime import date
+from decimal import Decimal
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...infrastructure.db import get_db
+from ...infrastructure.db import get_async_db, SessionLocal
 from ...infrastructure.repositories.people_repository import PeopleRepository
-from ...infrastructure.repositories.debt_repository import DebtRepository
+from ...infrastructure.repositories.debt_repository import DebtRepository, EXPORT_COLUMNS as DEBT_EXPORT_COLUMNS
 from ...infrastructure.repositories.relationship_repository import RelationshipRepository
+from ...infrastructure.repositories.async_repository import AsyncRepository
 from ...usecases.debt_usecases import DebtUseCases
 from ...domain.dto.people import PeopleCreateDTO, PeopleUpdateDTO
-from ...domain.dto.debt import DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO, DebtDTO
-from ...interface.api.dependencies import get_current_user_data
-from ...domain.dto.user import UserDTO
+from ...domain.dto.debt import (
+    DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO, DebtPaymentCreateDTO, DebtDTO,
+    DebtSelectionDTO, DebtBulkChangesDTO, DebtBulkUpdateDTO,
+)
+from ...interface.api.dependencies import get_current_principal, PeriodQuery
+from ...infrastructure.period import Period
+from ...infrastructure.summary_cache import summary_cache, DEBTS
+from ...infrastructure.versioning import StaleWriteError
+from ...domain.dto.user import PrincipalDTO
 from .utils import error_response, success_response
+from .streaming import export_response
 
 router = APIRouter(prefix="/debts", tags=["Dívidas"])
 
-def get_debt_usecases(db: Session = Depends(get_db)) -> DebtUseCases:
+def build_debt_usecases(db: Session) -> DebtUseCases:
     people_repo = PeopleRepository(db)
     debt_repo = DebtRepository(db)
     relationship_repo = RelationshipRepository(db)
     return DebtUseCases(people_repo, debt_repo, relationship_repo)
 
+async def get_debt_usecases(db: AsyncSession = Depends(get_async_db)) -> AsyncRepository[DebtUseCases]:
+    return AsyncRepository(db, build_debt_usecases)
+
 # Endpoints para Pessoas
 
 @router.get("/people")
-def list_people(
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+async def list_people(
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        people = usecases.get_all_people(current_user.id)
-        return success_response(data={"people": [person.model_dump(mode='json') for person in people]})
+        people = await usecases.get_all_people(current_user.id)
+        return success_response(data={"people": people})
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.post("/people")
-def create_person(
+async def create_person(
     person_data: PeopleCreateDTO,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        person = usecases.create_person(current_user.id, person_data)
-        return success_response(message="Pessoa criada com sucesso", data={"person": person.model_dump(mode='json')})
+        person = await usecases.create_person(current_user.id, person_data)
+        return success_response(message="Pessoa criada com sucesso", data={"person": person})
     except ValueError as e:
         return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.get("/people/{person_id}")
-def get_person(
+async def get_person(
     person_id: str,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        person = usecases.get_person_by_id(uuid.UUID(person_id), current_user.id)
+        person = await usecases.get_person_by_id(uuid.UUID(person_id), current_user.id)
         if not person:
             return error_response(message="Pessoa não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(data={"person": person.model_dump(mode='json')})
+        return success_response(data={"person": person})
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.put("/people/{person_id}")
-def update_person(
+async def update_person(
     person_id: str,
     person_data: PeopleUpdateDTO,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        person = usecases.update_person(uuid.UUID(person_id), current_user.id, person_data)
+        person = await usecases.update_person(uuid.UUID(person_id), current_user.id, person_data)
         if not person:
             return error_response(message="Pessoa não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Pessoa atualizada com sucesso", data={"person": person.model_dump(mode='json')})
+        return success_response(message="Pessoa atualizada com sucesso", data={"person": person})
     except ValueError as e:
         return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.delete("/people/{person_id}")
-def delete_person(
+async def delete_person(
     person_id: str,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        success = usecases.delete_person(uuid.UUID(person_id), current_user.id)
+        success = await usecases.delete_person(uuid.UUID(person_id), current_user.id)
         if not success:
             return error_response(message="Pessoa não encontrada", status_code=status.HTTP_404_NOT_FOUND)
         return success_response(message="Pessoa deletada com sucesso")
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@router.post("/people/{person_id}/settle")
+async def settle_person_debts(
+    person_id: str,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        try:
+            person_uuid = uuid.UUID(person_id)
+        except ValueError:
+            return error_response(message="ID da pessoa inválido", status_code=status.HTTP_400_BAD_REQUEST)
+        settlement = await usecases.settle_person_debts(person_uuid, current_user.id)
+        if settlement is None:
+            return error_response(message="Pessoa não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(message="Dívidas quitadas com sucesso", data={"settlement": settlement})
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 # Endpoints para Dívidas
 
 @router.get("/")
-def list_debts(
-    month: Optional[str] = Query(None, description="Mês no formato YYYY-MM"),
+async def list_debts(
+    periods: PeriodQuery = Depends(),
     person_id: Optional[str] = Query(None, description="ID da pessoa"),
-    status: Optional[str] = Query(None, description="Status da dívida (pending, partial, paid)"),
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    debt_status: Optional[str] = Query(None, alias="status", description="Status da dívida (pending, partial, paid)"),
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        month_date = None
-        if month:
-            try:
-                year, month_num = month.split("-")
-                month_date = date(int(year), int(month_num), 1)
-            except ValueError:
-                return error_response(message="Formato de mês inválido. Use YYYY-MM", status_code=status.HTTP_400_BAD_REQUEST)
+        try:
+            period = periods.resolve()
+        except ValueError as e:
+            return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
         person_uuid = None
         if person_id:
             try:
                 person_uuid = uuid.UUID(person_id)
             except ValueError:
                 return error_response(message="ID da pessoa inválido", status_code=status.HTTP_400_BAD_REQUEST)
-        debts = usecases.get_all_debts(current_user.id, month_date, person_uuid, status)
-        return success_response(data={"debts": [DebtDTO.model_validate(debt, from_attributes=True).model_dump(mode="json") for debt in debts]})
+        debts = await usecases.get_all_debts(current_user.id, period, person_uuid, debt_status)
+        return success_response(data={"debts": debts})
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.post("/")
-def create_debt(
+async def create_debt(
     debt_data: DebtCreateDTO,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
         if debt_data.amount <= 0:
@@ -142,33 +170,205 @@ def create_debt(
                 return error_response(message="A data de vencimento não pode ser anterior à data da dívida.", status_code=status.HTTP_400_BAD_REQUEST)
         if debt_data.date > date.today():
             return error_response(message="A data da dívida não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
-        debt = usecases.create_debt(current_user.id, debt_data)
-        return success_response(message="Dívida criada com sucesso", data=DebtDTO.model_validate(debt, from_attributes=True).model_dump(mode="json"))
+        debt = await usecases.create_debt(current_user.id, debt_data)
+        return success_response(message="Dívida criada com sucesso", data=debt)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.get("/export")
+async def export_debts(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv ou ndjson"),
+    periods: PeriodQuery = Depends(),
+    person_id: Optional[str] = Query(None, description="ID da pessoa"),
+    status: Optional[str] = Query(None, description="Status da dívida (pending, partial, paid)"),
+    current_user: PrincipalDTO = Depends(get_current_principal)
+):
+    try:
+        period = periods.resolve()
+    except ValueError as e:
+        return error_response(message=str(e), status_code=400)
+    person_uuid = None
+    if person_id:
+        try:
+            person_uuid = uuid.UUID(person_id)
+        except ValueError:
+            return error_response(message="ID da pessoa inválido", status_code=400)
+    user_id = current_user.id
+
+    def rows():
+        db = SessionLocal()
+        try:
+            yield from DebtRepository(db).stream(user_id, period, person_uuid, status)
+        finally:
+            db.close()
+
+    return export_response(rows, DEBT_EXPORT_COLUMNS, format, "dividas")
+
+@router.post("/bulk/update")
+async def bulk_update_debts(
+    data: DebtBulkUpdateDTO,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        updated = await usecases.bulk_update_debts(current_user.id, data, data.changes)
+        return success_response(message=f"{updated} dívida(s) atualizada(s)", data={"updated": updated})
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.post("/bulk/delete")
+async def bulk_delete_debts(
+    selection: DebtSelectionDTO,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        deleted = await usecases.bulk_delete_debts(current_user.id, selection)
+        return success_response(message=f"{deleted} dívida(s) deletada(s)", data={"deleted": deleted})
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.patch("/installments/{group_id}")
+async def update_debt_installments(
+    group_id: str,
+    changes: DebtBulkChangesDTO,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        try:
+            selection = DebtSelectionDTO(installment_group_id=group_id)
+        except ValueError:
+            return error_response(message="ID do parcelamento inválido", status_code=status.HTTP_400_BAD_REQUEST)
+        updated = await usecases.bulk_update_debts(current_user.id, selection, changes)
+        if not updated:
+            return error_response(message="Parcelamento não encontrado", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(message="Parcelamento atualizado com sucesso", data={"updated": updated})
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.delete("/installments/{group_id}")
+async def delete_debt_installments(
+    group_id: str,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        try:
+            selection = DebtSelectionDTO(installment_group_id=group_id)
+        except ValueError:
+            return error_response(message="ID do parcelamento inválido", status_code=status.HTTP_400_BAD_REQUEST)
+        deleted = await usecases.bulk_delete_debts(current_user.id, selection)
+        if not deleted:
+            return error_response(message="Parcelamento não encontrado", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(message="Parcelamento deletado com sucesso", data={"deleted": deleted})
     except ValueError as e:
         return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@router.get("/summary")
+async def get_debts_summary(
+    month: str = Query(..., description="YYYY-MM (também aceita YYYY-Qn ou YYYY)"),
+    include_debts: bool = Query(False, description="Inclui as dívidas de cada pessoa e a lista de parceladas"),
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        try:
+            period = Period.parse(month)
+        except ValueError as e:
+            return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        
+        # Só o resumo sem as listas de dívidas vai para o cache
+        cache_key = None if include_debts else summary_cache.key(current_user.id, DEBTS, period.months())
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            return success_response(data=cached)
+        
+        # Totais por pessoa agregados no banco (Decimal exato)
+        people = await usecases.get_debts_summary_by_person(current_user.id, period)
+        
+        totals = {"total": Decimal(0), "paid": Decimal(0), "pending": Decimal(0)}
+        installments_count = 0
+        by_person = {}
+        for person in people:
+            entry = by_person.setdefault(person.person_name, {"total": Decimal(0), "paid": Decimal(0), "pending": Decimal(0)})
+            for key in totals:
+                entry[key] += getattr(person, key)
+                totals[key] += getattr(person, key)
+            installments_count += person.installments_count
+        
+        # Os valores só viram float na borda, para manter números no JSON
+        debts_by_person = {
+            name: {key: float(value) for key, value in entry.items()}
+            for name, entry in by_person.items()
+        }
+        data = {
+            "summary": {
+                "totalDebts": float(totals["total"]),
+                "totalPaid": float(totals["paid"]),
+                "totalPending": float(totals["pending"]),
+                "installmentsCount": installments_count
+            },
+            "debtsByPerson": debts_by_person
+        }
+        
+        # Listas de dívidas só quando pedidas
+        if include_debts:
+            debts = await usecases.get_all_debts(current_user.id, period, None, None)
+            for entry in debts_by_person.values():
+                entry["debts"] = []
+            installments = []
+            for debt in debts:
+                debts_by_person[debt.person.name]["debts"].append(debt)
+                if debt.total_installments and debt.total_installments > 1:
+                    installments.append({
+                        "id": debt.id,
+                        "description": debt.description,
+                        "amount": float(debt.amount),
+                        "totalAmount": float(debt.amount * debt.total_installments),
+                        "currentInstallment": debt.installments,
+                        "totalInstallments": debt.total_installments,
+                        "dueDate": debt.due_date.isoformat() if debt.due_date else None,
+                        "person": debt.person.name,
+                        "status": debt.status
+                    })
+            data["installments"] = installments
+        
+        summary_cache.set(cache_key, data)
+        return success_response(data=data)
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @router.get("/{debt_id}")
-def get_debt(
+async def get_debt(
     debt_id: str,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        debt = usecases.get_debt_by_id(uuid.UUID(debt_id), current_user.id)
+        debt = await usecases.get_debt_by_id(uuid.UUID(debt_id), current_user.id)
         if not debt:
             return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(data={"debt": debt.model_dump(mode='json')})
+        return success_response(data={"debt": debt})
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.put("/{debt_id}")
-def update_debt(
+async def update_debt(
     debt_id: str,
     debt_data: DebtUpdateDTO,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
         update_data = debt_data.model_dump(exclude_unset=True)
@@ -183,106 +383,77 @@ def update_debt(
                 return error_response(message="A data de vencimento não pode ser anterior à data da dívida.", status_code=status.HTTP_400_BAD_REQUEST)
         if 'date' in update_data and update_data['date'] > date.today():
             return error_response(message="A data da dívida não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
-        debt = usecases.update_debt(uuid.UUID(debt_id), current_user.id, debt_data)
+        debt = await usecases.update_debt(uuid.UUID(debt_id), current_user.id, debt_data)
         if not debt:
             return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Dívida atualizada com sucesso", data=DebtDTO.model_validate(debt, from_attributes=True).model_dump(mode="json"))
+        return success_response(message="Dívida atualizada com sucesso", data=debt)
+    except StaleWriteError as e:
+        return error_response(message=str(e), errors={"version": [e.current_version]}, status_code=status.HTTP_409_CONFLICT)
     except ValueError as e:
         return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @router.patch("/{debt_id}/payment")
-def update_debt_payment(
+async def update_debt_payment(
     debt_id: str,
     payment_data: DebtPaymentDTO,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        debt = usecases.update_debt_payment(uuid.UUID(debt_id), current_user.id, payment_data)
+        debt = await usecases.update_debt_payment(uuid.UUID(debt_id), current_user.id, payment_data)
         if not debt:
             return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Pagamento atualizado com sucesso", data={"debt": debt.model_dump(mode='json')})
+        return success_response(message="Pagamento atualizado com sucesso", data={"debt": debt})
+    except StaleWriteError as e:
+        return error_response(message=str(e), errors={"version": [e.current_version]}, status_code=status.HTTP_409_CONFLICT)
     except ValueError as e:
         return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@router.delete("/{debt_id}")
-def delete_debt(
+@router.get("/{debt_id}/payments")
+async def list_debt_payments(
     debt_id: str,
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        success = usecases.delete_debt(uuid.UUID(debt_id), current_user.id)
-        if not success:
+        payments = await usecases.get_debt_payments(uuid.UUID(debt_id), current_user.id)
+        if payments is None:
             return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Dívida deletada com sucesso")
+        return success_response(data={"payments": payments})
     except Exception as e:
         return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@router.get("/summary")
-def get_debts_summary(
-    month: str = Query(..., description="YYYY-MM"),
-    current_user: UserDTO = Depends(get_current_user_data),
-    usecases: DebtUseCases = Depends(get_debt_usecases)
+@router.post("/{debt_id}/payments")
+async def add_debt_payment(
+    debt_id: str,
+    payment_data: DebtPaymentCreateDTO,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
 ):
     try:
-        year, month_num = map(int, month.split('-'))
-        month_date = date(year, month_num, 1)
-        
-        # Buscar dívidas do mês
-        debts = usecases.get_all_debts(current_user.id, month_date, None, None)
-        
-        # Calcular totais
-        total_debts = sum(float(debt.amount) for debt in debts)
-        total_paid = sum(float(debt.paid_amount) for debt in debts)
-        total_pending = total_debts - total_paid
-        
-        # Agrupar por pessoa
-        debts_by_person = {}
-        for debt in debts:
-            person_name = debt.person.name
-            if person_name not in debts_by_person:
-                debts_by_person[person_name] = {
-                    "total": 0.0,
-                    "paid": 0.0,
-                    "pending": 0.0,
-                    "debts": []
-                }
-            debts_by_person[person_name]["total"] += float(debt.amount)
-            debts_by_person[person_name]["paid"] += float(debt.paid_amount)
-            debts_by_person[person_name]["pending"] += float(debt.amount) - float(debt.paid_amount)
-            debts_by_person[person_name]["debts"].append(debt.model_dump(mode='json'))
-        
-        # Dívidas parceladas
-        installments = [debt for debt in debts if debt.total_installments and debt.total_installments > 1]
-        installments_out = [
-            {
-                "id": str(debt.id),
-                "description": debt.description,
-                "amount": float(debt.amount),
-                "totalAmount": float(debt.amount) * (debt.total_installments or 1),
-                "currentInstallment": debt.installments,
-                "totalInstallments": debt.total_installments,
-                "dueDate": debt.due_date.isoformat() if debt.due_date else None,
-                "person": debt.person.name,
-                "status": debt.status
-            }
-            for debt in installments
-        ]
-        
-        return success_response(data={
-            "summary": {
-                "totalDebts": total_debts,
-                "totalPaid": total_paid,
-                "totalPending": total_pending,
-                "installmentsCount": len(installments)
-            },
-            "debtsByPerson": debts_by_person,
-            "installments": installments_out
-        })
+        debt = await usecases.add_debt_payment(uuid.UUID(debt_id), current_user.id, payment_data)
+        if not debt:
+            return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(message="Pagamento registrado com sucesso", data={"debt": debt})
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR) 
\ No newline at end of file
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.delete("/{debt_id}")
+async def delete_debt(
+    debt_id: str,
+    current_user: PrincipalDTO = Depends(get_current_principal),
+    usecases: AsyncRepository[DebtUseCases] = Depends(get_debt_usecases)
+):
+    try:
+        success = await usecases.delete_debt(uuid.UUID(debt_id), current_user.id)
+        if not success:
+            return error_response(message="Dívida não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+        return success_response(message="Dívida deletada com sucesso")
+    except Exception as e:
+        return error_response(message="Erro interno do servidor", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,10 +1,22 @@
-from fastapi import Depends, HTTPException, status, Header
-from app.infrastructure.jwt_utils import verify_token
-from app.infrastructure.db import SessionLocal
-from app.infrastructure.repositories import UserRepository
-from typing import Optional
+from fastapi import Depends, HTTPException, status, Header, Query
+from app.infrastructure.jwt_utils import verify_token_cached
+from app.infrastructure.token_revocation import revoked_tokens
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.db import get_db, get_async_db
+from app.infrastructure.repositories import UserRepository, AsyncRepository
+from app.infrastructure.config import AUTH_USER_CACHE_TTL, AUTH_USER_CACHE_SIZE
+from app.infrastructure.ttl_cache import TTLCache
+from app.infrastructure.period import Period, resolve_period
+from app.domain.dto.user import PrincipalDTO
+from typing import Any, Dict, Optional
+from datetime import date
 
-def get_current_user(authorization: Optional[str] = Header(None)):
+# user_id -> o usuário existe; resultados negativos também ficam em cache
+user_exists_cache = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL)
+
+def decode_authorization(authorization: Optional[str]) -> Dict[str, Any]:
+    """Valida o header Authorization e retorna os claims do token (sem I/O)"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -13,7 +25,7 @@ def get_current_user(authorization: Optional[str] = Header(None)):
         )
     
     token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
+    payload = verify_token_cached(token)
     
     if not payload:
         raise HTTPException(
@@ -21,7 +33,21 @@ def get_current_user(authorization: Optional[str] = Header(None)):
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    if payload.get("jti") in revoked_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revogado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+async def get_token_claims(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+    return decode_authorization(authorization)
+
+async def get_current_user(authorization: Optional[str] = Header(None)):
+    # async def sem I/O: roda direto no event loop, sem passar pelo threadpool
+    payload = decode_authorization(authorization)
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(
@@ -32,24 +58,55 @@ def get_current_user(authorization: Optional[str] = Header(None)):
     
     return user_id
 
-def get_current_user_data(user_id: str = Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        repo = UserRepository(db)
-        user = repo.get_by_id(user_id)
-        if not user:
+def get_current_user_data(user_id: str = Depends(get_current_user), db: Session = Depends(get_db)):
+    # Usa a mesma sessão (e conexão) da requisição: get_db é resolvido uma única vez por requisição
+    repo = UserRepository(db)
+    user = repo.get_by_id(user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário não encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+async def get_current_principal(user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)) -> PrincipalDTO:
+    """Usuário autenticado a partir do JWT, sem SELECT em users a cada requisição.
+
+    Com AUTH_USER_CACHE_TTL > 0 a existência do usuário é confirmada no banco no
+    máximo uma vez por TTL; a sessão só pega uma conexão do pool nesse caso.
+    """
+    if AUTH_USER_CACHE_TTL > 0:
+        exists = user_exists_cache.get(user_id)
+        if exists is None:
+            exists = await AsyncRepository(db, UserRepository).exists(user_id)
+            user_exists_cache.set(user_id, exists)
+        if not exists:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuário não encontrado",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return user
-    finally:
-        db.close()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+    return PrincipalDTO(id=user_id)
+
+class PeriodQuery:
+    """Parâmetros de período comuns às listagens e exportações.
+
+    resolve() lança ValueError com a mensagem para o cliente, para o handler
+    responder 400 no envelope padrão.
+    """
+
+    def __init__(
+        self,
+        month: Optional[str] = Query(None, description="YYYY-MM"),
+        period: Optional[str] = Query(None, description="YYYY-MM, YYYY-Qn ou YYYY"),
+        date_from: Optional[date] = Query(None, alias="from", description="Data inicial (inclusiva)"),
+        date_to: Optional[date] = Query(None, alias="to", description="Data final (inclusiva)"),
+    ):
+        self.month = month
+        self.period = period
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def resolve(self) -> Optional[Period]:
+        return resolve_period(self.month, self.period, self.date_from, self.date_to)
@@ -1,233 +1,424 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from app.interface.api.dependencies import get_current_user
-from app.infrastructure.db import SessionLocal
-from app.infrastructure.repositories import TransactionRepository
-from app.infrastructure.models import CategoryModel, TransactionModel
-from app.domain.dto.transaction import TransactionCreateDTO, TransactionUpdateDTO, TransactionDTO
+from fastapi import APIRouter, Depends, status, Query, UploadFile, File, Form
+from app.interface.api.dependencies import get_current_user, PeriodQuery
+from app.infrastructure.db import SessionLocal, get_db, get_async_db
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.repositories import TransactionRepository, RecurringRuleRepository, AsyncRepository
+from app.infrastructure.repositories.transaction_repository import EXPORT_COLUMNS as TRANSACTION_EXPORT_COLUMNS
+from app.domain.dto.transaction import (
+    TransactionCreateDTO, TransactionUpdateDTO, TransactionDTO, TransactionPageDTO, TransactionPaginationDTO, TransactionPageResponseDTO,
+    TransactionSelectionDTO, TransactionBulkChangesDTO, TransactionBulkUpdateDTO,
+    RecurringRuleDTO, RecurringRuleCreateDTO, RecurringRuleUpdateDTO, OccurrenceMaterializeDTO,
+)
 from app.interface.api.utils import success_response, error_response
+from app.interface.api.streaming import export_response
+from app.infrastructure.period import Period
+from app.infrastructure.summary_cache import summary_cache, FINANCE, PENDING
+from app.infrastructure.versioning import StaleWriteError
 from typing import List, Optional
-from uuid import uuid4
+from uuid import UUID
 from datetime import date as date_cls
-from sqlalchemy import func, and_, or_, extract
 from app.usecases.goal_usecases import GoalUseCases
+from app.usecases.transaction_import_usecases import TransactionImportUseCases, ImportDecodeError
 from app.domain.dto.goal import GoalCreateDTO, GoalUpdateDTO
-from app.interface.api.dependencies import get_db
 from app.infrastructure.repositories.payment_method_repository import PaymentMethodRepository
+from app.infrastructure.repositories.category_repository import CategoryRepository
 from app.domain.dto.payment_method import PaymentMethodDTO, PaymentMethodCreateDTO, PaymentMethodUpdateDTO
 
 router = APIRouter(prefix="/finance/transactions", tags=["Finanças"])
 
-@router.get("/", response_model=List[TransactionDTO])
-def list_transactions(
-    month: Optional[str] = Query(None, description="YYYY-MM"),
+@router.get("/", response_model=TransactionPageResponseDTO)
+async def list_transactions(
+    periods: PeriodQuery = Depends(),
     type: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
-    authorization: str = Depends(get_current_user)
+    limit: int = Query(100, ge=1, le=500, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em pagination.nextCursor"),
+    include_total: bool = Query(False, description="Calcula o total de itens (consulta COUNT extra)"),
+    authorization: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db = SessionLocal()
+    repo = AsyncRepository(db, TransactionRepository)
     try:
-        repo = TransactionRepository(db)
-        transactions, total = repo.list(authorization, month, type, category)
-        data = [TransactionDTO.model_validate(t, from_attributes=True).model_dump(mode="json") for t in transactions]
-        return success_response(data=data, message="Transações listadas com sucesso")
-    finally:
-        db.close()
+        transactions, next_cursor, total = await repo.list_page(
+            authorization, periods.resolve(), type, category, limit=limit, cursor=cursor, with_total=include_total
+        )
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    data = TransactionPageDTO(
+        transactions=transactions,
+        pagination=TransactionPaginationDTO(limit=limit, next_cursor=next_cursor, total=total),
+    )
+    return success_response(data=data, message="Transações listadas com sucesso")
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv ou ndjson"),
+    periods: PeriodQuery = Depends(),
+    type: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    user_id: str = Depends(get_current_user)
+):
+    try:
+        period = periods.resolve()
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
+    # Gerador síncrono: o StreamingResponse o consome no threadpool com o engine síncrono
+    def rows():
+        db = SessionLocal()
+        try:
+            yield from TransactionRepository(db).stream(user_id, period, type, category)
+        finally:
+            db.close()
+
+    return export_response(rows, TRANSACTION_EXPORT_COLUMNS, format, "transacoes")
 
 @router.post("/", response_model=TransactionDTO, status_code=201)
-def create_transaction(
+async def create_transaction(
     data: TransactionCreateDTO,
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db = SessionLocal()
+    if data.amount <= 0:
+        return error_response(message="O valor da transação deve ser positivo.", status_code=status.HTTP_400_BAD_REQUEST)
+    if data.type not in ("income", "expense"):
+        return error_response(message="Tipo de transação inválido.", status_code=status.HTTP_400_BAD_REQUEST)
+    category = await AsyncRepository(db, CategoryRepository).get_by_id(data.category)
+    if not category:
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    if data.total_installments is not None:
+        if data.total_installments < 1:
+            return error_response(message="O número total de parcelas deve ser maior ou igual a 1.", status_code=status.HTTP_400_BAD_REQUEST)
+        if data.installments is not None and data.installments > data.total_installments:
+            return error_response(message="A parcela atual não pode ser maior que o total de parcelas.", status_code=status.HTTP_400_BAD_REQUEST)
+        if data.due_date and data.due_date < data.date:
+            return error_response(message="A data de vencimento não pode ser anterior à data da transação.", status_code=status.HTTP_400_BAD_REQUEST)
+    if data.date > date_cls.today():
+        return error_response(message="A data da transação não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
+    repo = AsyncRepository(db, TransactionRepository)
+    # Corrigido: passar o objeto data diretamente, sem converter para dict
+    transaction = await repo.create(user_id, data)
+    return success_response(data=transaction, message="Transação criada com sucesso")
+
+# Continua síncrono: o parsing do arquivo é CPU e bloquearia o event loop
+@router.post("/import")
+def import_transactions(
+    file: UploadFile = File(..., description="Extrato CSV ou OFX"),
+    format: Optional[str] = Form(None, description="csv ou ofx; por padrão usa a extensão do arquivo"),
+    encoding: str = Form("utf-8-sig"),
+    category: Optional[str] = Form(None, description="Categoria padrão para linhas sem categoria"),
+    payment_method: Optional[str] = Form(None, description="Forma de pagamento padrão (id ou nome)"),
+    user_id: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    file_format = (format or (file.filename or "").rsplit(".", 1)[-1]).lower()
+    if file_format not in ("csv", "ofx"):
+        return error_response(message="Formato de arquivo não suportado. Use CSV ou OFX.", status_code=status.HTTP_400_BAD_REQUEST)
+    usecases = TransactionImportUseCases(db)
     try:
-        if data.amount <= 0:
-            return error_response(message="O valor da transação deve ser positivo.", status_code=status.HTTP_400_BAD_REQUEST)
-        if data.type not in ("income", "expense"):
-            return error_response(message="Tipo de transação inválido.", status_code=status.HTTP_400_BAD_REQUEST)
-        category = db.query(CategoryModel).filter(CategoryModel.id == data.category).first()
-        if not category:
-            return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
-        if data.total_installments is not None:
-            if data.total_installments < 1:
-                return error_response(message="O número total de parcelas deve ser maior ou igual a 1.", status_code=status.HTTP_400_BAD_REQUEST)
-            if data.installments is not None and data.installments > data.total_installments:
-                return error_response(message="A parcela atual não pode ser maior que o total de parcelas.", status_code=status.HTTP_400_BAD_REQUEST)
-            if data.due_date and data.due_date < data.date:
-                return error_response(message="A data de vencimento não pode ser anterior à data da transação.", status_code=status.HTTP_400_BAD_REQUEST)
-        if data.date > date_cls.today():
-            return error_response(message="A data da transação não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
-        repo = TransactionRepository(db)
-        # Corrigido: passar o objeto data diretamente, sem converter para dict
-        transaction = repo.create(user_id, data)
-        return success_response(data=TransactionDTO.model_validate(transaction, from_attributes=True).model_dump(mode="json"), message="Transação criada com sucesso")
-    finally:
-        db.close()
+        result = usecases.import_file(user_id, file.file, file_format, encoding, category, payment_method)
+    except LookupError:
+        return error_response(message="Codificação de arquivo inválida.", status_code=status.HTTP_400_BAD_REQUEST)
+    except ImportDecodeError as e:
+        return error_response(message=str(e), errors={"line": [e.line]}, status_code=status.HTTP_400_BAD_REQUEST)
+    return success_response(data=result, message="Importação concluída")
+
+async def _category_exists(db: AsyncSession, category: Optional[str]) -> bool:
+    return not category or bool(await AsyncRepository(db, CategoryRepository).get_by_id(category))
+
+def _installment_group(group_id: str) -> Optional[TransactionSelectionDTO]:
+    try:
+        return TransactionSelectionDTO(installment_group_id=group_id)
+    except ValueError:
+        return None
+
+@router.post("/bulk/update")
+async def bulk_update_transactions(
+    data: TransactionBulkUpdateDTO,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not await _category_exists(db, data.changes.category):
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    try:
+        updated = await AsyncRepository(db, TransactionRepository).bulk_update(user_id, data, data.changes)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    return success_response(data={"updated": updated}, message=f"{updated} transação(ões) atualizada(s)")
+
+@router.post("/bulk/delete")
+async def bulk_delete_transactions(
+    selection: TransactionSelectionDTO,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        deleted = await AsyncRepository(db, TransactionRepository).bulk_delete(user_id, selection)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    return success_response(data={"deleted": deleted}, message=f"{deleted} transação(ões) deletada(s)")
+
+@router.patch("/installments/{group_id}")
+async def update_installment_plan(
+    group_id: str,
+    changes: TransactionBulkChangesDTO,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    selection = _installment_group(group_id)
+    if selection is None:
+        return error_response(message="ID do parcelamento inválido", status_code=status.HTTP_400_BAD_REQUEST)
+    if not await _category_exists(db, changes.category):
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    updated = await AsyncRepository(db, TransactionRepository).bulk_update(user_id, selection, changes)
+    if not updated:
+        return error_response(message="Parcelamento não encontrado", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data={"updated": updated}, message="Parcelamento atualizado com sucesso")
+
+@router.delete("/installments/{group_id}")
+async def delete_installment_plan(
+    group_id: str,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    selection = _installment_group(group_id)
+    if selection is None:
+        return error_response(message="ID do parcelamento inválido", status_code=status.HTTP_400_BAD_REQUEST)
+    deleted = await AsyncRepository(db, TransactionRepository).bulk_delete(user_id, selection)
+    if not deleted:
+        return error_response(message="Parcelamento não encontrado", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data={"deleted": deleted}, message="Parcelamento deletado com sucesso")
 
 @router.put("/{transaction_id}", response_model=TransactionDTO)
-def update_transaction(
+async def update_transaction(
     transaction_id: str,
     data: TransactionUpdateDTO,
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db = SessionLocal()
+    update_data = {k: v for k, v in data.dict().items() if v is not None}
+    if 'amount' in update_data and update_data['amount'] <= 0:
+        return error_response(message="O valor da transação deve ser positivo.", status_code=status.HTTP_400_BAD_REQUEST)
+    if 'type' in update_data and update_data['type'] not in ("income", "expense"):
+        return error_response(message="Tipo de transação inválido.", status_code=status.HTTP_400_BAD_REQUEST)
+    if 'category' in update_data:
+        category = await AsyncRepository(db, CategoryRepository).get_by_id(update_data['category'])
+        if not category:
+            return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    if 'total_installments' in update_data:
+        if update_data['total_installments'] < 1:
+            return error_response(message="O número total de parcelas deve ser maior ou igual a 1.", status_code=status.HTTP_400_BAD_REQUEST)
+        if 'installments' in update_data and update_data['installments'] > update_data['total_installments']:
+            return error_response(message="A parcela atual não pode ser maior que o total de parcelas.", status_code=status.HTTP_400_BAD_REQUEST)
+        if 'due_date' in update_data and 'date' in update_data and update_data['due_date'] < update_data['date']:
+            return error_response(message="A data de vencimento não pode ser anterior à data da transação.", status_code=status.HTTP_400_BAD_REQUEST)
+    if 'date' in update_data and update_data['date'] > date_cls.today():
+        return error_response(message="A data da transação não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
+    repo = AsyncRepository(db, TransactionRepository)
     try:
-        update_data = {k: v for k, v in data.dict().items() if v is not None}
-        if 'amount' in update_data and update_data['amount'] <= 0:
-            return error_response(message="O valor da transação deve ser positivo.", status_code=status.HTTP_400_BAD_REQUEST)
-        if 'type' in update_data and update_data['type'] not in ("income", "expense"):
-            return error_response(message="Tipo de transação inválido.", status_code=status.HTTP_400_BAD_REQUEST)
-        if 'category' in update_data:
-            category = db.query(CategoryModel).filter(CategoryModel.id == update_data['category']).first()
-            if not category:
-                return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
-        if 'total_installments' in update_data:
-            if update_data['total_installments'] < 1:
-                return error_response(message="O número total de parcelas deve ser maior ou igual a 1.", status_code=status.HTTP_400_BAD_REQUEST)
-            if 'installments' in update_data and update_data['installments'] > update_data['total_installments']:
-                return error_response(message="A parcela atual não pode ser maior que o total de parcelas.", status_code=status.HTTP_400_BAD_REQUEST)
-            if 'due_date' in update_data and 'date' in update_data and update_data['due_date'] < update_data['date']:
-                return error_response(message="A data de vencimento não pode ser anterior à data da transação.", status_code=status.HTTP_400_BAD_REQUEST)
-        if 'date' in update_data and update_data['date'] > date_cls.today():
-            return error_response(message="A data da transação não pode ser no futuro.", status_code=status.HTTP_400_BAD_REQUEST)
-        repo = TransactionRepository(db)
-        transaction = repo.update(user_id, transaction_id, update_data)
-        if not transaction:
-            return error_response(message="Transação não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(data=TransactionDTO.model_validate(transaction, from_attributes=True).model_dump(mode="json"), message="Transação atualizada com sucesso")
-    finally:
-        db.close()
+        transaction = await repo.update(user_id, transaction_id, update_data)
+    except StaleWriteError as e:
+        return error_response(message=str(e), errors={"version": [e.current_version]}, status_code=status.HTTP_409_CONFLICT)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    if not transaction:
+        return error_response(message="Transação não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data=transaction, message="Transação atualizada com sucesso")
 
 @router.delete("/{transaction_id}")
-def delete_transaction(
+async def delete_transaction(
     transaction_id: str,
-    user_id: str = Depends(get_current_user)
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db = SessionLocal()
+    repo = AsyncRepository(db, TransactionRepository)
     try:
-        repo = TransactionRepository(db)
-        success = repo.delete(user_id, transaction_id)
-        if not success:
-            return error_response(message="Transação não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Transação deletada com sucesso")
-    finally:
-        db.close()
+        success = await repo.delete(user_id, transaction_id)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    if not success:
+        return error_response(message="Transação não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(message="Transação deletada com sucesso")
 
 @router.get("/summary")
-def get_finance_summary(
-    month: str = Query(..., description="YYYY-MM"),
-    user_id: str = Depends(get_current_user)
+async def get_finance_summary(
+    month: str = Query(..., description="YYYY-MM (também aceita YYYY-Qn ou YYYY)"),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db = SessionLocal()
+    repo = AsyncRepository(db, TransactionRepository)
     try:
-        repo = TransactionRepository(db)
-        year, month_num = map(int, month.split('-'))
-        total_income = db.query(func.coalesce(func.sum(TransactionModel.amount), 0)).filter(
-            TransactionModel.user_id == user_id,
-            TransactionModel.type == "income",
-            extract('year', TransactionModel.date) == year,
-            extract('month', TransactionModel.date) == month_num
-        ).scalar()
-        total_expenses = db.query(func.coalesce(func.sum(TransactionModel.amount), 0)).filter(
-            TransactionModel.user_id == user_id,
-            TransactionModel.type == "expense",
-            extract('year', TransactionModel.date) == year,
-            extract('month', TransactionModel.date) == month_num
-        ).scalar()
-        balance = total_income - total_expenses
-        expenses_by_category = dict(
-            db.query(TransactionModel.category, func.coalesce(func.sum(TransactionModel.amount), 0))
-            .filter(TransactionModel.user_id == user_id, TransactionModel.type == "expense",
-                    extract('year', TransactionModel.date) == year,
-                    extract('month', TransactionModel.date) == month_num)
-            .group_by(TransactionModel.category)
-            .all()
-        )
-        today = date_cls.today()
-        pending_installments = db.query(func.coalesce(func.sum(TransactionModel.amount), 0)).filter(
-            TransactionModel.user_id == user_id,
-            TransactionModel.due_date != None,
-            TransactionModel.due_date >= today,
-            TransactionModel.type == "expense"
-        ).scalar()
-        recurring_expenses = db.query(func.coalesce(func.sum(TransactionModel.amount), 0)).filter(
-            TransactionModel.user_id == user_id,
-            TransactionModel.is_recurring == True,
-            TransactionModel.type == "expense",
-            extract('year', TransactionModel.date) == year,
-            extract('month', TransactionModel.date) == month_num
-        ).scalar()
-        projected_balance = balance - (pending_installments or 0)
-        installments = db.query(TransactionModel).filter(
-            TransactionModel.user_id == user_id,
-            TransactionModel.total_installments != None,
-            extract('year', TransactionModel.date) == year,
-            extract('month', TransactionModel.date) == month_num
-        ).all()
-        installments_out = [
-            {
-                "id": str(t.id),
-                "description": t.description,
-                "amount": float(t.amount),
-                "totalAmount": float(t.amount) * (t.total_installments or 1),
-                "currentInstallment": t.installments,
-                "totalInstallments": t.total_installments,
-                "dueDate": t.due_date.isoformat() if t.due_date else None,
-                "status": "pending" if t.due_date and t.due_date >= today else "paid"
-            }
-            for t in installments
-        ]
-        return success_response(data={
-            "summary": {
-                "totalIncome": float(total_income or 0),
-                "totalExpenses": float(total_expenses or 0),
-                "balance": float(balance or 0),
-                "projectedBalance": float(projected_balance or 0),
-                "pendingInstallments": float(pending_installments or 0),
-                "recurringExpenses": float(recurring_expenses or 0)
-            },
-            "expensesByCategory": {k: float(v) for k, v in expenses_by_category.items()},
-            "installments": installments_out
-        })
-    finally:
-        db.close()
+        period = Period.parse(month)
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    today = date_cls.today()
+    # O status das parcelas depende de hoje; as pendentes não dependem do período
+    cache_key = summary_cache.key(user_id, FINANCE, [*period.months(), PENDING], today)
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return success_response(data=cached)
+    totals = await repo.monthly_summary(user_id, period, today)
+    total_income = totals["total_income"]
+    total_expenses = totals["total_expenses"]
+    balance = total_income - total_expenses
+    expenses_by_category = totals["expenses_by_category"]
+    pending_installments = totals["pending_installments"]
+    recurring_expenses = totals["recurring_expenses"]
+    projected_balance = balance - (pending_installments or 0)
+    installments = totals["installments"]
+    installments_out = [
+        {
+            "id": str(t.id),
+            "description": t.description,
+            "amount": float(t.amount),
+            "totalAmount": float(t.amount) * (t.total_installments or 1),
+            "currentInstallment": t.installments,
+            "totalInstallments": t.total_installments,
+            "dueDate": t.due_date.isoformat() if t.due_date else None,
+            "status": "pending" if t.due_date and t.due_date >= today else "paid"
+        }
+        for t in installments
+    ]
+    data = {
+        "summary": {
+            "totalIncome": float(total_income or 0),
+            "totalExpenses": float(total_expenses or 0),
+            "balance": float(balance or 0),
+            "projectedBalance": float(projected_balance or 0),
+            "pendingInstallments": float(pending_installments or 0),
+            "recurringExpenses": float(recurring_expenses or 0)
+        },
+        "expensesByCategory": {k: float(v) for k, v in expenses_by_category.items()},
+        "installments": installments_out
+    }
+    summary_cache.set(cache_key, data)
+    return success_response(data=data)
+
+# Endpoints de regras de recorrência
+recurring_router = APIRouter(prefix="/finance/recurring", tags=["Recorrências"])
+
+def _valid_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+@recurring_router.get("/")
+async def list_recurring_rules(user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    rules = await AsyncRepository(db, RecurringRuleRepository).list(user_id)
+    return success_response(data={"rules": rules})
+
+@recurring_router.get("/occurrences")
+async def project_occurrences(
+    periods: PeriodQuery = Depends(),
+    type: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ocorrências ainda não materializadas das regras em um período (inclusive futuro)"""
+    try:
+        period = periods.resolve()
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    if period is None or period.end is None:
+        return error_response(message="Informe um período com data final", status_code=status.HTTP_400_BAD_REQUEST)
+    occurrences = await AsyncRepository(db, RecurringRuleRepository).project(user_id, period, type, category)
+    return success_response(data={"occurrences": occurrences})
+
+@recurring_router.post("/", status_code=201)
+async def create_recurring_rule(
+    data: RecurringRuleCreateDTO,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not await _category_exists(db, data.category):
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    rule = await AsyncRepository(db, RecurringRuleRepository).create(user_id, data.model_dump())
+    return success_response(data={"rule": RecurringRuleDTO.model_validate(rule)}, message="Recorrência criada com sucesso")
+
+@recurring_router.put("/{rule_id}")
+async def update_recurring_rule(
+    rule_id: str,
+    data: RecurringRuleUpdateDTO,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not _valid_uuid(rule_id):
+        return error_response(message="Recorrência não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    if not await _category_exists(db, data.category):
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    try:
+        rule = await AsyncRepository(db, RecurringRuleRepository).update(user_id, rule_id, data.model_dump(exclude_unset=True))
+    except ValueError as e:
+        return error_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    if not rule:
+        return error_response(message="Recorrência não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data={"rule": RecurringRuleDTO.model_validate(rule)}, message="Recorrência atualizada com sucesso")
+
+@recurring_router.delete("/{rule_id}")
+async def delete_recurring_rule(rule_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    if not _valid_uuid(rule_id) or not await AsyncRepository(db, RecurringRuleRepository).delete(user_id, rule_id):
+        return error_response(message="Recorrência não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(message="Recorrência deletada com sucesso")
+
+@recurring_router.post("/{rule_id}/occurrences/{occurrence_date}")
+async def materialize_occurrence(
+    rule_id: str,
+    occurrence_date: date_cls,
+    data: Optional[OccurrenceMaterializeDTO] = None,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Grava uma ocorrência como transação (ex.: para registrar um valor diferente do da regra)"""
+    overrides = data.model_dump(exclude_none=True) if data else {}
+    if not _valid_uuid(rule_id):
+        return error_response(message="Ocorrência não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    if not await _category_exists(db, overrides.get("category")):
+        return error_response(message="Categoria não encontrada.", status_code=status.HTTP_400_BAD_REQUEST)
+    transaction = await AsyncRepository(db, TransactionRepository).materialize(user_id, rule_id, occurrence_date, overrides)
+    if not transaction:
+        return error_response(message="Ocorrência não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data=transaction, message="Ocorrência registrada com sucesso")
 
 # Endpoints de GOALS
-from fastapi import APIRouter, Depends, status
 
 goals_router = APIRouter(prefix="/finance/goals", tags=["Metas Financeiras"])
 
 @goals_router.get("/", response_model=None)
-def list_goals(user_id: str = Depends(get_current_user), db=Depends(get_db)):
-    usecases = GoalUseCases(db)
-    goals = usecases.list_goals(user_id)
-    return success_response(data={"goals": [g.model_dump(mode='json') for g in goals]})
+async def list_goals(user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    usecases = AsyncRepository(db, GoalUseCases)
+    goals = await usecases.list_goals(user_id)
+    return success_response(data={"goals": goals})
 
 @goals_router.post("/", response_model=None, status_code=201)
-def create_goal(data: GoalCreateDTO, user_id: str = Depends(get_current_user), db=Depends(get_db)):
-    usecases = GoalUseCases(db)
-    goal = usecases.create_goal(user_id, data)
-    return success_response(data={"goal": goal.model_dump(mode='json')}, message="Meta criada com sucesso")
+async def create_goal(data: GoalCreateDTO, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    usecases = AsyncRepository(db, GoalUseCases)
+    goal = await usecases.create_goal(user_id, data)
+    return success_response(data={"goal": goal}, message="Meta criada com sucesso")
 
 @goals_router.get("/{goal_id}", response_model=None)
-def get_goal(goal_id: str, user_id: str = Depends(get_current_user), db=Depends(get_db)):
-    usecases = GoalUseCases(db)
-    goal = usecases.get_goal(user_id, goal_id)
+async def get_goal(goal_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    usecases = AsyncRepository(db, GoalUseCases)
+    goal = await usecases.get_goal(user_id, goal_id)
     if not goal:
         return error_response(message="Meta não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-    return success_response(data={"goal": goal.model_dump(mode='json')})
+    return success_response(data={"goal": goal})
 
 @goals_router.put("/{goal_id}", response_model=None)
-def update_goal(goal_id: str, data: GoalUpdateDTO, user_id: str = Depends(get_current_user), db=Depends(get_db)):
-    usecases = GoalUseCases(db)
-    goal = usecases.update_goal(user_id, goal_id, data)
+async def update_goal(goal_id: str, data: GoalUpdateDTO, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    usecases = AsyncRepository(db, GoalUseCases)
+    goal = await usecases.update_goal(user_id, goal_id, data)
     if not goal:
         return error_response(message="Meta não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-    return success_response(data={"goal": goal.model_dump(mode='json')}, message="Meta atualizada com sucesso")
+    return success_response(data={"goal": goal}, message="Meta atualizada com sucesso")
 
 @goals_router.delete("/{goal_id}")
-def delete_goal(goal_id: str, user_id: str = Depends(get_current_user), db=Depends(get_db)):
-    usecases = GoalUseCases(db)
-    success = usecases.delete_goal(user_id, goal_id)
+async def delete_goal(goal_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    usecases = AsyncRepository(db, GoalUseCases)
+    success = await usecases.delete_goal(user_id, goal_id)
     if not success:
         return error_response(message="Meta não encontrada", status_code=status.HTTP_404_NOT_FOUND)
     return success_response(message="Meta deletada com sucesso")
@@ -236,51 +427,34 @@ def delete_goal(goal_id: str, user_id: str = Depends(get_current_user), db=Depen
 payment_router = APIRouter(prefix="/finance/payment-methods", tags=["Formas de Pagamento"])
 
 @payment_router.get("/", response_model=List[PaymentMethodDTO])
-def list_payment_methods(user_id: str = Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        repo = PaymentMethodRepository(db)
-        payment_methods = repo.get_all()
-        data = [PaymentMethodDTO.model_validate(pm, from_attributes=True).model_dump(mode="json") for pm in payment_methods]
-        return success_response(data=data, message="Formas de pagamento listadas com sucesso")
-    finally:
-        db.close()
+async def list_payment_methods(user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncRepository(db, PaymentMethodRepository)
+    payment_methods = await repo.get_all()
+    return success_response(data=payment_methods, message="Formas de pagamento listadas com sucesso")
 
 @payment_router.post("/", response_model=PaymentMethodDTO, status_code=201)
-def create_payment_method(data: PaymentMethodCreateDTO, user_id: str = Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        repo = PaymentMethodRepository(db)
-        if repo.get_by_name(data.name):
-            return error_response(message="Já existe uma forma de pagamento com esse nome.", status_code=status.HTTP_400_BAD_REQUEST)
-        payment_method = repo.create(name=data.name, description=data.description)
-        return success_response(data=PaymentMethodDTO.model_validate(payment_method, from_attributes=True).model_dump(mode="json"), message="Forma de pagamento criada com sucesso")
-    finally:
-        db.close()
+async def create_payment_method(data: PaymentMethodCreateDTO, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncRepository(db, PaymentMethodRepository)
+    if await repo.get_by_name(data.name):
+        return error_response(message="Já existe uma forma de pagamento com esse nome.", status_code=status.HTTP_400_BAD_REQUEST)
+    payment_method = await repo.create(name=data.name, description=data.description)
+    return success_response(data=PaymentMethodDTO.model_validate(payment_method, from_attributes=True), message="Forma de pagamento criada com sucesso")
 
 @payment_router.put("/{payment_method_id}", response_model=PaymentMethodDTO)
-def update_payment_method(payment_method_id: str, data: PaymentMethodUpdateDTO, user_id: str = Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        repo = PaymentMethodRepository(db)
-        payment_method = repo.update(payment_method_id, name=data.name, description=data.description)
-        if not payment_method:
-            return error_response(message="Forma de pagamento não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(data=PaymentMethodDTO.model_validate(payment_method, from_attributes=True).model_dump(mode="json"), message="Forma de pagamento atualizada com sucesso")
-    finally:
-        db.close()
+async def update_payment_method(payment_method_id: str, data: PaymentMethodUpdateDTO, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncRepository(db, PaymentMethodRepository)
+    payment_method = await repo.update(payment_method_id, name=data.name, description=data.description)
+    if not payment_method:
+        return error_response(message="Forma de pagamento não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data=PaymentMethodDTO.model_validate(payment_method, from_attributes=True), message="Forma de pagamento atualizada com sucesso")
 
 @payment_router.delete("/{payment_method_id}")
-def delete_payment_method(payment_method_id: str, user_id: str = Depends(get_current_user)):
-    db = SessionLocal()
-    try:
-        repo = PaymentMethodRepository(db)
-        success = repo.delete(payment_method_id)
-        if not success:
-            return error_response(message="Forma de pagamento não encontrada", status_code=status.HTTP_404_NOT_FOUND)
-        return success_response(message="Forma de pagamento deletada com sucesso")
-    finally:
-        db.close()
+async def delete_payment_method(payment_method_id: str, user_id: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncRepository(db, PaymentMethodRepository)
+    success = await repo.delete(payment_method_id)
+    if not success:
+        return error_response(message="Forma de pagamento não encontrada", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(message="Forma de pagamento deletada com sucesso")
 
 # Exportar apenas os routers principais
-__all__ = ["router", "goals_router"] 
\ No newline at end of file
+__all__ = ["router", "goals_router", "recurring_router"] 
\ No newline at end of file
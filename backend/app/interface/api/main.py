@@ -3,12 +3,25 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from .utils import success_response
 from .auth import router as auth_router
-from .finance import router as finance_router, goals_router, payment_router
+from .finance import router as finance_router, goals_router, payment_router, recurring_router
 from .debts import router as debts_router
 from .config import router as config_router
+from app.infrastructure.db import engine, async_engine
+from app.infrastructure.db_pool import pool_status, log_pool_config
+from app.infrastructure.password_hasher import password_hasher
+from app.infrastructure.token_revocation import revoked_tokens, run_revocation_tasks
+from app.infrastructure.config import REFERENCE_CACHE_NOTIFY
+from app.infrastructure.reference_cache import listen_for_invalidations
+from app.infrastructure.summary_cache import summary_cache
+from app.infrastructure.audit_log import audit_log
+from .middleware import DBCheckoutCounterMiddleware, ETagMiddleware, AuditContextMiddleware
+import asyncio
 import os
 
 app = FastAPI()
+app.add_middleware(ETagMiddleware)
+app.add_middleware(DBCheckoutCounterMiddleware)
+app.add_middleware(AuditContextMiddleware)
 
 # Configuração de CORS
 allow_origins = os.getenv("CORS_ALLOW_ORIGINS", "https://controle.solidtechsolutions.com.br").split(",")
@@ -45,16 +58,66 @@ def custom_openapi():
 app.openapi = custom_openapi
 
 @app.get("/")
-def read_root():
+async def read_root():
     return success_response(message="Backend FastAPI rodando!")
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return success_response(message="Backend está saudável!")
 
+@app.get("/health/db")
+async def db_pool_health():
+    # pool: engine assíncrono (handlers da API); syncPool: importação/exportação
+    return success_response(
+        data={"pool": pool_status(async_engine.sync_engine), "syncPool": pool_status(engine)},
+        message="Estatísticas do pool de conexões"
+    )
+
+@app.get("/health/auth")
+async def password_hasher_health():
+    return success_response(data={"passwordHasher": password_hasher.stats()}, message="Estatísticas do pool de hashing de senhas")
+
+@app.get("/health/cache")
+async def summary_cache_health():
+    return success_response(data={"summaryCache": summary_cache.stats()}, message="Estatísticas do cache de resumos")
+
+@app.get("/health/audit")
+async def audit_log_health():
+    return success_response(data={"auditLog": audit_log.stats()}, message="Estatísticas da fila de auditoria")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    # Blacklist de tokens carregada antes de atender: sem ela, tokens já revogados
+    # seriam aceitos até a primeira recarga. Depois, recarga e limpeza em segundo plano
+    await revoked_tokens.reload()
+    app.state.revocation_task = asyncio.create_task(run_revocation_tasks())
+    # Invalidações dos caches de referência e de resumos vindas de outros workers
+    app.state.reference_listener = asyncio.create_task(listen_for_invalidations()) if REFERENCE_CACHE_NOTIFY else None
+    # Gravação em lotes da trilha de auditoria
+    app.state.audit_writer = asyncio.create_task(audit_log.run())
+
+@app.on_event("shutdown")
+async def dispose_engines():
+    app.state.revocation_task.cancel()
+    if app.state.reference_listener:
+        app.state.reference_listener.cancel()
+    # Grava o que ainda está na fila de auditoria antes de fechar o pool
+    app.state.audit_writer.cancel()
+    try:
+        await app.state.audit_writer
+    except asyncio.CancelledError:
+        pass
+    await audit_log.flush()
+    await async_engine.dispose()
+    engine.dispose()
+    password_hasher.shutdown()
+
+log_pool_config()
+
 app.include_router(auth_router)
 app.include_router(finance_router)
 app.include_router(goals_router)
+app.include_router(recurring_router)
 app.include_router(payment_router)
 app.include_router(debts_router)
 app.include_router(config_router) 
\ No newline at end of file
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict
+from fastapi import HTTPException
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+from app.infrastructure.audit_log import set_request_context
+from app.infrastructure.db import AsyncSessionLocal
+from app.infrastructure.db_pool import start_request_counter
+from app.infrastructure.repositories import AsyncRepository, CategoryRepository, DataVersionRepository
+from app.infrastructure.reference_cache import reference_cache, RELATIONSHIPS, PAYMENT_METHODS
+from app.infrastructure.summary_cache import summary_cache, FINANCE
+from .dependencies import decode_authorization
+
+logger = logging.getLogger(__name__)
+
+class DBCheckoutCounterMiddleware:
+    """Middleware ASGI que expõe no header X-DB-Checkouts quantas conexões a requisição usou"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = start_request_counter()
+
+        async def send_with_counter(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-checkouts", str(counter.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_counter)
+
+class AuditContextMiddleware:
+    """Middleware ASGI que guarda IP e user agent da requisição para os registros de auditoria"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            client = scope.get("client")
+            set_request_context(client[0] if client else None, Headers(scope=scope).get("user-agent"))
+        await self.app(scope, receive, send)
+
+async def _transactions_summary_version(db: AsyncSession, user_id: str) -> Any:
+    # O resumo soma as ocorrências projetadas das regras de recorrência.
+    # O status das parcelas depende da data de hoje. A versão do cache de resumos muda
+    # quando este worker recebe a invalidação, evitando um 304 preso a um resumo antigo.
+    return (
+        await AsyncRepository(db, DataVersionRepository).get(user_id, ("transactions", "recurring_rules")),
+        date.today(),
+        summary_cache.version(user_id, FINANCE),
+    )
+
+async def _goals_version(db: AsyncSession, user_id: str) -> Any:
+    return await AsyncRepository(db, DataVersionRepository).get(user_id, ("goals",))
+
+async def _debts_version(db: AsyncSession, user_id: str) -> Any:
+    # Cada dívida traz a pessoa aninhada, com o relacionamento, e a forma de pagamento:
+    # alterar esses dados de referência incrementa a versão deles no cache de referência
+    return (
+        await AsyncRepository(db, DataVersionRepository).get(user_id, ("debts", "people")),
+        reference_cache.version(RELATIONSHIPS),
+        reference_cache.version(PAYMENT_METHODS),
+    )
+
+async def _categories_version(db: AsyncSession, user_id: str) -> Any:
+    # Categorias não têm updated_at; o conteúdo vem do cache de referência (sem I/O quando válido)
+    return await AsyncRepository(db, CategoryRepository).get_all()
+
+# Caminho (sem barra final) -> função que calcula a versão dos dados que a rota devolve
+ETAG_ROUTES: Dict[str, Callable[[AsyncSession, str], Awaitable[Any]]] = {
+    "/finance/transactions/summary": _transactions_summary_version,
+    "/finance/goals": _goals_version,
+    "/debts": _debts_version,
+    "/config/categories": _categories_version,
+}
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): ignora o prefixo W/"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+class ETagMiddleware:
+    """Middleware ASGI de revalidação (ETag / If-None-Match) para leituras frequentes.
+
+    Para os GETs em ETAG_ROUTES calcula uma versão barata dos dados do usuário
+    (contadores em data_versions das tabelas envolvidas), que junto com o
+    caminho e a query string forma o ETag. Se o cliente já tem essa versão a
+    resposta é 304, sem executar o handler nem serializar o corpo.
+    """
+
+    def __init__(self, app, routes: Dict[str, Callable[[AsyncSession, str], Awaitable[Any]]] = ETAG_ROUTES):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        version = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            version = self.routes.get(scope["path"].rstrip("/"))
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        try:
+            user_id = decode_authorization(headers.get("authorization")).get("sub")
+        except HTTPException:
+            user_id = None
+        if not user_id:
+            # Sem usuário válido o handler responde 401
+            await self.app(scope, receive, send)
+            return
+
+        # A versão é calculada na sessão da requisição, que o handler reutiliza
+        # (get_async_db): uma única conexão do pool tanto no 304 quanto no 200
+        async with AsyncSessionLocal() as db:
+            scope.setdefault("state", {})["db"] = db
+            try:
+                await self._respond(scope, receive, send, headers, user_id, version, db)
+            finally:
+                scope["state"].pop("db", None)
+
+    async def _respond(self, scope, receive, send, headers: Headers, user_id: str,
+                       version: Callable[[AsyncSession, str], Awaitable[Any]], db: AsyncSession):
+        try:
+            data_version = await version(db, user_id)
+        except Exception:
+            logger.exception("Falha ao calcular a versão de %s; respondendo sem ETag", scope["path"])
+            await db.rollback()
+            await self.app(scope, receive, send)
+            return
+
+        key = to_json([user_id, scope["path"], scope["query_string"].decode("latin-1"), data_version])
+        etag = f'W/"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"private, no-cache"),
+            (b"vary", b"Authorization"),
+        ]
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": list(message.get("headers", [])) + cache_headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
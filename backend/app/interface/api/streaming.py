@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+from uuid import UUID
+from fastapi.responses import StreamingResponse
+
+# Linhas agrupadas por chunk enviado ao cliente
+ROWS_PER_CHUNK = 500
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def csv_chunks(columns: Sequence[str], rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """Gera o CSV em chunks; o cabeçalho é enviado antes da primeira linha do banco"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        count += 1
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def ndjson_chunks(columns: Sequence[str], rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """Gera NDJSON (um objeto JSON por linha) em chunks"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: _json_value(row[column]) for column in columns}, ensure_ascii=False))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+def export_response(rows_factory, columns: Sequence[str], export_format: str, filename: str) -> StreamingResponse:
+    """Monta a StreamingResponse de exportação.
+
+    rows_factory é um gerador que abre a própria sessão e itera o cursor do
+    servidor, pois a sessão da requisição é fechada antes do envio do corpo.
+    """
+    chunks = csv_chunks if export_format == "csv" else ndjson_chunks
+    return StreamingResponse(
+        chunks(columns, rows_factory()),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
@@ -1,9 +1,20 @@
 from fastapi.responses import JSONResponse
+from pydantic_core import to_json
 from typing import Any, Dict, Optional
 from fastapi import status
 
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializado pelo pydantic-core direto em bytes.
+
+    Aceita DTOs (BaseModel) dentro do conteúdo sem model_dump prévio: o modelo
+    já validado é serializado uma única vez, respeitando os json_encoders.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
 def success_response(data: Any = None, message: str = "Sucesso"):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         content={
             "success": True,
@@ -13,11 +24,11 @@ def success_response(data: Any = None, message: str = "Sucesso"):
     )
 
 def error_response(message: str, errors: Optional[Dict[str, list]] = None, status_code: int = 400):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status_code,
         content={
             "success": False,
             "message": message,
             "errors": errors or {}
         }
-    ) 
\ No newline at end of file
+    )
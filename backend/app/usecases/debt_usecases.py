@@ -4,8 +4,11 @@ from typing import Optional
 from ..infrastructure.repositories.people_repository import PeopleRepository
 from ..infrastructure.repositories.debt_repository import DebtRepository
 from ..infrastructure.repositories.relationship_repository import RelationshipRepository
+from ..infrastructure.period import Period
 from ..domain.dto.people import PeopleCreateDTO, PeopleUpdateDTO
-from ..domain.dto.debt import DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO
+from ..domain.dto.debt import (
+    DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO, DebtPaymentCreateDTO, DebtSelectionDTO, DebtBulkChangesDTO,
+)
 
 class DebtUseCases:
     def __init__(self, people_repo: PeopleRepository, debt_repo: DebtRepository, relationship_repo: RelationshipRepository):
@@ -46,9 +49,13 @@ class DebtUseCases:
         return self.people_repo.delete(person_id, user_id)
     
     # Casos de uso para Dívidas
-    def get_all_debts(self, user_id: uuid.UUID, month: Optional[date] = None, person_id: Optional[uuid.UUID] = None, status: Optional[str] = None):
+    def get_all_debts(self, user_id: uuid.UUID, period: Optional[Period] = None, person_id: Optional[uuid.UUID] = None, status: Optional[str] = None):
         """Busca todas as dívidas de um usuário com filtros opcionais"""
-        return self.debt_repo.get_all_by_user(user_id, month, person_id, status)
+        return self.debt_repo.get_all_by_user(user_id, period, person_id, status)
+    
+    def get_debts_summary_by_person(self, user_id: uuid.UUID, period: Optional[Period] = None):
+        """Totais das dívidas do período agrupados por pessoa"""
+        return self.debt_repo.summary_by_person(user_id, period)
     
     def get_debt_by_id(self, debt_id: uuid.UUID, user_id: uuid.UUID):
         """Busca uma dívida por ID"""
@@ -95,6 +102,37 @@ class DebtUseCases:
         
         return self.debt_repo.update_payment(debt_id, user_id, payment_data)
     
+    def add_debt_payment(self, debt_id: uuid.UUID, user_id: uuid.UUID, payment_data: DebtPaymentCreateDTO):
+        """Lança um pagamento (ou estorno) no histórico da dívida"""
+        if payment_data.paid_at and payment_data.paid_at > date.today():
+            raise ValueError("A data do pagamento não pode ser no futuro")
+        
+        return self.debt_repo.add_payment(debt_id, user_id, payment_data)
+    
+    def get_debt_payments(self, debt_id: uuid.UUID, user_id: uuid.UUID):
+        """Histórico de pagamentos de uma dívida (None se a dívida não existir)"""
+        if not self.debt_repo.get_by_id(debt_id, user_id):
+            return None
+        return self.debt_repo.list_payments(debt_id, user_id)
+    
+    def settle_person_debts(self, person_id: uuid.UUID, user_id: uuid.UUID):
+        """Quita todas as dívidas em aberto de uma pessoa (None se a pessoa não existir)"""
+        if not self.people_repo.get_by_id(person_id, user_id):
+            return None
+        return self.debt_repo.settle_person(person_id, user_id)
+    
     def delete_debt(self, debt_id: uuid.UUID, user_id: uuid.UUID):
         """Deleta uma dívida"""
-        return self.debt_repo.delete(debt_id, user_id) 
\ No newline at end of file
+        return self.debt_repo.delete(debt_id, user_id)
+    
+    def bulk_update_debts(self, user_id: uuid.UUID, selection: DebtSelectionDTO, changes: DebtBulkChangesDTO):
+        """Altera de uma vez todas as dívidas selecionadas; retorna quantas foram alteradas"""
+        # Valida se a nova pessoa existe e pertence ao usuário
+        if changes.person_id and not self.people_repo.get_by_id(uuid.UUID(changes.person_id), user_id):
+            raise ValueError("Pessoa não encontrada")
+        
+        return self.debt_repo.bulk_update(user_id, selection, changes)
+    
+    def bulk_delete_debts(self, user_id: uuid.UUID, selection: DebtSelectionDTO):
+        """Remove de uma vez todas as dívidas selecionadas; retorna quantas foram removidas"""
+        return self.debt_repo.bulk_delete(user_id, selection)
@@ -0,0 +1,251 @@
+import codecs
+import csv
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.infrastructure.repositories.transaction_repository import TransactionRepository
+from app.infrastructure.repositories.category_repository import CategoryRepository
+from app.infrastructure.repositories.payment_method_repository import PaymentMethodRepository
+
+# Linhas acumuladas antes de cada INSERT multi-linha
+BATCH_SIZE = 1000
+# Limite de erros devolvidos na resposta, para manter a memória limitada
+MAX_REPORTED_ERRORS = 500
+
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+CSV_COLUMNS = {
+    "date": ("date", "data"),
+    "description": ("description", "descricao", "descrição", "memo"),
+    "amount": ("amount", "valor"),
+    "type": ("type", "tipo"),
+    "category": ("category", "categoria"),
+    "payment_method": ("payment_method", "payment_method_id", "forma_pagamento", "forma de pagamento"),
+}
+
+# Limites da coluna amount (NUMERIC(10,2), CHECK amount > 0)
+CENTS = Decimal("0.01")
+MAX_AMOUNT = Decimal("99999999.99")
+
+def parse_amount(value: str) -> Decimal:
+    """Aceita 1234.56, 1.234,56 e 1234,56"""
+    value = value.strip().replace("R$", "").replace(" ", "")
+    if "," in value and "." in value:
+        value = value.replace(".", "").replace(",", ".")
+    elif "," in value:
+        value = value.replace(",", ".")
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {value}")
+
+def parse_date(value: str) -> date:
+    """Aceita YYYY-MM-DD, DD/MM/YYYY e o formato OFX YYYYMMDD[HHMMSS...]"""
+    value = value.strip()
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    if len(value) >= 8 and value[:8].isdigit():
+        return datetime.strptime(value[:8], "%Y%m%d").date()
+    raise ValueError(f"Data inválida: {value}")
+
+class ImportDecodeError(ValueError):
+    """O arquivo não pôde ser decodificado na codificação informada"""
+
+    def __init__(self, line: int, encoding: str):
+        super().__init__(f"O arquivo não está em {encoding}: conteúdo inválido na linha {line}. Nada foi importado.")
+        self.line = line
+
+def decode_lines(file: BinaryIO, encoding: str) -> Iterator[str]:
+    """Decodifica o arquivo linha a linha, sem substituir bytes inválidos.
+
+    Lança ImportDecodeError com o número da linha do primeiro byte inválido, em
+    vez de importar a linha com caracteres trocados. Lança LookupError se a
+    codificação não existir.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    line, pending = 1, ""
+    for chunk in file:
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise ImportDecodeError(line, encoding)
+        *complete, pending = pending.split("\n")
+        for text in complete:
+            line += 1
+            yield text + "\n"
+    try:
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ImportDecodeError(line, encoding)
+    if pending:
+        yield pending
+
+def iter_csv(lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Lê o CSV linha a linha, mapeando os cabeçalhos conhecidos (pt/en) para os campos internos"""
+    lines = iter(lines)
+    header_line = next(lines, "")
+    delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    columns = {}
+    for index, name in enumerate(header):
+        normalized = name.strip().lower()
+        for field, aliases in CSV_COLUMNS.items():
+            if normalized in aliases:
+                columns[field] = index
+    reader = csv.reader(lines, delimiter=delimiter)
+    for values in reader:
+        if not any(v.strip() for v in values):
+            continue
+        # line_num conta linhas físicas (campos entre aspas podem ter quebras); +1 pelo cabeçalho
+        yield reader.line_num + 1, {field: values[index] if index < len(values) else "" for field, index in columns.items()}
+
+def iter_ofx(lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Lê blocos <STMTTRN> de um arquivo OFX (SGML ou XML) sem carregar o arquivo inteiro"""
+    current: Optional[Dict[str, str]] = None
+    index = 0
+    for line in lines:
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    index += 1
+                    amount = current.get("TRNAMT", "")
+                    yield index, {
+                        "date": current.get("DTPOSTED", ""),
+                        "description": current.get("MEMO") or current.get("NAME", ""),
+                        "amount": amount,
+                        "type": "",
+                    }
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+class TransactionImportUseCases:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = TransactionRepository(db)
+
+    def _load_lookups(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Monta dicionários id/nome -> id a partir do cache de categorias e formas de pagamento"""
+        categories: Dict[str, str] = {}
+        for category in CategoryRepository(self.db).get_all():
+            categories[category.id.lower()] = category.id
+            categories[category.name.lower()] = category.id
+        payment_methods: Dict[str, str] = {}
+        for payment_method in PaymentMethodRepository(self.db).get_all():
+            payment_methods[str(payment_method.id).lower()] = str(payment_method.id)
+            payment_methods[payment_method.name.lower()] = str(payment_method.id)
+        return categories, payment_methods
+
+    def import_file(
+        self,
+        user_id: str,
+        file: BinaryIO,
+        file_format: str,
+        encoding: str = "utf-8-sig",
+        default_category: Optional[str] = None,
+        default_payment_method: Optional[str] = None,
+    ) -> Dict:
+        """Importa transações de um arquivo CSV ou OFX, gravando em lotes numa única transação.
+
+        O arquivo é consumido como stream; apenas o lote corrente e os erros
+        (até MAX_REPORTED_ERRORS) ficam em memória. Linhas inválidas são
+        puladas e relatadas; se o arquivo não puder ser decodificado, lança
+        ImportDecodeError com a linha e nada é gravado.
+        """
+        categories, payment_methods = self._load_lookups()
+        lines = decode_lines(file, encoding)
+        rows = iter_ofx(lines) if file_format == "ofx" else iter_csv(lines)
+        today = date.today()
+
+        failed = 0
+        errors: List[Dict] = []
+
+        def batches() -> Iterator[List[Dict]]:
+            nonlocal failed
+            batch: List[Dict] = []
+            for row_number, raw in rows:
+                try:
+                    batch.append(self._build_row(raw, categories, payment_methods, default_category, default_payment_method, today))
+                except ValueError as e:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"row": row_number, "message": str(e)})
+                    continue
+                if len(batch) >= BATCH_SIZE:
+                    yield batch
+                    batch = []
+            yield batch
+
+        imported = self.repo.create_many(user_id, batches())
+
+        return {
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "errorsTruncated": failed > len(errors),
+        }
+
+    @staticmethod
+    def _build_row(raw: Dict[str, str], categories: Dict[str, str], payment_methods: Dict[str, str],
+                   default_category: Optional[str], default_payment_method: Optional[str], today: date) -> Dict:
+        """Valida uma linha com as mesmas regras de POST /finance/transactions/"""
+        if not raw.get("date"):
+            raise ValueError("Data obrigatória")
+        transaction_date = parse_date(raw["date"])
+        if transaction_date > today:
+            raise ValueError("A data da transação não pode ser no futuro.")
+
+        amount = parse_amount(raw.get("amount") or "")
+        if not amount.is_finite():
+            raise ValueError("Valor inválido.")
+        transaction_type = (raw.get("type") or "").strip().lower()
+        if not transaction_type:
+            transaction_type = "expense" if amount < 0 else "income"
+        elif transaction_type in ("receita", "credit"):
+            transaction_type = "income"
+        elif transaction_type in ("despesa", "debit"):
+            transaction_type = "expense"
+        if transaction_type not in ("income", "expense"):
+            raise ValueError("Tipo de transação inválido.")
+        if abs(amount) > MAX_AMOUNT:
+            raise ValueError("O valor da transação excede o limite.")
+        amount = abs(amount).quantize(CENTS, rounding=ROUND_HALF_UP)
+        if amount <= 0:
+            raise ValueError("O valor da transação deve ser positivo.")
+
+        description = (raw.get("description") or "").strip()[:200]
+        if not description:
+            raise ValueError("Descrição obrigatória")
+
+        category_key = (raw.get("category") or default_category or "").strip().lower()
+        category = categories.get(category_key)
+        if not category:
+            raise ValueError("Categoria não encontrada.")
+
+        payment_method_key = (raw.get("payment_method") or default_payment_method or "").strip().lower()
+        payment_method_id = payment_methods.get(payment_method_key) if payment_method_key else None
+        if payment_method_key and not payment_method_id:
+            raise ValueError("Forma de pagamento não encontrada.")
+        if transaction_type == "expense" and not payment_method_id:
+            raise ValueError("Forma de pagamento é obrigatória para transações do tipo despesa")
+
+        return {
+            "description": description,
+            "amount": amount,
+            "type": transaction_type,
+            "category": category,
+            "date": transaction_date,
+            "is_recurring": False,
+            "installments": None,
+            "total_installments": None,
+            "due_date": None,
+            "payment_method_id": payment_method_id,
+        }
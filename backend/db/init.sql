@@ -65,6 +65,27 @@ CREATE TABLE IF NOT EXISTS payment_methods (
     description VARCHAR(200)
 );
 
+-- Regras de recorrência (estilo RRULE): cada transação recorrente é guardada uma vez;
+-- as ocorrências são projetadas nas consultas e só viram linhas em transactions
+-- quando alteradas (materializadas). Datas removidas ficam em excluded_dates (EXDATE).
+CREATE TABLE IF NOT EXISTS recurring_rules (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    description VARCHAR(200) NOT NULL,
+    amount NUMERIC(10,2) NOT NULL CHECK (amount > 0),
+    type VARCHAR(10) NOT NULL CHECK (type IN ('income', 'expense')),
+    category VARCHAR(50) NOT NULL REFERENCES categories(id),
+    payment_method_id UUID REFERENCES payment_methods(id),
+    frequency VARCHAR(10) NOT NULL DEFAULT 'monthly' CHECK (frequency IN ('weekly', 'monthly', 'yearly')),
+    "interval" INTEGER NOT NULL DEFAULT 1 CHECK ("interval" > 0),
+    start_date DATE NOT NULL,
+    end_date DATE CHECK (end_date >= start_date),
+    count INTEGER CHECK (count > 0),
+    excluded_dates DATE[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- TRANSACTIONS
 DROP TABLE IF EXISTS transactions CASCADE;
 CREATE TABLE transactions (
@@ -80,10 +101,38 @@ CREATE TABLE transactions (
     total_installments INTEGER,
     due_date DATE,
     payment_method_id UUID REFERENCES payment_methods(id),
+    installment_group_id UUID,
+    -- Ocorrência materializada de uma regra de recorrência (data original na regra)
+    recurring_rule_id UUID REFERENCES recurring_rules(id) ON DELETE SET NULL,
+    occurrence_date DATE,
+    version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Rollup mensal de transações, mantido pelo TransactionRepository na mesma transação das escritas
+-- Reconstrução/verificação: python -m scripts.rebuild_monthly_totals [--check]
+CREATE TABLE IF NOT EXISTS monthly_totals (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    year_month VARCHAR(7) NOT NULL,
+    type VARCHAR(10) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    is_recurring BOOLEAN NOT NULL DEFAULT FALSE,
+    total_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+    transactions_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, year_month, type, category, is_recurring)
+);
+
+-- Versão dos dados de cada usuário por tabela, usada nos ETags (ETagMiddleware).
+-- Mantida pelos triggers bump_data_version na mesma transação das escritas:
+-- a leitura é uma busca pela chave primária, sem varrer o histórico do usuário
+CREATE TABLE IF NOT EXISTS data_versions (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    table_name VARCHAR(50) NOT NULL,
+    version BIGINT NOT NULL DEFAULT 1,
+    PRIMARY KEY (user_id, table_name)
+);
+
 -- Remover triggers antigos se existirem
 DROP TRIGGER IF EXISTS update_updated_at_column ON transactions;
 DROP FUNCTION IF EXISTS update_updated_at_column();
@@ -116,6 +165,8 @@ CREATE TABLE IF NOT EXISTS debts (
     installments INTEGER CHECK (installments > 0),
     total_installments INTEGER CHECK (total_installments > 0),
     payment_method_id UUID REFERENCES payment_methods(id),
+    installment_group_id UUID,
+    version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT check_installments CHECK (
@@ -124,6 +175,17 @@ CREATE TABLE IF NOT EXISTS debts (
     )
 );
 
+-- Histórico de pagamentos de dívidas (somente inserções); debts.paid_amount é o saldo corrente
+CREATE TABLE IF NOT EXISTS debt_payments (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    debt_id UUID NOT NULL REFERENCES debts(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    amount DECIMAL(10,2) NOT NULL CHECK (amount <> 0),
+    paid_at DATE NOT NULL DEFAULT CURRENT_DATE,
+    note VARCHAR(200),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Tabela de metas financeiras
 CREATE TABLE IF NOT EXISTS goals (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -151,24 +213,28 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Índices para performance
-CREATE INDEX IF NOT EXISTS idx_transactions_user_id ON transactions(user_id);
-CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
+-- Índices para performance, alinhados às consultas dos repositórios (ver db/migrations/)
 CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
-CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
+-- Paginação por cursor (date, id) em GET /finance/transactions
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date_id ON transactions(user_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_due_date ON transactions(user_id, due_date) WHERE due_date IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_installments ON transactions(user_id, date) WHERE total_installments IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_recurring ON transactions(user_id, date DESC) WHERE is_recurring;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_installment_group ON transactions(user_id, installment_group_id) WHERE installment_group_id IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_rule_occurrence ON transactions(recurring_rule_id, occurrence_date) WHERE recurring_rule_id IS NOT NULL;
 
-CREATE INDEX IF NOT EXISTS idx_debts_user_id ON debts(user_id);
+CREATE INDEX IF NOT EXISTS idx_recurring_rules_user_id ON recurring_rules(user_id);
+
+CREATE INDEX IF NOT EXISTS idx_debts_user_date_id ON debts(user_id, date DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_debts_person_id ON debts(person_id);
-CREATE INDEX IF NOT EXISTS idx_debts_date ON debts(date);
-CREATE INDEX IF NOT EXISTS idx_debts_status ON debts(status);
-CREATE INDEX IF NOT EXISTS idx_debts_installments ON debts(installments);
-CREATE INDEX IF NOT EXISTS idx_debts_total_installments ON debts(total_installments);
+CREATE INDEX IF NOT EXISTS idx_debts_user_installments ON debts(user_id, date) WHERE total_installments > 1;
+CREATE INDEX IF NOT EXISTS idx_debts_user_installment_group ON debts(user_id, installment_group_id) WHERE installment_group_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_debt_payments_debt_id ON debt_payments(debt_id, created_at);
 
 CREATE INDEX IF NOT EXISTS idx_people_user_id ON people(user_id);
 CREATE INDEX IF NOT EXISTS idx_people_relationship ON people(relationship);
 
 CREATE INDEX IF NOT EXISTS idx_goals_user_id ON goals(user_id);
-CREATE INDEX IF NOT EXISTS idx_goals_deadline ON goals(deadline);
 
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_id ON refresh_tokens(user_id);
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_token ON refresh_tokens(token);
@@ -176,6 +242,7 @@ CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens(expir
 
 CREATE INDEX IF NOT EXISTS idx_token_blacklist_token ON token_blacklist(token);
 CREATE INDEX IF NOT EXISTS idx_token_blacklist_expires_at ON token_blacklist(expires_at);
+CREATE INDEX IF NOT EXISTS idx_token_blacklist_created_at ON token_blacklist(created_at);
 
 CREATE INDEX IF NOT EXISTS idx_audit_logs_user_id ON audit_logs(user_id);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
@@ -196,6 +263,36 @@ CREATE TRIGGER update_transactions_updated_at BEFORE UPDATE ON transactions FOR
 CREATE TRIGGER update_people_updated_at BEFORE UPDATE ON people FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_debts_updated_at BEFORE UPDATE ON debts FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_goals_updated_at BEFORE UPDATE ON goals FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_recurring_rules_updated_at BEFORE UPDATE ON recurring_rules FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Incrementa data_versions uma vez por comando para cada usuário afetado.
+-- O JOIN com users ignora linhas apagadas em cascata junto com o próprio usuário
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO data_versions (user_id, table_name)
+    SELECT DISTINCT c.user_id, TG_TABLE_NAME FROM changed_rows c JOIN users u ON u.id = c.user_id
+    ON CONFLICT (user_id, table_name) DO UPDATE SET version = data_versions.version + 1;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Triggers de versão por comando (transition tables): um UPDATE em massa incrementa uma vez
+CREATE TRIGGER bump_transactions_data_version_insert AFTER INSERT ON transactions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_transactions_data_version_update AFTER UPDATE ON transactions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_transactions_data_version_delete AFTER DELETE ON transactions REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_insert AFTER INSERT ON recurring_rules REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_update AFTER UPDATE ON recurring_rules REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_delete AFTER DELETE ON recurring_rules REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_insert AFTER INSERT ON debts REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_update AFTER UPDATE ON debts REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_delete AFTER DELETE ON debts REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_insert AFTER INSERT ON people REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_update AFTER UPDATE ON people REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_delete AFTER DELETE ON people REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_insert AFTER INSERT ON goals REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_update AFTER UPDATE ON goals REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_delete AFTER DELETE ON goals REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
 
 -- Inserir dados padrão de categorias
 INSERT INTO categories (id, name, icon, color) VALUES
@@ -0,0 +1,33 @@
+-- Índices compostos e parciais alinhados às consultas dos repositórios.
+-- Toda consulta filtra por user_id + intervalo de datas (+ tipo/categoria/status),
+-- então os índices de coluna única em user_id/date/type/status ficam redundantes.
+-- CONCURRENTLY: não bloqueia escritas; o runner executa fora de transação.
+-- Aplicar com: python -m scripts.migrate
+
+-- transactions: listagem/paginação/exportação e parcelas do mês usam (user_id, date DESC, id DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_date_id ON transactions(user_id, date DESC, id DESC);
+-- Parcelas pendentes do resumo (due_date >= hoje)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_due_date ON transactions(user_id, due_date) WHERE due_date IS NOT NULL;
+-- Parcelas do mês no resumo (total_installments IS NOT NULL)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_installments ON transactions(user_id, date) WHERE total_installments IS NOT NULL;
+-- Lançamentos recorrentes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_recurring ON transactions(user_id, date DESC) WHERE is_recurring;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_type;
+
+-- debts: listagem/exportação por usuário e mês, com filtros de pessoa/status
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_debts_user_date_id ON debts(user_id, date DESC, id DESC);
+-- Dívidas parceladas do resumo
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_debts_user_installments ON debts(user_id, date) WHERE total_installments > 1;
+DROP INDEX CONCURRENTLY IF EXISTS idx_debts_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_debts_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_debts_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_debts_installments;
+DROP INDEX CONCURRENTLY IF EXISTS idx_debts_total_installments;
+
+-- goals: nenhuma consulta filtra só por prazo
+DROP INDEX CONCURRENTLY IF EXISTS idx_goals_deadline;
+
+-- token_blacklist: recarga incremental da blacklist em memória (created_at >= desde)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_token_blacklist_created_at ON token_blacklist(created_at);
@@ -0,0 +1,24 @@
+-- Histórico de pagamentos de dívidas (somente inserções).
+-- debts.paid_amount/status continuam sendo o saldo corrente, atualizado na mesma
+-- transação de cada pagamento com UPDATE ... SET paid_amount = paid_amount + x.
+-- Aplicar com: python -m scripts.migrate
+
+CREATE TABLE IF NOT EXISTS debt_payments (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    debt_id UUID NOT NULL REFERENCES debts(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    amount DECIMAL(10,2) NOT NULL CHECK (amount <> 0),
+    paid_at DATE NOT NULL DEFAULT CURRENT_DATE,
+    note VARCHAR(200),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_debt_payments_debt_id ON debt_payments(debt_id, created_at);
+
+-- Valores já pagos antes do histórico viram um lançamento inicial, para que a soma
+-- dos pagamentos de cada dívida bata com debts.paid_amount
+INSERT INTO debt_payments (debt_id, user_id, amount, paid_at, note)
+SELECT d.id, d.user_id, d.paid_amount, COALESCE(d.updated_at::date, CURRENT_DATE), 'Saldo anterior ao histórico'
+FROM debts d
+WHERE d.paid_amount > 0
+  AND NOT EXISTS (SELECT 1 FROM debt_payments p WHERE p.debt_id = d.id);
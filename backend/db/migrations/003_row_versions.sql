@@ -0,0 +1,7 @@
+-- Versão por linha para controle de concorrência otimista nas atualizações:
+-- UPDATE ... SET version = version + 1 WHERE id = :id AND version = :version.
+-- Coluna com default constante: só altera o catálogo, sem reescrever a tabela.
+-- Aplicar com: python -m scripts.migrate
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE debts ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,33 @@
+-- Identificador do parcelamento: todas as parcelas geradas por um mesmo cadastro
+-- compartilham installment_group_id, para editar ou cancelar o plano em um único comando.
+-- Aplicar com: python -m scripts.migrate
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS installment_group_id UUID;
+ALTER TABLE debts ADD COLUMN IF NOT EXISTS installment_group_id UUID;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_user_installment_group ON transactions(user_id, installment_group_id) WHERE installment_group_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_debts_user_installment_group ON debts(user_id, installment_group_id) WHERE installment_group_id IS NOT NULL;
+
+-- Parcelamentos já existentes: as parcelas de um cadastro foram inseridas na mesma
+-- transação, então têm o mesmo created_at, descrição e total de parcelas
+UPDATE transactions t SET installment_group_id = g.group_id
+FROM (
+    SELECT user_id, created_at, description, total_installments, uuid_generate_v4() AS group_id
+    FROM transactions
+    WHERE total_installments > 1 AND installment_group_id IS NULL
+    GROUP BY user_id, created_at, description, total_installments
+) g
+WHERE t.total_installments > 1 AND t.installment_group_id IS NULL
+  AND t.user_id = g.user_id AND t.created_at = g.created_at
+  AND t.description = g.description AND t.total_installments = g.total_installments;
+
+UPDATE debts d SET installment_group_id = g.group_id
+FROM (
+    SELECT user_id, person_id, created_at, description, total_installments, uuid_generate_v4() AS group_id
+    FROM debts
+    WHERE total_installments > 1 AND installment_group_id IS NULL
+    GROUP BY user_id, person_id, created_at, description, total_installments
+) g
+WHERE d.total_installments > 1 AND d.installment_group_id IS NULL
+  AND d.user_id = g.user_id AND d.person_id = g.person_id AND d.created_at = g.created_at
+  AND d.description = g.description AND d.total_installments = g.total_installments;
@@ -0,0 +1,73 @@
+-- Regras de recorrência: uma transação recorrente deixa de gravar seis cópias em
+-- meses futuros e passa a ser uma regra (frequência, intervalo, início, fim/contagem,
+-- datas excluídas). As ocorrências são projetadas nas listagens e resumos e só
+-- viram linhas em transactions quando alteradas (materializadas).
+-- Aplicar com: python -m scripts.migrate
+
+CREATE TABLE IF NOT EXISTS recurring_rules (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    description VARCHAR(200) NOT NULL,
+    amount NUMERIC(10,2) NOT NULL CHECK (amount > 0),
+    type VARCHAR(10) NOT NULL CHECK (type IN ('income', 'expense')),
+    category VARCHAR(50) NOT NULL REFERENCES categories(id),
+    payment_method_id UUID REFERENCES payment_methods(id),
+    frequency VARCHAR(10) NOT NULL DEFAULT 'monthly' CHECK (frequency IN ('weekly', 'monthly', 'yearly')),
+    "interval" INTEGER NOT NULL DEFAULT 1 CHECK ("interval" > 0),
+    start_date DATE NOT NULL,
+    end_date DATE CHECK (end_date >= start_date),
+    count INTEGER CHECK (count > 0),
+    excluded_dates DATE[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_recurring_rules_user_id ON recurring_rules(user_id);
+
+DROP TRIGGER IF EXISTS update_recurring_rules_updated_at ON recurring_rules;
+CREATE TRIGGER update_recurring_rules_updated_at BEFORE UPDATE ON recurring_rules FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS recurring_rule_id UUID REFERENCES recurring_rules(id) ON DELETE SET NULL;
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS occurrence_date DATE;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_rule_occurrence ON transactions(recurring_rule_id, occurrence_date) WHERE recurring_rule_id IS NOT NULL;
+
+-- Séries recorrentes já gravadas: as seis cópias de um cadastro têm o mesmo created_at
+-- e descrição. Cada série vira uma regra mensal que termina na última cópia, com os
+-- valores da primeira, e as cópias existentes ficam como ocorrências materializadas.
+INSERT INTO recurring_rules (user_id, description, amount, type, category, payment_method_id, start_date, end_date, created_at, updated_at)
+SELECT user_id, description,
+       (array_agg(amount ORDER BY date))[1], (array_agg(type ORDER BY date))[1],
+       (array_agg(category ORDER BY date))[1], (array_agg(payment_method_id ORDER BY date))[1],
+       min(date), max(date), created_at, created_at
+FROM transactions t
+WHERE is_recurring AND recurring_rule_id IS NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM recurring_rules r
+      WHERE r.user_id = t.user_id AND r.created_at = t.created_at AND r.description = t.description
+  )
+GROUP BY user_id, created_at, description;
+
+UPDATE transactions t SET recurring_rule_id = r.id, occurrence_date = t.date
+FROM recurring_rules r
+WHERE t.is_recurring AND t.recurring_rule_id IS NULL
+  AND r.user_id = t.user_id AND r.created_at = t.created_at AND r.description = t.description
+  AND t.id IN (
+      SELECT DISTINCT ON (user_id, created_at, description, date) id
+      FROM transactions
+      WHERE is_recurring AND recurring_rule_id IS NULL
+      ORDER BY user_id, created_at, description, date, id
+  );
+
+-- Cópias removidas antes da migração não podem voltar como ocorrências projetadas
+UPDATE recurring_rules r SET excluded_dates = ARRAY(
+    SELECT (r.start_date + make_interval(months => i))::date
+    FROM generate_series(0, ((date_part('year', r.end_date) - date_part('year', r.start_date)) * 12
+                             + date_part('month', r.end_date) - date_part('month', r.start_date))::int) i
+    WHERE NOT EXISTS (
+        SELECT 1 FROM transactions t
+        WHERE t.recurring_rule_id = r.id AND t.occurrence_date = (r.start_date + make_interval(months => i))::date
+    )
+)
+WHERE r.excluded_dates = '{}'
+  AND EXISTS (SELECT 1 FROM transactions t WHERE t.recurring_rule_id = r.id AND t.created_at = r.created_at);
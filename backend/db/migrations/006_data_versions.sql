@@ -0,0 +1,54 @@
+-- Versão dos dados por usuário e tabela para os ETags: o ETagMiddleware deixa de
+-- calcular count(*) + max(updated_at) das tabelas do usuário (custo proporcional ao
+-- histórico) e passa a ler uma linha por tabela pela chave primária.
+-- Aplicar com: python -m scripts.migrate
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    table_name VARCHAR(50) NOT NULL,
+    version BIGINT NOT NULL DEFAULT 1,
+    PRIMARY KEY (user_id, table_name)
+);
+
+-- Incrementa data_versions uma vez por comando para cada usuário afetado.
+-- O JOIN com users ignora linhas apagadas em cascata junto com o próprio usuário
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO data_versions (user_id, table_name)
+    SELECT DISTINCT c.user_id, TG_TABLE_NAME FROM changed_rows c JOIN users u ON u.id = c.user_id
+    ON CONFLICT (user_id, table_name) DO UPDATE SET version = data_versions.version + 1;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS bump_transactions_data_version_insert ON transactions;
+DROP TRIGGER IF EXISTS bump_transactions_data_version_update ON transactions;
+DROP TRIGGER IF EXISTS bump_transactions_data_version_delete ON transactions;
+DROP TRIGGER IF EXISTS bump_recurring_rules_data_version_insert ON recurring_rules;
+DROP TRIGGER IF EXISTS bump_recurring_rules_data_version_update ON recurring_rules;
+DROP TRIGGER IF EXISTS bump_recurring_rules_data_version_delete ON recurring_rules;
+DROP TRIGGER IF EXISTS bump_debts_data_version_insert ON debts;
+DROP TRIGGER IF EXISTS bump_debts_data_version_update ON debts;
+DROP TRIGGER IF EXISTS bump_debts_data_version_delete ON debts;
+DROP TRIGGER IF EXISTS bump_people_data_version_insert ON people;
+DROP TRIGGER IF EXISTS bump_people_data_version_update ON people;
+DROP TRIGGER IF EXISTS bump_people_data_version_delete ON people;
+DROP TRIGGER IF EXISTS bump_goals_data_version_insert ON goals;
+DROP TRIGGER IF EXISTS bump_goals_data_version_update ON goals;
+DROP TRIGGER IF EXISTS bump_goals_data_version_delete ON goals;
+CREATE TRIGGER bump_transactions_data_version_insert AFTER INSERT ON transactions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_transactions_data_version_update AFTER UPDATE ON transactions REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_transactions_data_version_delete AFTER DELETE ON transactions REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_insert AFTER INSERT ON recurring_rules REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_update AFTER UPDATE ON recurring_rules REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_recurring_rules_data_version_delete AFTER DELETE ON recurring_rules REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_insert AFTER INSERT ON debts REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_update AFTER UPDATE ON debts REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_debts_data_version_delete AFTER DELETE ON debts REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_insert AFTER INSERT ON people REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_update AFTER UPDATE ON people REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_people_data_version_delete AFTER DELETE ON people REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_insert AFTER INSERT ON goals REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_update AFTER UPDATE ON goals REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+CREATE TRIGGER bump_goals_data_version_delete AFTER DELETE ON goals REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
@@ -0,0 +1,23 @@
+-- Rollup mensal de transações (monthly_totals), usado pelos resumos e mantido pelo
+-- TransactionRepository na mesma transação das escritas. Bancos criados antes dele
+-- só o recebem por aqui; o preenchimento inicial é a mesma agregação de
+-- python -m scripts.rebuild_monthly_totals e roda na transação da migration.
+-- Aplicar com: python -m scripts.migrate
+
+CREATE TABLE IF NOT EXISTS monthly_totals (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    year_month VARCHAR(7) NOT NULL,
+    type VARCHAR(10) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    is_recurring BOOLEAN NOT NULL DEFAULT FALSE,
+    total_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+    transactions_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, year_month, type, category, is_recurring)
+);
+
+DELETE FROM monthly_totals;
+
+INSERT INTO monthly_totals (user_id, year_month, type, category, is_recurring, total_amount, transactions_count)
+SELECT user_id, to_char(date, 'YYYY-MM'), type, category, COALESCE(is_recurring, FALSE), sum(amount), count(*)
+FROM transactions
+GROUP BY user_id, to_char(date, 'YYYY-MM'), type, category, COALESCE(is_recurring, FALSE);
@@ -0,0 +1,48 @@
+"""Microbenchmark da dependency de autenticação (get_current_user).
+
+Compara o custo por requisição de decodificar/verificar o JWT a cada chamada
+(verify_token, comportamento anterior) com o caminho em cache
+(verify_token_cached), além da dependency completa com o cache ativo.
+
+Uso (a partir de backend/):
+    python -m scripts.bench_auth --iterations 100000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from app.infrastructure.jwt_utils import create_access_token, verify_token, verify_token_cached, claims_cache
+from app.interface.api.dependencies import get_current_user
+
+def _per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+async def _dependency_per_call(header: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(header)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Custo da verificação do JWT por requisição")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    token = create_access_token(data={"sub": "00000000-0000-0000-0000-000000000000"})
+    header = f"Bearer {token}"
+    claims_cache.clear()
+
+    uncached = _per_call(lambda: verify_token(token), args.iterations)
+    cached = _per_call(lambda: verify_token_cached(token), args.iterations)
+    dependency = asyncio.run(_dependency_per_call(header, args.iterations))
+
+    print(f"verify_token (sem cache):        {uncached:8.2f} µs/chamada")
+    print(f"verify_token_cached (acerto):    {cached:8.2f} µs/chamada  ({uncached / cached:.1f}x)")
+    print(f"get_current_user (com cache):    {dependency:8.2f} µs/chamada")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Benchmark da serialização das respostas de listagem.
+
+Monta o payload de GET /finance/transactions e GET /debts com N linhas e
+compara o caminho anterior (model_validate + model_dump(mode="json") em cada
+DTO já validado e json.dumps do JSONResponse) com o atual (DTOs passados
+direto para success_response, serializados em bytes pelo pydantic-core).
+
+Uso (a partir de backend/):
+    python -m scripts.bench_json --rows 10000
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from fastapi.responses import JSONResponse
+from app.domain.dto.debt import DebtDTO
+from app.domain.dto.people import PeopleDTO
+from app.domain.dto.transaction import TransactionDTO
+from app.interface.api.utils import success_response
+
+def build_transactions(rows: int):
+    now = datetime.now(timezone.utc)
+    user_id = str(uuid.uuid4())
+    return [
+        TransactionDTO(
+            id=str(uuid.uuid4()), user_id=user_id, description=f"Transação {i}", amount=10 + i % 500 / 7,
+            type="expense" if i % 3 else "income", category="alimentacao", date=date.today() - timedelta(days=i % 28),
+            is_recurring=False, installments=None, total_installments=None, due_date=None,
+            created_at=now, updated_at=now, payment_method_id=str(uuid.uuid4()),
+        )
+        for i in range(rows)
+    ]
+
+def build_debts(rows: int):
+    now = datetime.now(timezone.utc)
+    person = PeopleDTO(
+        id=uuid.uuid4(), name="Maria", relationship="amigo",
+        created_at=now, updated_at=now,
+    )
+    return [
+        DebtDTO(
+            id=str(uuid.uuid4()), description=f"Dívida {i}", amount=100 + i % 90, paid_amount=i % 50, status="pending",
+            date=date.today(), due_date=date.today(), installments=1, total_installments=3, person_id=str(person.id),
+            person=person, created_at=now, updated_at=now, payment_method_id=None,
+        )
+        for i in range(rows)
+    ]
+
+def previous_transactions(transactions) -> bytes:
+    data = {"transactions": [TransactionDTO.model_validate(t, from_attributes=True).model_dump(mode="json") for t in transactions]}
+    return JSONResponse(content={"success": True, "message": "Sucesso", "data": data}).body
+
+def previous_debts(debts) -> bytes:
+    data = {"debts": [DebtDTO.model_validate(d, from_attributes=True).model_dump(mode="json") for d in debts]}
+    return JSONResponse(content={"success": True, "message": "Sucesso", "data": data}).body
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Custo de serialização das listagens")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    transactions = build_transactions(args.rows)
+    debts = build_debts(args.rows)
+    cases = (
+        ("transações", lambda: previous_transactions(transactions),
+         lambda: success_response(data={"transactions": transactions}).body),
+        ("dívidas   ", lambda: previous_debts(debts),
+         lambda: success_response(data={"debts": debts}).body),
+    )
+    print(f"{args.rows} linhas, melhor de {args.repeat}")
+    for name, previous, current in cases:
+        before = _best_of(previous, args.repeat)
+        after = _best_of(current, args.repeat)
+        print(f"{name}: anterior {before:8.1f} ms  atual {after:8.1f} ms  ({before / after:.1f}x)  {len(current()) / 1024:.0f} KiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Benchmark de carga: handler síncrono (threadpool + psycopg2) x assíncrono (event loop + asyncpg).
+
+Sobe dois apps mínimos com o mesmo handler do resumo mensal (o endpoint mais
+usado do dashboard), um com def/get_db e outro com async def/get_async_db, e
+dispara requisições concorrentes contra cada um via HTTP.
+
+Uso (a partir de backend/, requer httpx):
+    python -m scripts.bench_load --requests 2000 --concurrency 200
+    python -m scripts.bench_load --latency-ms 20 --pool-size 50   # simula banco remoto
+
+--latency-ms adiciona um pg_sleep por requisição para simular a latência de
+rede até o banco, que é onde o modelo assíncrono se diferencia. --pool-size
+define DB_POOL_SIZE para os dois engines; o síncrono usa os mesmos limites
+do assíncrono (e não os DB_SYNC_* da API) para a comparação ser justa.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from datetime import date
+from typing import List
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def build_apps(latency_ms: int):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.infrastructure.db import get_db, get_async_db
+    from app.infrastructure.period import Period
+    from app.infrastructure.repositories import TransactionRepository, AsyncRepository
+
+    sleep = text("SELECT pg_sleep(:seconds)")
+    seconds = latency_ms / 1000
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/summary/{user_id}/{year}/{month}")
+    def sync_summary(user_id: str, year: int, month: int, db: Session = Depends(get_db)):
+        if seconds:
+            db.execute(sleep, {"seconds": seconds})
+        totals = TransactionRepository(db).monthly_summary(user_id, Period.month(year, month), date.today())
+        return {"totalIncome": float(totals["total_income"]), "totalExpenses": float(totals["total_expenses"])}
+
+    async_app = FastAPI()
+
+    @async_app.get("/summary/{user_id}/{year}/{month}")
+    async def async_summary(user_id: str, year: int, month: int, db: AsyncSession = Depends(get_async_db)):
+        if seconds:
+            await db.execute(sleep, {"seconds": seconds})
+        totals = await AsyncRepository(db, TransactionRepository).monthly_summary(
+            user_id, Period.month(year, month), date.today()
+        )
+        return {"totalIncome": float(totals["total_income"]), "totalExpenses": float(totals["total_expenses"])}
+
+    return sync_app, async_app
+
+def pick_user() -> str:
+    from sqlalchemy import func
+    from app.infrastructure.db import SessionLocal
+    from app.infrastructure.models import TransactionModel
+
+    db = SessionLocal()
+    try:
+        row = db.query(TransactionModel.user_id).group_by(TransactionModel.user_id).order_by(
+            func.count().desc()
+        ).first()
+    finally:
+        db.close()
+    if not row:
+        raise SystemExit("Nenhuma transação no banco; informe --user-id")
+    return str(row[0])
+
+async def _load(url: str, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    queue = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for _ in queue:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+def run_against(app, path: str, args) -> dict:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        asyncio.run(_load(url, args.warmup, args.concurrency))
+        return asyncio.run(_load(url, args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compara throughput do stack síncrono e assíncrono")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=0, help="pg_sleep por requisição (simula banco remoto)")
+    parser.add_argument("--pool-size", type=int, help="DB_POOL_SIZE dos engines")
+    parser.add_argument("--user-id", help="Usuário consultado; por padrão o com mais transações")
+    parser.add_argument("--month", default=date.today().strftime("%Y-%m"), help="YYYY-MM")
+    args = parser.parse_args(argv)
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("Instale httpx para rodar o benchmark: pip install httpx")
+        return 1
+    # Precisa valer antes de app.infrastructure.config ser importado
+    if args.pool_size:
+        os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DB_SYNC_POOL_SIZE"] = os.environ.get("DB_POOL_SIZE", "5")
+    os.environ["DB_SYNC_MAX_OVERFLOW"] = os.environ.get("DB_MAX_OVERFLOW", "5")
+
+    sync_app, async_app = build_apps(args.latency_ms)
+    user_id = args.user_id or pick_user()
+    year, month = args.month.split("-")
+    path = f"/summary/{user_id}/{int(year)}/{int(month)}"
+
+    from app.infrastructure.config import DB_POOL_SIZE, DB_MAX_OVERFLOW
+    from app.infrastructure.db import engine
+    print(
+        f"{args.requests} requisições, concorrência {args.concurrency}, latência simulada {args.latency_ms}ms, "
+        f"pool {DB_POOL_SIZE}+{DB_MAX_OVERFLOW}"
+    )
+    for name, app in (("sync ", sync_app), ("async", async_app)):
+        result = run_against(app, path, args)
+        # Libera as conexões do pool síncrono antes de abrir as do assíncrono
+        engine.dispose()
+        print(
+            f"{name}: {result['rps']:8.1f} req/s  p50 {result['p50']:7.1f}ms  p95 {result['p95']:7.1f}ms  "
+            f"p99 {result['p99']:7.1f}ms  erros {result['errors']}"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Verifica os planos de execução de todas as consultas dos repositórios.
+
+Popula o banco com um volume realista (vários usuários, dezenas de milhares de
+transações e dívidas), roda ANALYZE e exercita cada método dos repositórios.
+Cada SELECT/UPDATE/DELETE emitido passa por EXPLAIN (com enable_seqscan
+desligado), e o script falha se algum plano ainda tiver Seq Scan em uma
+tabela que não seja de referência, ou seja, se faltar índice. Tudo roda
+dentro de uma transação desfeita no final: o banco não é alterado.
+
+Uso (a partir de backend/):
+    python -m scripts.check_query_plans
+    python -m scripts.check_query_plans --users 200 --rows-per-user 250 -v
+"""
+import argparse
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.infrastructure.db import engine
+from app.infrastructure.period import Period
+from app.infrastructure.recurrence import occurrence_id
+from app.infrastructure.repositories import (
+    DataVersionRepository, DebtRepository, PeopleRepository, RecurringRuleRepository, TokenRepository,
+    TransactionRepository, UserRepository,
+)
+from app.infrastructure.repositories.data_version_repository import VERSIONED_TABLES
+from app.infrastructure.repositories.goal_repository import GoalRepository
+from app.infrastructure.repositories.monthly_totals_repository import MonthlyTotalsRepository
+from app.domain.dto.debt import (
+    DebtCreateDTO, DebtUpdateDTO, DebtPaymentDTO, DebtPaymentCreateDTO, DebtSelectionDTO, DebtBulkChangesDTO,
+)
+from app.domain.dto.people import PeopleCreateDTO, PeopleUpdateDTO
+from app.domain.dto.transaction import (
+    TransactionCreateDTO, TransactionUpdateDTO, TransactionSelectionDTO, TransactionBulkChangesDTO,
+)
+
+# Tabelas pequenas, lidas inteiras (e em cache): Seq Scan é o plano correto
+SEQ_SCAN_ALLOWED = {"categories", "relationships", "payment_methods", "schema_migrations"}
+
+SEED_SQL = """
+INSERT INTO payment_methods (name) VALUES ('Plano de execução');
+
+INSERT INTO users (name, email, password_hash)
+SELECT 'Plano ' || g, 'plano' || g || '@query-plans.invalid', 'x' FROM generate_series(1, :users) g;
+
+INSERT INTO transactions (user_id, description, amount, type, category, date, is_recurring,
+                          installments, total_installments, due_date)
+SELECT u.id, 'Lançamento ' || g, 1 + g % 500,
+       CASE WHEN g % 4 = 0 THEN 'income' ELSE 'expense' END,
+       (ARRAY['alimentacao', 'transporte', 'lazer', 'moradia', 'outros'])[1 + g % 5],
+       CURRENT_DATE - g % 730, g % 20 = 0,
+       CASE WHEN g % 10 = 1 THEN 1 END, CASE WHEN g % 10 = 1 THEN 12 END,
+       CASE WHEN g % 10 = 1 THEN CURRENT_DATE - g % 730 + 30 END
+FROM users u CROSS JOIN generate_series(1, :rows) g
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO recurring_rules (user_id, description, amount, type, category, frequency, start_date, end_date)
+SELECT u.id, 'Recorrência ' || g, 100 * g, CASE WHEN g = 1 THEN 'income' ELSE 'expense' END, 'moradia',
+       (ARRAY['monthly', 'weekly', 'yearly'])[1 + g % 3], CURRENT_DATE - 400 + g, CASE WHEN g = 3 THEN CURRENT_DATE END
+FROM users u CROSS JOIN generate_series(1, 3) g
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO transactions (user_id, description, amount, type, category, date, is_recurring,
+                          recurring_rule_id, occurrence_date)
+SELECT r.user_id, r.description, r.amount + 1, r.type, r.category, r.start_date, true, r.id, r.start_date
+FROM recurring_rules r JOIN users u ON u.id = r.user_id
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO people (user_id, name, relationship)
+SELECT u.id, 'Pessoa ' || g, 'amigo'
+FROM users u CROSS JOIN generate_series(1, 5) g
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO debts (user_id, person_id, description, amount, paid_amount, status, date, due_date,
+                   installments, total_installments)
+SELECT p.user_id, p.id, 'Dívida ' || g, 10 + g % 300, 0,
+       (ARRAY['pending', 'partial', 'paid'])[1 + g % 3],
+       CURRENT_DATE - g % 365, CURRENT_DATE - g % 365 + 30,
+       CASE WHEN g % 4 = 0 THEN 1 END, CASE WHEN g % 4 = 0 THEN 3 END
+FROM people p CROSS JOIN generate_series(1, GREATEST(:rows / 25, 1)) g
+JOIN users u ON u.id = p.user_id
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO debt_payments (debt_id, user_id, amount, paid_at)
+SELECT d.id, d.user_id, 1 + g, d.date + g
+FROM debts d CROSS JOIN generate_series(1, 2) g
+JOIN users u ON u.id = d.user_id
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO goals (user_id, title, target_amount, deadline)
+SELECT u.id, 'Meta ' || g, 1000, CURRENT_DATE + g
+FROM users u CROSS JOIN generate_series(1, 5) g
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO refresh_tokens (user_id, token, expires_at)
+SELECT u.id, md5(u.id::text || g), now() + (g - 2) * interval '1 day'
+FROM users u CROSS JOIN generate_series(1, 10) g
+WHERE u.email LIKE '%@query-plans.invalid';
+
+INSERT INTO token_blacklist (token, expires_at, created_at)
+SELECT md5('revogado' || g), now() + (g % 100 - 50) * interval '1 hour', now() - (g % 1000) * interval '1 minute'
+FROM generate_series(1, :users * 25) g;
+"""
+
+SEEDED_TABLES = ("users", "recurring_rules", "transactions", "monthly_totals", "people", "debts", "debt_payments", "goals", "refresh_tokens", "token_blacklist")
+
+Context = Dict[str, Any]
+Scenario = Callable[[Session, Context], Any]
+
+def _transaction_scenarios(db: Session, ctx: Context) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    repo = TransactionRepository(db)
+    user_id, period = ctx["user_id"], Period.parse(ctx["month"])
+    yield "TransactionRepository.list", lambda: repo.list(user_id, period, "expense", "lazer")
+    yield "TransactionRepository.list_page", lambda: repo.list_page(user_id, period, limit=20, with_total=True)
+
+    def next_page():
+        _, cursor, _ = repo.list_page(user_id, None, limit=20)
+        return repo.list_page(user_id, None, limit=20, cursor=cursor)
+    yield "TransactionRepository.list_page (cursor)", next_page
+    yield "TransactionRepository.stream", lambda: list(repo.stream(user_id, period, "income", None))
+    yield "TransactionRepository.monthly_summary", lambda: repo.monthly_summary(
+        user_id, Period.month(ctx["today"].year, ctx["today"].month), ctx["today"]
+    )
+
+    def write_cycle():
+        created = repo.create(user_id, TransactionCreateDTO(
+            description="Plano", amount=12.5, type="expense", category="lazer", date=ctx["today"],
+            total_installments=3, due_date=ctx["today"], payment_method_id=ctx["payment_method_id"],
+        ))
+        repo.get(user_id, created.id)
+        repo.update(user_id, created.id, TransactionUpdateDTO(date=ctx["today"], amount=20))
+        repo.delete(user_id, created.id)
+    yield "TransactionRepository.create/get/update/delete", write_cycle
+
+    def bulk_cycle():
+        created = repo.create(user_id, TransactionCreateDTO(
+            description="Plano", amount=12.5, type="expense", category="lazer", date=ctx["today"],
+            total_installments=3, due_date=ctx["today"], payment_method_id=ctx["payment_method_id"],
+        ))
+        group = TransactionSelectionDTO(installment_group_id=created.installment_group_id)
+        repo.bulk_update(user_id, TransactionSelectionDTO(ids=[created.id]), TransactionBulkChangesDTO(category="outros"))
+        repo.bulk_update(user_id, group, TransactionBulkChangesDTO(amount=5))
+        repo.bulk_delete(user_id, group)
+    yield "TransactionRepository.bulk_update/bulk_delete", bulk_cycle
+
+    def recurring_cycle():
+        created = repo.create(user_id, TransactionCreateDTO(
+            description="Plano", amount=12.5, type="expense", category="lazer", date=ctx["today"] - timedelta(days=90),
+            is_recurring=True, payment_method_id=ctx["payment_method_id"],
+        ))
+        second = occurrence_id(created.recurring_rule_id, created.occurrence_date + relativedelta(months=1))
+        materialized = repo.update(user_id, created.id, TransactionUpdateDTO(date=created.date, amount=20))
+        repo.materialize(user_id, created.recurring_rule_id, created.occurrence_date + relativedelta(months=2))
+        repo.delete(user_id, second)
+        repo.delete(user_id, materialized.id)
+    yield "TransactionRepository.create (recorrente)/materialize/delete (ocorrência)", recurring_cycle
+
+def _recurring_rule_scenarios(db: Session, ctx: Context):
+    repo = RecurringRuleRepository(db)
+    user_id = ctx["user_id"]
+    yield "RecurringRuleRepository.list", lambda: repo.list(user_id)
+    yield "RecurringRuleRepository.project", lambda: repo.project(user_id, Period.year(ctx["today"].year), "expense", None)
+    yield "RecurringRuleRepository.count_projected", lambda: repo.count_projected(user_id, Period.year(ctx["today"].year))
+
+    def write_cycle():
+        rule = repo.create(user_id, {
+            "description": "Plano", "amount": 10, "type": "income", "category": "outros", "start_date": ctx["today"],
+        })
+        repo.update(user_id, rule.id, {"amount": 15, "frequency": "weekly"})
+        repo.exclude(user_id, {rule.id: [ctx["today"]]})
+        repo.delete(user_id, rule.id)
+    yield "RecurringRuleRepository.create/update/exclude/delete", write_cycle
+
+def _monthly_totals_scenarios(db: Session, ctx: Context):
+    repo = MonthlyTotalsRepository(db)
+    yield "MonthlyTotalsRepository.get_months", lambda: repo.get_months(ctx["user_id"], *Period.parse(ctx["month"]).month_keys())
+    yield "MonthlyTotalsRepository.check (usuário)", lambda: repo.check(ctx["user_id"])
+    yield "MonthlyTotalsRepository.rebuild (usuário)", lambda: repo.rebuild(ctx["user_id"])
+
+def _debt_scenarios(db: Session, ctx: Context):
+    people, debts = PeopleRepository(db), DebtRepository(db)
+    user_id, person_id = uuid.UUID(ctx["user_id"]), ctx["person_id"]
+    period = Period.parse(ctx["month"])
+    yield "PeopleRepository.get_all_by_user", lambda: people.get_all_by_user(user_id)
+    yield "PeopleRepository.get_by_id/update", lambda: people.update(person_id, user_id, PeopleUpdateDTO(notes="plano"))
+    yield "DebtRepository.get_all_by_user", lambda: debts.get_all_by_user(user_id, period, person_id, "pending")
+    yield "DebtRepository.stream", lambda: list(debts.stream(user_id, period, None, None))
+    yield "DebtRepository.summary_by_person", lambda: debts.summary_by_person(user_id, period)
+
+    def write_cycle():
+        created = debts.create(user_id, DebtCreateDTO(
+            description="Plano", amount=90, date=ctx["today"], installments=1, total_installments=3,
+            person_id=str(person_id),
+        ))
+        debts.get_by_id(uuid.UUID(created.id), user_id)
+        debts.update(uuid.UUID(created.id), user_id, DebtUpdateDTO(
+            description="Plano", amount=30, date=ctx["today"], person_id=str(person_id), paid_amount=1, version=1,
+        ))
+        debts.update_payment(uuid.UUID(created.id), user_id, DebtPaymentDTO(paid_amount=10, version=2))
+        debts.add_payment(uuid.UUID(created.id), user_id, DebtPaymentCreateDTO(amount=5))
+        debts.list_payments(uuid.UUID(created.id), user_id)
+        debts.delete(uuid.UUID(created.id), user_id)
+    yield "DebtRepository.create/get_by_id/update/update_payment/add_payment/list_payments/delete", write_cycle
+
+    def bulk_cycle():
+        created = debts.create(user_id, DebtCreateDTO(
+            description="Plano", amount=90, date=ctx["today"], installments=1, total_installments=3,
+            person_id=str(person_id),
+        ))
+        group = DebtSelectionDTO(installment_group_id=created.installment_group_id)
+        debts.bulk_update(user_id, DebtSelectionDTO(ids=[created.id]), DebtBulkChangesDTO(description="Lote"))
+        debts.bulk_update(user_id, group, DebtBulkChangesDTO(amount=20))
+        debts.bulk_delete(user_id, group)
+    yield "DebtRepository.bulk_update/bulk_delete", bulk_cycle
+    yield "DebtRepository.settle_person", lambda: debts.settle_person(person_id, user_id)
+    yield "PeopleRepository.create/delete", lambda: people.delete(
+        uuid.UUID(str(people.create(user_id, PeopleCreateDTO(name="Plano", relationship="amigo")).id)), user_id
+    )
+
+def _goal_scenarios(db: Session, ctx: Context):
+    repo = GoalRepository(db)
+    yield "GoalRepository.list", lambda: repo.list(ctx["user_id"])
+    yield "GoalRepository.update/delete", lambda: (
+        repo.update(ctx["user_id"], ctx["goal_id"], {"current_amount": 10}), repo.delete(ctx["user_id"], ctx["goal_id"])
+    )
+
+def _auth_scenarios(db: Session, ctx: Context):
+    users, tokens = UserRepository(db), TokenRepository(db)
+    now = datetime.now(timezone.utc)
+    yield "UserRepository.get_by_email", lambda: users.get_by_email(ctx["email"])
+    yield "UserRepository.get_by_id/exists", lambda: (users.get_by_id(ctx["user_id"]), users.exists(ctx["user_id"]))
+    yield "TokenRepository.is_refresh_token_active", lambda: tokens.is_refresh_token_active(ctx["user_id"], ctx["jti"], now)
+    yield "TokenRepository.revoke_refresh_token", lambda: tokens.revoke_refresh_token(ctx["user_id"], ctx["jti"])
+    yield "TokenRepository.revoke_all_refresh_tokens", lambda: tokens.revoke_all_refresh_tokens(ctx["user_id"])
+    yield "TokenRepository.blacklisted_since", lambda: tokens.blacklisted_since(now - timedelta(seconds=30), now)
+    yield "TokenRepository.purge_expired", lambda: tokens.purge_expired(now - timedelta(days=30))
+    yield "DataVersionRepository.get", lambda: DataVersionRepository(db).get(ctx["user_id"], VERSIONED_TABLES)
+
+SCENARIO_GROUPS = (_transaction_scenarios, _recurring_rule_scenarios, _monthly_totals_scenarios, _debt_scenarios, _goal_scenarios, _auth_scenarios)
+
+def seq_scans(plan: Dict[str, Any]) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") not in SEQ_SCAN_ALLOWED:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+def _explainable(statement: str) -> bool:
+    keyword = statement.lstrip().split(None, 1)[0].upper()
+    return keyword in ("SELECT", "UPDATE", "DELETE", "WITH") or (keyword == "INSERT" and " SELECT " in statement.upper())
+
+def seed(conn, users: int, rows: int) -> Context:
+    for statement in SEED_SQL.split(";\n"):
+        if statement.strip():
+            conn.execute(text(statement), {"users": users, "rows": rows})
+    MonthlyTotalsRepository(Session(bind=conn)).rebuild()
+    for table in SEEDED_TABLES:
+        conn.exec_driver_sql(f"ANALYZE {table}")
+
+    user_id, email = conn.execute(text(
+        "SELECT id::text, email FROM users WHERE email LIKE '%@query-plans.invalid' ORDER BY email LIMIT 1"
+    )).one()
+    today = date.today()
+    return {
+        "user_id": user_id,
+        "email": email,
+        "today": today,
+        "month": today.strftime("%Y-%m"),
+        "person_id": conn.execute(text("SELECT id FROM people WHERE user_id = :u LIMIT 1"), {"u": user_id}).scalar(),
+        "goal_id": conn.execute(text("SELECT id::text FROM goals WHERE user_id = :u LIMIT 1"), {"u": user_id}).scalar(),
+        "payment_method_id": conn.execute(text(
+            "SELECT id::text FROM payment_methods WHERE name = 'Plano de execução'"
+        )).scalar(),
+        "jti": conn.execute(text("SELECT token FROM refresh_tokens WHERE user_id = :u LIMIT 1"), {"u": user_id}).scalar(),
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Falha se alguma consulta dos repositórios fizer Seq Scan")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows-per-user", type=int, default=250, help="Transações por usuário")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostra todas as consultas verificadas")
+    args = parser.parse_args(argv)
+
+    failures: List[Tuple[str, str, str]] = []
+    checked = 0
+    current = {"scenario": "seed"}
+
+    with engine.connect() as conn:
+        outer = conn.begin()
+        try:
+            ctx = seed(conn, args.users, args.rows_per_user)
+
+            @event.listens_for(conn, "before_cursor_execute")
+            def explain(connection, cursor, statement, parameters, context, executemany):
+                nonlocal checked
+                if executemany or not _explainable(statement):
+                    return
+                explain_cursor = connection.connection.dbapi_connection.cursor()
+                try:
+                    # Com seqscan desligado o planner só faz Seq Scan quando não há índice utilizável,
+                    # então o resultado não depende do tamanho da base semeada
+                    explain_cursor.execute("SET enable_seqscan = off")
+                    explain_cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                    plan = explain_cursor.fetchone()[0][0]["Plan"]
+                    explain_cursor.execute("RESET enable_seqscan")
+                finally:
+                    explain_cursor.close()
+                checked += 1
+                for relation in seq_scans(plan):
+                    failures.append((current["scenario"], relation, " ".join(statement.split())))
+                if args.verbose:
+                    print(f"  {current['scenario']}: {plan['Node Type']} {' '.join(statement.split())[:100]}")
+
+            # Commits dos repositórios viram savepoints da transação externa
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            for group in SCENARIO_GROUPS:
+                for name, run in group(db, ctx):
+                    current["scenario"] = name
+                    run()
+            db.close()
+        finally:
+            outer.rollback()
+
+    for scenario, relation, statement in failures:
+        print(f"SEQ SCAN em {relation} ({scenario}): {statement[:200]}")
+    print(f"{checked} consultas verificadas, {len(failures)} com Seq Scan")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Aplica as migrations SQL de db/migrations em ordem, uma única vez cada.
+
+As aplicadas ficam registradas em schema_migrations. Os comandos de cada
+arquivo rodam em uma única transação, junto com o registro em
+schema_migrations: um backfill que falha no meio não deixa dados pela metade.
+CREATE/DROP INDEX CONCURRENTLY não pode rodar em transação; esses comandos
+rodam depois dos demais, em autocommit, e só então o arquivo é registrado.
+Por isso devem ser idempotentes (IF [NOT] EXISTS) e nenhum outro comando do
+arquivo pode depender deles. Um CREATE INDEX CONCURRENTLY que falha deixa o
+índice INVALID, que o IF NOT EXISTS pularia na nova tentativa: antes de
+recriar, índices inválidos com o mesmo nome são removidos, e o arquivo só é
+registrado se todos os índices dele estiverem válidos. Comandos são separados
+por ';' no fim da linha, fora de corpos entre $$ (funções plpgsql).
+
+Uso (a partir de backend/):
+    python -m scripts.migrate            # aplica as pendentes
+    python -m scripts.migrate --list     # mostra o estado sem aplicar
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import List, Optional
+from sqlalchemy import text
+from app.infrastructure.db import engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "db" / "migrations"
+
+# Delimitador de corpo entre aspas de dólar: $$ ou $tag$
+DOLLAR_QUOTE = re.compile(r"\$(?:[A-Za-z_]\w*)?\$")
+CONCURRENTLY = re.compile(r"\bCONCURRENTLY\b", re.IGNORECASE)
+CREATE_INDEX = re.compile(
+    r"^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.\"]+)", re.IGNORECASE
+)
+INDEX_IS_VALID = text(
+    "SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass(:name)"
+)
+
+def split_statements(sql: str) -> List[str]:
+    statements, current, quote = [], [], None
+    for line in sql.splitlines():
+        if quote is None and line.strip().startswith("--"):
+            continue
+        current.append(line)
+        for tag in DOLLAR_QUOTE.findall(line):
+            if quote is None:
+                quote = tag
+            elif tag == quote:
+                quote = None
+        if quote is None and line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip().rstrip(";")
+            if statement:
+                statements.append(statement)
+            current = []
+    if "\n".join(current).strip():
+        statements.append("\n".join(current).strip())
+    return statements
+
+def index_is_valid(conn, name: str) -> Optional[bool]:
+    """indisvalid do índice; None se ele não existir"""
+    return conn.execute(INDEX_IS_VALID, {"name": name}).scalar()
+
+def apply(path: Path) -> None:
+    """Aplica um arquivo: transação única com o registro, CONCURRENTLY depois em autocommit"""
+    statements = split_statements(path.read_text(encoding="utf-8"))
+    concurrent = [statement for statement in statements if CONCURRENTLY.search(statement)]
+    record = text("INSERT INTO schema_migrations (name) VALUES (:name)")
+    with engine.begin() as conn:
+        for statement in statements:
+            if statement not in concurrent:
+                conn.exec_driver_sql(statement)
+        if not concurrent:
+            conn.execute(record, {"name": path.name})
+    if concurrent:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            indexes = []
+            for statement in concurrent:
+                match = CREATE_INDEX.match(statement)
+                if match:
+                    indexes.append(match.group(1))
+                    if index_is_valid(conn, match.group(1)) is False:
+                        print(f"  removendo índice inválido {match.group(1)} (criação anterior falhou)")
+                        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {match.group(1)}")
+                conn.exec_driver_sql(statement)
+            invalid = [name for name in indexes if index_is_valid(conn, name) is False]
+            if invalid:
+                raise RuntimeError(f"{path.name}: índices inválidos após a criação: {', '.join(invalid)}")
+            conn.execute(record, {"name": path.name})
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aplica as migrations SQL pendentes")
+    parser.add_argument("--list", action="store_true", help="Apenas lista aplicadas/pendentes")
+    args = parser.parse_args(argv)
+
+    files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name VARCHAR(200) PRIMARY KEY, applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        applied = set(conn.execute(text("SELECT name FROM schema_migrations")).scalars())
+    for path in files:
+        if path.name in applied:
+            print(f"aplicada  {path.name}")
+            continue
+        if args.list:
+            print(f"pendente  {path.name}")
+            continue
+        print(f"aplicando {path.name}")
+        apply(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Reconstrói e/ou verifica o rollup monthly_totals a partir da tabela transactions.
+
+Uso (a partir de backend/):
+    python -m scripts.rebuild_monthly_totals            # recalcula tudo e verifica
+    python -m scripts.rebuild_monthly_totals --check    # apenas verifica, sem escrever
+    python -m scripts.rebuild_monthly_totals --user-id <uuid>
+"""
+import argparse
+import sys
+from app.infrastructure.db import SessionLocal
+from app.infrastructure.repositories.monthly_totals_repository import MonthlyTotalsRepository
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconstrói o rollup monthly_totals")
+    parser.add_argument("--check", action="store_true", help="Apenas compara o rollup com os dados atuais")
+    parser.add_argument("--user-id", help="Restringe a um usuário")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        repo = MonthlyTotalsRepository(db)
+        if not args.check:
+            rows = repo.rebuild(args.user_id)
+            print(f"monthly_totals reconstruído: {rows} linhas")
+        mismatches = repo.check(args.user_id)
+        if mismatches:
+            db.rollback()
+            for row in mismatches:
+                print(
+                    f"divergência {row['user_id']} {row['year_month']} {row['type']}/{row['category']} "
+                    f"recorrente={row['is_recurring']}: esperado {row['expected_amount']} ({row['expected_count']}), "
+                    f"encontrado {row['actual_amount']} ({row['actual_count']})"
+                )
+            return 1
+        db.commit()
+        print("monthly_totals consistente com transactions")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
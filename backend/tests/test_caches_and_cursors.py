@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from app.infrastructure import ttl_cache
+from app.infrastructure.pagination import encode_cursor, decode_cursor
+from app.infrastructure.ttl_cache import TTLCache
+from app.interface.api.middleware import _etag_matches
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(date(2025, 3, 5), "6f1c1e4e-8b1f-4f51-9d7e-2a0c2f6d9b10")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (date(2025, 3, 5), "6f1c1e4e-8b1f-4f51-9d7e-2a0c2f6d9b10")
+
+
+@pytest.mark.parametrize("cursor", [
+    "", "not-base64!", encode_cursor(date(2025, 1, 1), "x")[:-3],
+    encode_cursor(date(2024, 1, 1), "garbage"),
+    encode_cursor(date(2024, 1, 1), "6f1c1e4e-8b1f-4f51-9d7e-2a0c2f6d9b10:2024-01-01"),
+])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_cursor(cursor)
+
+
+def test_etag_matches_weak_comparison():
+    etag = 'W/"abc"'
+    assert _etag_matches('W/"abc"', etag)
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('"x", W/"abc"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('W/"abd"', etag)
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=1)
+    now[0] += 2
+    assert cache.get("a") == 1
+    assert cache.get("b", "expirado") == "expirado"
+    now[0] += 4
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    cache.invalidate("a")
+    assert len(cache) == 1
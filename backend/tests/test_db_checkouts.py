@@ -0,0 +1,74 @@
+"""Cada requisição deve usar uma única conexão do pool (header X-DB-Checkouts).
+
+Precisa de um PostgreSQL com o schema de db/init.sql, configurado pelas
+variáveis POSTGRES_*; sem banco os testes são ignorados.
+"""
+import os
+import uuid
+
+import pytest
+
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.infrastructure.db import engine, SessionLocal
+from app.infrastructure.models.user import UserModel
+from app.interface.api.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1 FROM data_versions LIMIT 1"))
+    except SQLAlchemyError:
+        pytest.skip("PostgreSQL indisponível ou sem o schema")
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    email = f"checkouts-{uuid.uuid4().hex}@example.com"
+    response = client.post("/auth/register", json={
+        "name": "Checkouts", "email": email, "password": "secret1", "confirmPassword": "secret1",
+    })
+    assert response.status_code in (200, 201), response.text
+    data = response.json()["data"]
+    yield {"Authorization": f"Bearer {data['access_token']}"}
+    with SessionLocal() as db:
+        db.query(UserModel).filter(UserModel.id == data["user"]["id"]).delete()
+        db.commit()
+
+
+def test_debts_route_uses_one_connection(client, headers):
+    response = client.post("/debts/people", json={"name": "Ana", "relationship": _relationship(client, headers)},
+                           headers=headers)
+    assert response.status_code in (200, 201), response.text
+    assert response.headers["x-db-checkouts"] == "1"
+
+    response = client.get("/debts/people", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["x-db-checkouts"] == "1"
+
+
+@pytest.mark.parametrize("path", ["/debts/", "/finance/goals/", "/finance/transactions/summary?month=2025-01"])
+def test_etag_route_uses_one_connection(client, headers, path):
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["x-db-checkouts"] == "1"
+    etag = response.headers["etag"]
+
+    response = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["x-db-checkouts"] == "1"
+
+
+def _relationship(client, headers) -> str:
+    data = client.get("/config/relationships", headers=headers).json()["data"]
+    if isinstance(data, dict):
+        data = next(items for items in data.values() if items)
+    return data[0]["id"]
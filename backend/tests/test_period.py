@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from app.infrastructure.period import Period, PERIOD_FORMAT_ERROR, resolve_period
+
+
+def test_parse_month_quarter_and_year():
+    assert Period.parse("2025-02") == Period(date(2025, 2, 1), date(2025, 3, 1))
+    assert Period.parse("2025-q4") == Period(date(2025, 10, 1), date(2026, 1, 1))
+    assert Period.parse("2025") == Period(date(2025, 1, 1), date(2026, 1, 1))
+
+
+@pytest.mark.parametrize("value", ["2025-13", "2025-Q5", "25", "janeiro", ""])
+def test_parse_rejects_invalid_formats(value):
+    with pytest.raises(ValueError, match=PERIOD_FORMAT_ERROR):
+        Period.parse(value)
+
+
+def test_between_is_inclusive_and_half_open():
+    period = Period.between(date(2025, 1, 10), date(2025, 1, 20))
+    assert date(2025, 1, 10) in period
+    assert date(2025, 1, 20) in period
+    assert date(2025, 1, 21) not in period
+    with pytest.raises(ValueError):
+        Period.between(date(2025, 1, 20), date(2025, 1, 10))
+
+
+def test_open_bounds():
+    assert date(1900, 1, 1) in Period(None, date(2025, 1, 1))
+    assert date(2100, 1, 1) in Period(date(2025, 1, 1), None)
+
+
+def test_months_and_month_keys():
+    period = Period.quarter(2025, 1)
+    assert period.months() == ["2025-01", "2025-02", "2025-03"]
+    assert period.month_keys() == ("2025-01", "2025-04")
+    with pytest.raises(ValueError):
+        Period.between(date(2025, 1, 5), date(2025, 2, 5)).month_keys()
+
+
+def test_resolve_period():
+    assert resolve_period() is None
+    assert resolve_period(month="2025-03") == Period.month(2025, 3)
+    assert resolve_period(date_from=date(2025, 1, 1)) == Period(date(2025, 1, 1), None)
+    with pytest.raises(ValueError):
+        resolve_period(month="2025-03", period="2025")
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from app.infrastructure.period import Period
+from app.infrastructure.recurrence import (
+    occurrences, occurrences_desc, count_occurrences, is_occurrence,
+    occurrence_id, parse_occurrence_id,
+)
+
+RULE_ID = "6f1c1e4e-8b1f-4f51-9d7e-2a0c2f6d9b10"
+
+
+def test_monthly_rule_keeps_the_start_day():
+    dates = list(occurrences("monthly", 1, date(2025, 1, 31), Period.year(2025)))
+    assert dates[:4] == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)]
+    assert len(dates) == 12
+
+
+def test_period_end_date_count_and_exclusions():
+    period = Period.year(2025)
+    assert list(occurrences("weekly", 2, date(2025, 1, 1), period, end_date=date(2025, 2, 1))) == [
+        date(2025, 1, 1), date(2025, 1, 15), date(2025, 1, 29),
+    ]
+    assert list(occurrences("monthly", 1, date(2025, 1, 5), period, count=2)) == [date(2025, 1, 5), date(2025, 2, 5)]
+    assert list(occurrences("yearly", 1, date(2020, 6, 1), Period(date(2024, 1, 1), date(2026, 1, 1)),
+                            excluded={date(2024, 6, 1)})) == [date(2025, 6, 1)]
+
+
+def test_projection_needs_an_end():
+    with pytest.raises(ValueError):
+        list(occurrences("monthly", 1, date(2025, 1, 1), Period(date(2025, 1, 1), None)))
+
+
+@pytest.mark.parametrize("frequency,interval,start", [
+    ("weekly", 1, date(2024, 3, 3)),
+    ("weekly", 3, date(2024, 12, 30)),
+    ("monthly", 1, date(2024, 1, 31)),
+    ("monthly", 2, date(2024, 5, 15)),
+    ("yearly", 1, date(2020, 2, 29)),
+])
+def test_descending_and_count_match_ascending(frequency, interval, start):
+    period = Period(date(2024, 6, 10), date(2026, 3, 1))
+    excluded = set(list(occurrences(frequency, interval, start, period))[1:3])
+    ascending = list(occurrences(frequency, interval, start, period, count=40, excluded=excluded))
+    assert list(occurrences_desc(frequency, interval, start, period, count=40, excluded=excluded)) == ascending[::-1]
+    assert count_occurrences(frequency, interval, start, period, count=40, excluded=excluded) == len(ascending)
+
+
+def test_is_occurrence():
+    assert is_occurrence("monthly", 1, date(2025, 1, 31), date(2025, 2, 28))
+    assert not is_occurrence("monthly", 1, date(2025, 1, 31), date(2025, 2, 27))
+    assert not is_occurrence("monthly", 1, date(2025, 1, 31), date(2025, 2, 28), excluded={date(2025, 2, 28)})
+
+
+def test_occurrence_ids():
+    value = occurrence_id(RULE_ID, date(2025, 3, 5))
+    assert parse_occurrence_id(value) == (RULE_ID, date(2025, 3, 5))
+    assert parse_occurrence_id(RULE_ID) is None
+    with pytest.raises(ValueError):
+        parse_occurrence_id("abc:2025-03-05")
@@ -0,0 +1,26 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.usecases.transaction_import_usecases import TransactionImportUseCases
+
+CATEGORIES = {"salario": "salario"}
+TODAY = date(2025, 6, 1)
+
+
+def build(amount):
+    raw = {"date": "2025-05-10", "description": "Pagamento", "amount": amount, "category": "salario"}
+    return TransactionImportUseCases._build_row(raw, CATEGORIES, {}, None, None, TODAY)
+
+
+@pytest.mark.parametrize("amount,expected", [("1.234,56", Decimal("1234.56")), ("10.005", Decimal("10.01")),
+                                             ("99999999.99", Decimal("99999999.99"))])
+def test_amount_is_rounded_to_cents(amount, expected):
+    assert build(amount)["amount"] == expected
+
+
+@pytest.mark.parametrize("amount", ["NaN", "-nan", "Infinity", "-Infinity", "1e30", "100000000", "0.001", "0", "abc"])
+def test_amount_outside_the_column_is_a_row_error(amount):
+    with pytest.raises(ValueError):
+        build(amount)
@@ -119,6 +119,8 @@ const DebtModal: React.FC<DebtModalProps> = ({ isOpen, onClose, editingDebt }) =
       receipt: formData.receipt || undefined,
       total_installments: formData.total_installments > 1 ? formData.total_installments : undefined,
       payment_method_id: formData.payment_method_id || undefined,
+      // paid_amount sobrescreve o saldo: a API só aplica sobre a versão lida
+      version: editingDebt?.version,
     };
 
     try {
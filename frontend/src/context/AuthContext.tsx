@@ -161,11 +161,13 @@ class AuthService {
     const token = localStorage.getItem('authToken');
     if (token) {
       try {
+        // Envia o refresh token para que ele também seja revogado no servidor
         await this.makeRequest('/auth/logout', {
           method: 'POST',
           headers: {
             'Authorization': `Bearer ${token}`,
           },
+          body: JSON.stringify({ refresh_token: localStorage.getItem('refreshToken') }),
         });
       } catch (error) {
         console.warn('Logout request failed:', error);
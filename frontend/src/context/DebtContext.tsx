@@ -272,7 +272,7 @@ interface DebtContextType {
   deletePerson: (id: string) => Promise<void>;
   createDebt: (debt: any) => Promise<void>;
   updateDebt: (id: string, debt: any) => Promise<void>;
-  updateDebtPayment: (id: string, paymentData: any) => Promise<void>;
+  updateDebtPayment: (id: string, paymentData: { paid_amount: number; version: number }) => Promise<void>;
   deleteDebt: (id: string) => Promise<void>;
   paymentMethods: any[]; // Added paymentMethods to the context type
   setActive: (active: boolean) => void; // Novo: controla se a aba está ativa
@@ -416,7 +416,7 @@ export function DebtProvider({ children }: { children: ReactNode }) {
     }
   }, [loadDebts]);
 
-  const updateDebtPayment = useCallback(async (id: string, paymentData: any) => {
+  const updateDebtPayment = useCallback(async (id: string, paymentData: { paid_amount: number; version: number }) => {
     try {
       dispatch({ type: 'SET_LOADING', payload: true });
       dispatch({ type: 'SET_ERROR', payload: null });
@@ -44,8 +44,21 @@ const makeAuthenticatedRequest = async <T>(
 // Financial API Service
 export class FinancialService {
   static async getTransactions(month?: string): Promise<any> {
-    const params = month ? `?month=${month}` : '';
-    return makeAuthenticatedRequest(`/finance/transactions${params}`);
+    // A API pagina por cursor; percorre as páginas para montar o mês completo
+    const transactions: any[] = [];
+    let cursor: string | null = null;
+    let response: any;
+    do {
+      const params = new URLSearchParams();
+      if (month) params.set('month', month);
+      if (cursor) params.set('cursor', cursor);
+      const query = params.toString();
+      response = await makeAuthenticatedRequest<any>(`/finance/transactions${query ? `?${query}` : ''}`);
+      if (!response.success) return response;
+      transactions.push(...(response.data?.transactions || []));
+      cursor = response.data?.pagination?.nextCursor || null;
+    } while (cursor);
+    return { ...response, data: { ...response.data, transactions } };
   }
 
   static async createTransaction(transaction: any): Promise<any> {
@@ -180,7 +193,7 @@ export class DebtService {
     });
   }
 
-  static async updateDebtPayment(id: string, paymentData: any): Promise<any> {
+  static async updateDebtPayment(id: string, paymentData: { paid_amount: number; version: number }): Promise<any> {
     return makeAuthenticatedRequest(`/debts/${id}/payment`, {
       method: 'PATCH',
       body: JSON.stringify(paymentData),
@@ -11,6 +11,27 @@ export interface Transaction {
   due_date?: string;
   receipt?: string;
   payment_method_id?: string;
+  installment_group_id?: string;
+  // Ocorrência de uma regra de recorrência; projetada = ainda sem linha no banco (id "<regra>:<data>")
+  recurring_rule_id?: string;
+  occurrence_date?: string;
+  is_projected?: boolean;
+  version?: number;
+}
+
+export interface RecurringRule {
+  id: string;
+  description: string;
+  amount: number;
+  type: 'income' | 'expense';
+  category: string;
+  payment_method_id?: string;
+  frequency: 'weekly' | 'monthly' | 'yearly';
+  interval: number;
+  start_date: string;
+  end_date?: string;
+  count?: number;
+  excluded_dates: string[];
 }
 
 export interface MonthlyData {
@@ -68,6 +89,8 @@ export interface Debt {
   created_at?: string;
   updated_at?: string;
   payment_method_id?: string;
+  installment_group_id?: string;
+  version?: number;
   // Dados da pessoa (incluído na resposta da API)
   person?: Person;
 }
@@ -93,7 +116,7 @@ export interface DebtByPerson {
   total: number;
   paid: number;
   pending: number;
-  debts: Debt[];
+  debts?: Debt[];
 }
 
 export interface DebtInstallment {
@@ -111,7 +134,7 @@ export interface DebtInstallment {
 export interface DebtSummaryResponse {
   summary: DebtSummary;
   debtsByPerson: Record<string, DebtByPerson>;
-  installments: DebtInstallment[];
+  installments?: DebtInstallment[];
 }
 
 // Authentication Types